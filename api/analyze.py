@@ -11,6 +11,8 @@ from urllib.parse import urlparse
 # Add current directory to path for imports
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+from industry_classifier import IndustryClassifier
+
 class handler(BaseHTTPRequestHandler):
     def do_OPTIONS(self):
         self.send_response(200)
@@ -119,26 +121,7 @@ class handler(BaseHTTPRequestHandler):
 
     def detect_industry_from_domain(self, domain_name: str) -> str:
         """Detect industry from domain name"""
-        domain_lower = domain_name.lower()
-        
-        if any(word in domain_lower for word in ['recovery', 'rehab', 'treatment', 'detox', 'addiction', 'sober']):
-            return 'healthcare_rehab'
-        elif any(word in domain_lower for word in ['medical', 'health', 'clinic', 'hospital', 'doctor']):
-            return 'healthcare_medical'
-        elif any(word in domain_lower for word in ['dental', 'dentist', 'teeth', 'oral']):
-            return 'healthcare_dental'
-        elif any(word in domain_lower for word in ['law', 'legal', 'attorney', 'lawyer']):
-            return 'legal'
-        elif any(word in domain_lower for word in ['real', 'estate', 'property', 'realtor']):
-            return 'real_estate'
-        elif any(word in domain_lower for word in ['school', 'education', 'college', 'university']):
-            return 'education'
-        elif any(word in domain_lower for word in ['bank', 'finance', 'loan', 'insurance']):
-            return 'finance'
-        elif any(word in domain_lower for word in ['auto', 'car', 'vehicle', 'automotive']):
-            return 'automotive'
-        else:
-            return 'general'
+        return IndustryClassifier.from_taxonomy('keyword_domain').classify_text(domain_name)
 
     def generate_healthcare_rehab_keywords(self, domain_name: str) -> List[Dict]:
         """Generate specific healthcare rehab keywords"""
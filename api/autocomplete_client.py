@@ -0,0 +1,294 @@
+import asyncio
+import json
+import os
+import string
+import threading
+import time
+from concurrent.futures import Future
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import httpx
+
+GOOGLE_AUTOCOMPLETE_URL = "https://suggestqueries.google.com/complete/search"
+
+QUESTION_WORDS = ['how', 'what', 'why', 'when', 'where', 'which', 'who', 'can', 'is', 'are', 'does']
+
+# Suggestions cached per process; trends responses built from them keep their ETag this long
+SUGGESTION_TTL = 6 * 3600
+
+
+class SuggestionTrie:
+    """Prefix trie used to dedupe suggestions and answer prefix lookups"""
+
+    _END = '$'
+
+    def __init__(self):
+        self.root: Dict = {}
+        self.size = 0
+
+    def insert(self, phrase: str) -> bool:
+        """Add a phrase; returns False if it was already present"""
+        node = self.root
+        for char in phrase:
+            node = node.setdefault(char, {})
+        if self._END in node:
+            return False
+        node[self._END] = True
+        self.size += 1
+        return True
+
+    def __contains__(self, phrase: str) -> bool:
+        node = self.root
+        for char in phrase:
+            node = node.get(char)
+            if node is None:
+                return False
+        return self._END in node
+
+    def __len__(self) -> int:
+        return self.size
+
+    def iter_prefix(self, prefix: str = '') -> Iterator[str]:
+        """All stored phrases starting with prefix, in lexicographic order"""
+        node = self.root
+        for char in prefix:
+            node = node.get(char)
+            if node is None:
+                return
+        stack = [(node, prefix)]
+        while stack:
+            node, path = stack.pop()
+            if self._END in node:
+                yield path
+            for char in sorted((c for c in node if c != self._END), reverse=True):
+                stack.append((node[char], path + char))
+
+
+class TTLCache:
+    """Small in-memory cache with per-entry expiry"""
+
+    def __init__(self, ttl: float = 3600, max_entries: int = 10000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._data: Dict = {}
+
+    def get(self, key):
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            self._data.pop(key, None)
+            return None
+        return value
+
+    def set(self, key, value):
+        if len(self._data) >= self.max_entries:
+            # Drop the oldest insertion; dicts keep insertion order
+            self._data.pop(next(iter(self._data)))
+        self._data[key] = (time.monotonic() + self.ttl, value)
+
+
+class HostRateLimiter:
+    """Token bucket per host"""
+
+    def __init__(self, rate: float = 10.0, burst: int = 10):
+        self.rate = rate
+        self.burst = burst
+        self._buckets: Dict[str, List[float]] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    async def acquire(self, host: str):
+        lock = self._locks.setdefault(host, asyncio.Lock())
+        async with lock:
+            bucket = self._buckets.setdefault(host, [float(self.burst), time.monotonic()])
+            while True:
+                now = time.monotonic()
+                bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+                bucket[1] = now
+                if bucket[0] >= 1:
+                    bucket[0] -= 1
+                    return
+                await asyncio.sleep((1 - bucket[0]) / self.rate)
+
+
+class AutocompleteClient:
+    """
+    Async autocomplete suggestion miner.
+    All requests share one keep-alive connection pool and are rate limited per host.
+    """
+
+    def __init__(self, base_url: str = GOOGLE_AUTOCOMPLETE_URL, max_connections: int = 10,
+                 rate_per_host: float = 10.0, burst: int = 10, cache_ttl: float = 3600,
+                 timeout: float = 5.0, cache: Optional[TTLCache] = None):
+        self.base_url = base_url
+        self.host = urlparse(base_url).netloc
+        self.max_connections = max_connections
+        self.client = httpx.AsyncClient(
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_connections,
+                                max_keepalive_connections=max_connections),
+            headers={'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
+        )
+        self.rate_limiter = HostRateLimiter(rate_per_host, burst)
+        # Pass a shared cache to keep results across short-lived clients
+        self.cache = cache if cache is not None else TTLCache(cache_ttl)
+
+    async def __aenter__(self) -> 'AutocompleteClient':
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    async def aclose(self):
+        await self.client.aclose()
+
+    async def fetch_suggestions(self, query: str, region: str = "US", language: str = "en") -> List[str]:
+        """Suggestions for one query, served from the TTL cache when possible"""
+        cache_key = (query, region, language)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        await self.rate_limiter.acquire(self.host)
+        response = await self.client.get(self.base_url, params={
+            'client': 'firefox',
+            'q': query,
+            'gl': region.lower(),
+            'hl': language
+        })
+        response.raise_for_status()
+
+        # Response format: [query, [suggestion, ...], ...]
+        payload = json.loads(response.text)
+        suggestions = [s for s in payload[1] if isinstance(s, str)] if len(payload) > 1 else []
+
+        self.cache.set(cache_key, suggestions)
+        return suggestions
+
+    def expand_queries(self, seed: str) -> List[str]:
+        """Fan a seed out into suffix (a-z) and question-word prefix variants"""
+        seed = seed.strip().lower()
+        queries = [seed]
+        queries.extend(f"{seed} {letter}" for letter in string.ascii_lowercase)
+        queries.extend(f"{word} {seed}" for word in QUESTION_WORDS)
+        return queries
+
+    def expand_rising_queries(self, seed: str) -> List[str]:
+        """Variants that surface what people are searching for right now"""
+        seed = seed.strip().lower()
+        return [f"{seed} {datetime.now().year}", f"new {seed}", f"{seed} new", f"{seed} latest"]
+
+    async def mine(self, seed: str, region: str = "US", language: str = "en",
+                   queries: Optional[List[str]] = None) -> Dict:
+        """
+        Fetch all variants of a seed (expand_queries, or the given queries)
+        concurrently and dedupe the suggestions.
+        """
+        queries = queries if queries is not None else self.expand_queries(seed)
+        cache_key = self.mine_cache_key(seed, region, language, queries)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        semaphore = asyncio.Semaphore(self.max_connections)
+
+        async def fetch(query: str) -> Tuple[str, Optional[List[str]]]:
+            async with semaphore:
+                try:
+                    return query, await self.fetch_suggestions(query, region, language)
+                except (httpx.HTTPError, ValueError) as e:
+                    print(f"Error fetching suggestions for '{query}': {e}")
+                    return query, None
+
+        results = await asyncio.gather(*(fetch(query) for query in queries))
+        answered = sum(found is not None for _, found in results)
+
+        trie = SuggestionTrie()
+        suggestions = []
+        for query, found in results:
+            for suggestion in found or []:
+                suggestion = suggestion.strip().lower()
+                if suggestion and suggestion != seed.lower() and trie.insert(suggestion):
+                    suggestions.append({"query": suggestion, "source": query})
+
+        result = {
+            "seed": seed,
+            "region": region,
+            "queries_sent": len(queries),
+            "suggestions": suggestions
+        }
+        # An outage is retried on the next call instead of cached as "no suggestions"
+        if answered:
+            self.cache.set(cache_key, result)
+        return result
+
+    @staticmethod
+    def mine_cache_key(seed: str, region: str, language: str, queries: List[str]) -> Tuple:
+        return ('mine', seed, region, language, tuple(queries))
+
+
+class AutocompleteService:
+    """
+    One AutocompleteClient per process on its own event loop thread, so
+    blocking handlers and async callers share a single connection pool,
+    rate limiter and suggestion cache.
+    """
+
+    _default_instance = None
+    _default_lock = threading.Lock()
+
+    def __init__(self, base_url: str = GOOGLE_AUTOCOMPLETE_URL, timeout: float = 10.0, **client_options):
+        # Bound on a whole mine() call; each request has the client's own timeout
+        self.timeout = timeout
+        client_options.setdefault('cache_ttl', SUGGESTION_TTL)
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name='autocomplete', daemon=True)
+        self._thread.start()
+        self.client: AutocompleteClient = self._submit(self._create_client(base_url, client_options)).result()
+
+    @classmethod
+    def default(cls) -> 'AutocompleteService':
+        """Process-wide service for the Google suggestion endpoint"""
+        with cls._default_lock:
+            if cls._default_instance is None:
+                cls._default_instance = cls()
+            return cls._default_instance
+
+    @classmethod
+    def from_env(cls) -> Optional['AutocompleteService']:
+        """The default service, or None when TRENDS_AUTOCOMPLETE=0"""
+        if os.getenv('TRENDS_AUTOCOMPLETE', '1').lower() in ('0', 'false', 'no', 'off'):
+            return None
+        return cls.default()
+
+    async def _create_client(self, base_url: str, options: Dict) -> AutocompleteClient:
+        # Built on the service loop, where all of its requests run
+        return AutocompleteClient(base_url, **options)
+
+    def _submit(self, coro) -> Future:
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def mine(self, seed: str, region: str = "US", language: str = "en",
+             queries: Optional[List[str]] = None) -> Dict:
+        """Blocking AutocompleteClient.mine; callable from any thread, including one running a loop"""
+        return self._submit(self.client.mine(seed, region, language, queries)).result(self.timeout)
+
+    async def mine_async(self, seed: str, region: str = "US", language: str = "en",
+                         queries: Optional[List[str]] = None) -> Dict:
+        """AutocompleteClient.mine for callers on another event loop"""
+        future = asyncio.wrap_future(self._submit(self.client.mine(seed, region, language, queries)))
+        return await asyncio.wait_for(future, self.timeout)
+
+    def cached(self, seed: str, region: str = "US", language: str = "en",
+               queries: Optional[List[str]] = None) -> Optional[Dict]:
+        """The cached mine() result, without fetching"""
+        queries = queries if queries is not None else self.client.expand_queries(seed)
+        return self.client.cache.get(AutocompleteClient.mine_cache_key(seed, region, language, queries))
+
+    def close(self):
+        self._submit(self.client.aclose()).result(self.timeout)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
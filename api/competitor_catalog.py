@@ -0,0 +1,109 @@
+import json
+import os
+import threading
+import time
+from types import MappingProxyType
+from typing import Dict, FrozenSet, Mapping, Optional, Tuple
+
+CATALOG_PATH = os.getenv(
+    'COMPETITOR_CATALOG_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'competitor_catalog.json')
+)
+
+# Seconds between mtime checks; reads in between are plain attribute access
+RELOAD_CHECK_INTERVAL = 2.0
+
+EMPTY = MappingProxyType({})
+
+
+def _freeze(value):
+    """Recursively turn dicts into read-only mappings and lists into tuples"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+class CompetitorCatalog:
+    """
+    Immutable competitor data loaded from a versioned JSON file.
+    Indexed by industry (the intel and analysis competitor sets), by
+    domain (every entry mentioning it) and by tier.
+    """
+
+    _current = None
+    _current_lock = threading.Lock()
+    _checked_at = 0.0
+
+    def __init__(self, data: Dict, path: Optional[str] = None, mtime: float = 0.0):
+        self.path = path
+        self.mtime = mtime
+        self.version = data.get('version', 0)
+
+        self.traffic_tiers: Mapping[str, Tuple[int, int]] = _freeze(data.get('traffic_tiers', {}))
+        # industry -> {domain key or default_<industry>: competitors}
+        self.intel: Mapping[str, Mapping[str, Tuple[Mapping, ...]]] = _freeze(data.get('intel', {}))
+        # industry -> competitors used by site analysis
+        self.analysis: Mapping[str, Tuple[Mapping, ...]] = _freeze(data.get('analysis', {}))
+        self.analysis_fallback: Tuple[Mapping, ...] = _freeze(data.get('analysis_fallback', []))
+
+        self.tier_domains: Mapping[str, FrozenSet[str]] = MappingProxyType({
+            tier: frozenset(domains) for tier, domains in data.get('tier_domains', {}).items()
+        })
+        self._tier_by_domain = MappingProxyType({
+            domain: tier for tier, domains in self.tier_domains.items() for domain in domains
+        })
+
+        by_domain: Dict[str, list] = {}
+        for sets in self.intel.values():
+            for competitors in sets.values():
+                for entry in competitors:
+                    by_domain.setdefault(entry['domain'], []).append(entry)
+        for competitors in (*self.analysis.values(), self.analysis_fallback):
+            for entry in competitors:
+                by_domain.setdefault(entry['domain'], []).append(entry)
+        self.by_domain: Mapping[str, Tuple[Mapping, ...]] = MappingProxyType(
+            {domain: tuple(entries) for domain, entries in by_domain.items()}
+        )
+
+    @classmethod
+    def load(cls, path: str = CATALOG_PATH) -> 'CompetitorCatalog':
+        with open(path) as f:
+            data = json.load(f)
+        return cls(data, path, os.path.getmtime(path))
+
+    @classmethod
+    def current(cls, path: str = CATALOG_PATH) -> 'CompetitorCatalog':
+        """
+        Process-wide catalog, loaded on first use and reloaded when the file
+        changes. A reload that fails keeps serving the previous catalog.
+        """
+        catalog = cls._current
+        now = time.monotonic()
+        if catalog is not None and now - cls._checked_at < RELOAD_CHECK_INTERVAL:
+            return catalog
+
+        with cls._current_lock:
+            catalog = cls._current
+            cls._checked_at = now
+            try:
+                if catalog is None or catalog.path != path or os.path.getmtime(path) != catalog.mtime:
+                    cls._current = catalog = cls.load(path)
+            except (OSError, ValueError) as e:
+                if catalog is None:
+                    raise
+                print(f"Error reloading competitor catalog: {e}")
+            return catalog
+
+    def intel_competitors(self, industry: str, key: str) -> Tuple[Mapping, ...]:
+        return self.intel.get(industry, EMPTY).get(key, ())
+
+    def analysis_competitors(self, industry: str) -> Tuple[Mapping, ...]:
+        return self.analysis.get(industry, ())
+
+    def tier_of(self, domain: str) -> Optional[str]:
+        return self._tier_by_domain.get(domain)
+
+    def entries_for_domain(self, domain: str) -> Tuple[Mapping, ...]:
+        return self.by_domain.get(domain, ())
@@ -1,81 +1,185 @@
 import requests
 import json
-from typing import List, Dict, Optional
+import hashlib
+from typing import List, Dict, Optional, Iterable
 import re
 from urllib.parse import quote_plus
 import random
-from datetime import datetime, timedelta
+import sys
+import os
+from datetime import datetime
+
+# Add current directory to path for imports
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from trends_engine import TrendsMatrixEngine, month_axis
+from autocomplete_client import AutocompleteService
+from trends_store import TrendsTimeSeriesStore
+
+# Sections of a trends response, in response order
+TRENDS_FIELDS = (
+    "search_volume",
+    "trend_data",
+    "related_queries",
+    "rising_queries",
+    "interest_by_region",
+    "seasonal_patterns",
+    "competition_level",
+    "suggested_bid",
+    "search_intent"
+)
+
+# Bump when the generated data model changes; part of every ETag
+TRENDS_DATA_VERSION = "1"
+
+# The only sections get_keyword_ideas reads
+KEYWORD_IDEA_FIELDS = ("search_volume", "competition_level", "suggested_bid", "search_intent")
 
 class GoogleTrendsAPI:
     """Enhanced SEO data provider with Google Trends style analytics"""
     
-    def __init__(self):
+    def __init__(self, trends_store: Optional[TrendsTimeSeriesStore] = None,
+                 autocomplete: Optional[AutocompleteService] = None):
+        # Local interest history; read before generating new series
+        self.trends_store = trends_store if trends_store is not None else TrendsTimeSeriesStore.from_env()
+        # Real suggestions for related/rising queries; templates fill in without them
+        self.autocomplete = autocomplete if autocomplete is not None else AutocompleteService.from_env()
+        
         # API endpoints for real data
         self.trends_url = "https://trends.google.com/trends/api/explore"
         self.autocomplete_url = "https://suggestqueries.google.com/complete/search"
         self.keyword_planner_url = "https://ads.google.com/intl/en_us/aw/keywordplanner"
         
-    def get_google_trends_data(self, keyword: str, region: str = "US") -> Dict:
-        """Get Google Trends style data for keywords"""
+    def base_data_version(self) -> str:
+        """Version of the generated data: the model version plus the month it is anchored to"""
+        return f"{TRENDS_DATA_VERSION}.{datetime.now():%Y-%m}"
+    
+    def data_version(self, keyword: str, region: str = "US") -> str:
+        """Everything a response for keyword depends on besides (keyword, region, fields)"""
+        version = self.base_data_version()
+        if self.trends_store is not None:
+            version += f".{self.trends_store.block_count(keyword, region)}"
+        if self.autocomplete is not None:
+            # Cached suggestions are what the next response is built from
+            mined = [self.autocomplete.cached(keyword, region, queries=queries)
+                     for queries in (None, self.autocomplete.client.expand_rising_queries(keyword))]
+            seen = "|".join(",".join(s["query"] for s in m["suggestions"]) if m else "-" for m in mined)
+            version += "." + hashlib.blake2b(seen.encode(), digest_size=8).hexdigest()
+        return version
+    
+    def key_rng(self, keyword: str, region: str, section: str) -> random.Random:
+        """Independent generator per (keyword, region, section) so every section is reproducible"""
+        key = f"{self.base_data_version()}|{region.upper()}|{keyword.lower()}|{section}"
+        return random.Random(int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), 'little'))
+    
+    def etag(self, view: str, keyword: str, region: str = "US",
+             fields: Optional[Iterable[str]] = None) -> str:
+        """Strong ETag for a response: identical inputs and data version give identical bodies"""
+        fields = ",".join(sorted(fields)) if fields else "*"
+        key = f"{view}|{keyword}|{region.upper()}|{fields}|{self.data_version(keyword, region)}"
+        return '"' + hashlib.sha256(key.encode()).hexdigest() + '"'
+    
+    def get_google_trends_data(self, keyword: str, region: str = "US",
+                               fields: Optional[Iterable[str]] = None) -> Dict:
+        """
+        Get Google Trends style data for keywords.
+        Pass fields to compute only those sections (see TRENDS_FIELDS).
+        """
         try:
             # For now, generate realistic trends data
             # In production, you'd use the official Google Trends API or pytrends
-            return self.generate_realistic_trends_data(keyword, region)
+            return self.generate_realistic_trends_data(keyword, region, fields)
         except Exception as e:
             print(f"Error getting trends data: {e}")
-            return self.generate_realistic_trends_data(keyword, region)
+            return self.generate_realistic_trends_data(keyword, region, fields)
     
-    def generate_realistic_trends_data(self, keyword: str, region: str = "US") -> Dict:
+    def generate_realistic_trends_data(self, keyword: str, region: str = "US",
+                                       fields: Optional[Iterable[str]] = None) -> Dict:
         """Generate realistic Google Trends style data"""
+        requested = TRENDS_FIELDS if fields is None else tuple(fields)
+        unknown = set(requested) - set(TRENDS_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown trends fields: {', '.join(sorted(unknown))}")
         
-        # Generate 12 months of trend data
-        trend_data = []
-        base_interest = random.randint(40, 100)
-        
-        for i in range(12):
-            date = datetime.now() - timedelta(days=30 * (11 - i))
-            
-            # Add seasonal variation
-            seasonal_factor = 1.0
-            if date.month in [11, 12]:  # Holiday season
-                seasonal_factor = 1.3
-            elif date.month in [6, 7, 8]:  # Summer
-                seasonal_factor = 1.1
-            elif date.month in [1, 2]:  # Post-holiday dip
-                seasonal_factor = 0.8
-            
-            interest = int(base_interest * seasonal_factor * random.uniform(0.7, 1.3))
-            interest = min(100, max(0, interest))
-            
-            trend_data.append({
-                "date": date.strftime("%Y-%m"),
-                "interest": interest
-            })
+        result = {
+            "keyword": keyword,
+            "region": region
+        }
         
-        # Generate related queries
-        related_queries = self.generate_related_queries(keyword)
-        rising_queries = self.generate_rising_queries(keyword)
+        # Seasonal analysis is derived from the trend series
+        trend_data = None
+        if "trend_data" in requested or "seasonal_patterns" in requested:
+            trend_data = self.get_trend_series(keyword, region)
+        
+        builders = {
+            "search_volume": lambda: self.calculate_realistic_search_volume(keyword, region),
+            "trend_data": lambda: trend_data,
+            "related_queries": lambda: self.generate_related_queries(keyword, region),
+            "rising_queries": lambda: self.generate_rising_queries(keyword, region),
+            "interest_by_region": lambda: self.generate_regional_interest(keyword, region),
+            "seasonal_patterns": lambda: self.analyze_seasonal_patterns(trend_data),
+            "competition_level": lambda: self.calculate_competition_level(keyword, region),
+            "suggested_bid": lambda: self.calculate_suggested_bid(keyword, region),
+            "search_intent": lambda: self.classify_search_intent(keyword)
+        }
         
-        # Calculate average search volume
-        search_volume = self.calculate_realistic_search_volume(keyword)
+        # Keep the canonical section order regardless of how fields were passed
+        for field in TRENDS_FIELDS:
+            if field in requested:
+                result[field] = builders[field]()
         
+        return result
+    
+    def get_trend_series(self, keyword: str, region: str = "US") -> List[Dict]:
+        """12-month series from the trends store, generating (and storing) the months it lacks"""
+        if self.trends_store is None:
+            return self.generate_trend_series(keyword, region)
+        
+        labels, _ = month_axis(12)
+        stored = {
+            point["date"]: point["interest"]
+            for point in self.trends_store.read_range(keyword, labels[0], labels[-1], region)
+        }
+        missing = [label for label in labels if label not in stored]
+        if missing:
+            # Only months with no history are generated; stored months are never overwritten
+            generated = {point["date"]: point["interest"] for point in self.generate_trend_series(keyword, region)}
+            added = [(label, generated[label]) for label in missing]
+            self.trends_store.append_many({keyword: added}, region)
+            stored.update(added)
+        return [{"date": label, "interest": stored[label]} for label in labels]
+    
+    def get_trend_history(self, keyword: str, start: Optional[str] = None, end: Optional[str] = None,
+                          region: str = "US") -> Dict:
+        """Stored interest history (any length) with its seasonal analysis"""
+        history = self.trends_store.read_range(keyword, start, end, region) if self.trends_store else []
         return {
             "keyword": keyword,
             "region": region,
-            "search_volume": search_volume,
-            "trend_data": trend_data,
-            "related_queries": related_queries,
-            "rising_queries": rising_queries,
-            "interest_by_region": self.generate_regional_interest(keyword),
-            "seasonal_patterns": self.analyze_seasonal_patterns(trend_data),
-            "competition_level": self.calculate_competition_level(keyword),
-            "suggested_bid": self.calculate_suggested_bid(keyword),
-            "search_intent": self.classify_search_intent(keyword)
+            "trend_data": history,
+            "seasonal_patterns": self.analyze_seasonal_patterns(history) if history else None
         }
     
-    def generate_related_queries(self, keyword: str) -> List[Dict]:
-        """Generate related queries like Google Keyword Planner"""
-        base_word = keyword.split()[0].lower()
+    def generate_trend_series(self, keyword: str, region: str = "US") -> List[Dict]:
+        """Generate 12 months of trend data"""
+        matrix = TrendsMatrixEngine(12, self.base_data_version()).generate([keyword], region)
+        return matrix.to_json_rows()[0]["trend_data"]
+    
+    def get_bulk_trends_data(self, keywords: List[str], region: str = "US", months: int = 12) -> List[Dict]:
+        """
+        Trend series and seasonal patterns for many keywords at once.
+        Series are generated as one keywords x months matrix and summarised
+        column-wise; JSON rows are only built at the end.
+        """
+        matrix = TrendsMatrixEngine(months, self.base_data_version()).generate(keywords, region)
+        rows = matrix.to_json_rows()
+        for row in rows:
+            row["region"] = region
+        return rows
+    
+    def generate_related_queries(self, keyword: str, region: str = "US") -> List[Dict]:
+        """Related queries like Google Keyword Planner: autocomplete suggestions, topped up from templates"""
+        rng = self.key_rng(keyword, region, "related_queries")
         
         # Common query patterns
         patterns = [
@@ -95,27 +199,28 @@ class GoogleTrendsAPI:
             f"{keyword} app",
             f"{keyword} software"
         ]
+        suggested = self.get_suggested_queries(keyword, region)
         
         related = []
-        for pattern in patterns[:8]:
-            volume = random.randint(100, 10000)
-            competition = random.choice(["Low", "Medium", "High"])
-            cpc = round(random.uniform(0.5, 8.0), 2)
+        for pattern in (suggested + [p for p in patterns if p.lower() not in suggested])[:8]:
+            volume = rng.randint(100, 10000)
+            competition = rng.choice(["Low", "Medium", "High"])
+            cpc = round(rng.uniform(0.5, 8.0), 2)
             
             related.append({
                 "query": pattern,
                 "volume": volume,
                 "competition": competition,
                 "cpc": cpc,
-                "trend": random.choice(["Rising", "Stable", "Declining"])
+                "trend": rng.choice(["Rising", "Stable", "Declining"])
             })
         
         return sorted(related, key=lambda x: x["volume"], reverse=True)
     
-    def generate_rising_queries(self, keyword: str) -> List[Dict]:
-        """Generate rising/trending queries"""
+    def generate_rising_queries(self, keyword: str, region: str = "US") -> List[Dict]:
+        """Rising/trending queries: current-year and "new" suggestions, topped up from templates"""
+        rng = self.key_rng(keyword, region, "rising_queries")
         current_year = datetime.now().year
-        base_word = keyword.split()[0].lower()
         
         rising_patterns = [
             f"{keyword} {current_year}",
@@ -127,11 +232,12 @@ class GoogleTrendsAPI:
             f"new {keyword}",
             f"{keyword} update"
         ]
+        suggested = self.get_suggested_queries(keyword, region, rising=True)
         
         rising = []
-        for pattern in rising_patterns[:6]:
-            growth = random.randint(150, 500)  # % growth
-            volume = random.randint(50, 2000)
+        for pattern in (suggested + [p for p in rising_patterns if p.lower() not in suggested])[:6]:
+            growth = rng.randint(150, 500)  # % growth
+            volume = rng.randint(50, 2000)
             
             rising.append({
                 "query": pattern,
@@ -142,17 +248,18 @@ class GoogleTrendsAPI:
         
         return rising
     
-    def generate_regional_interest(self, keyword: str) -> List[Dict]:
+    def generate_regional_interest(self, keyword: str, region: str = "US") -> List[Dict]:
         """Generate interest by region data"""
+        rng = self.key_rng(keyword, region, "interest_by_region")
         regions = [
-            {"region": "United States", "interest": random.randint(70, 100)},
-            {"region": "United Kingdom", "interest": random.randint(60, 90)},
-            {"region": "Canada", "interest": random.randint(50, 80)},
-            {"region": "Australia", "interest": random.randint(40, 75)},
-            {"region": "Germany", "interest": random.randint(30, 70)},
-            {"region": "France", "interest": random.randint(25, 65)},
-            {"region": "India", "interest": random.randint(35, 85)},
-            {"region": "Japan", "interest": random.randint(20, 60)}
+            {"region": "United States", "interest": rng.randint(70, 100)},
+            {"region": "United Kingdom", "interest": rng.randint(60, 90)},
+            {"region": "Canada", "interest": rng.randint(50, 80)},
+            {"region": "Australia", "interest": rng.randint(40, 75)},
+            {"region": "Germany", "interest": rng.randint(30, 70)},
+            {"region": "France", "interest": rng.randint(25, 65)},
+            {"region": "India", "interest": rng.randint(35, 85)},
+            {"region": "Japan", "interest": rng.randint(20, 60)}
         ]
         
         return sorted(regions, key=lambda x: x["interest"], reverse=True)
@@ -184,23 +291,24 @@ class GoogleTrendsAPI:
             "volatility": "Medium" if max(seasonal_analysis.values()) - min(seasonal_analysis.values()) > 20 else "Low"
         }
     
-    def calculate_realistic_search_volume(self, keyword: str) -> Dict:
+    def calculate_realistic_search_volume(self, keyword: str, region: str = "US") -> Dict:
         """Calculate realistic search volume like Google Keyword Planner"""
+        rng = self.key_rng(keyword, region, "search_volume")
         word_count = len(keyword.split())
         keyword_lower = keyword.lower()
         
         # Base volume calculation
         if word_count == 1:
             if len(keyword) <= 4:  # Short branded terms
-                monthly_volume = random.randint(50000, 500000)
+                monthly_volume = rng.randint(50000, 500000)
             else:
-                monthly_volume = random.randint(10000, 100000)
+                monthly_volume = rng.randint(10000, 100000)
         elif word_count == 2:
-            monthly_volume = random.randint(5000, 50000)
+            monthly_volume = rng.randint(5000, 50000)
         elif word_count == 3:
-            monthly_volume = random.randint(1000, 20000)
+            monthly_volume = rng.randint(1000, 20000)
         else:
-            monthly_volume = random.randint(100, 5000)
+            monthly_volume = rng.randint(100, 5000)
         
         # Adjust for commercial intent
         if any(word in keyword_lower for word in ['buy', 'price', 'cost', 'cheap', 'sale', 'discount']):
@@ -218,45 +326,47 @@ class GoogleTrendsAPI:
             "low_month_volume": int(monthly_volume * 0.6)
         }
     
-    def calculate_competition_level(self, keyword: str) -> Dict:
+    def calculate_competition_level(self, keyword: str, region: str = "US") -> Dict:
         """Calculate competition level with details"""
+        rng = self.key_rng(keyword, region, "competition_level")
         keyword_lower = keyword.lower()
         
         # Determine competition based on keyword characteristics
         if any(word in keyword_lower for word in ['buy', 'price', 'cost', 'cheap', 'sale']):
             competition = "High"
-            score = random.uniform(0.7, 1.0)
+            score = rng.uniform(0.7, 1.0)
         elif any(word in keyword_lower for word in ['how', 'what', 'why', 'guide', 'tutorial']):
             competition = "Low"
-            score = random.uniform(0.1, 0.4)
+            score = rng.uniform(0.1, 0.4)
         elif any(word in keyword_lower for word in ['best', 'top', 'review', 'compare']):
             competition = "High"
-            score = random.uniform(0.6, 0.9)
+            score = rng.uniform(0.6, 0.9)
         else:
             competition = "Medium"
-            score = random.uniform(0.3, 0.7)
+            score = rng.uniform(0.3, 0.7)
         
         return {
             "level": competition,
             "score": round(score, 2),
-            "indexed_pages": random.randint(100000, 50000000),
-            "competing_domains": random.randint(5000, 500000),
+            "indexed_pages": rng.randint(100000, 50000000),
+            "competing_domains": rng.randint(5000, 500000),
             "difficulty_rating": f"{int(score * 100)}/100"
         }
     
-    def calculate_suggested_bid(self, keyword: str) -> Dict:
+    def calculate_suggested_bid(self, keyword: str, region: str = "US") -> Dict:
         """Calculate suggested bid like Google Ads"""
+        rng = self.key_rng(keyword, region, "suggested_bid")
         keyword_lower = keyword.lower()
         
         # Base CPC calculation
         if any(word in keyword_lower for word in ['insurance', 'loan', 'lawyer', 'attorney']):
-            base_cpc = random.uniform(15.0, 50.0)
+            base_cpc = rng.uniform(15.0, 50.0)
         elif any(word in keyword_lower for word in ['buy', 'price', 'cost', 'purchase']):
-            base_cpc = random.uniform(2.0, 15.0)
+            base_cpc = rng.uniform(2.0, 15.0)
         elif any(word in keyword_lower for word in ['software', 'app', 'service']):
-            base_cpc = random.uniform(3.0, 12.0)
+            base_cpc = rng.uniform(3.0, 12.0)
         else:
-            base_cpc = random.uniform(0.5, 5.0)
+            base_cpc = rng.uniform(0.5, 5.0)
         
         return {
             "suggested_bid": round(base_cpc, 2),
@@ -314,6 +424,37 @@ class GoogleTrendsAPI:
         }
         return journey_map.get(intent, "Awareness")
     
+    def get_autocomplete_suggestions(self, keyword: str, region: str = "US", rising: bool = False) -> List[Dict]:
+        """
+        Mine real autocomplete suggestions for a keyword: a-z and question
+        fan-out, or current-year/"new" variants with rising=True. Blocking,
+        but safe to call from a thread running an event loop.
+        """
+        if self.autocomplete is None:
+            return []
+        queries = self.autocomplete.client.expand_rising_queries(keyword) if rising else None
+        try:
+            return self.autocomplete.mine(keyword, region, queries=queries)["suggestions"]
+        except Exception as e:
+            print(f"Error getting autocomplete suggestions: {e}")
+            return []
+    
+    async def get_autocomplete_suggestions_async(self, keyword: str, region: str = "US",
+                                                 rising: bool = False) -> List[Dict]:
+        """get_autocomplete_suggestions without blocking the caller's event loop"""
+        if self.autocomplete is None:
+            return []
+        queries = self.autocomplete.client.expand_rising_queries(keyword) if rising else None
+        try:
+            return (await self.autocomplete.mine_async(keyword, region, queries=queries))["suggestions"]
+        except Exception as e:
+            print(f"Error getting autocomplete suggestions: {e}")
+            return []
+    
+    def get_suggested_queries(self, keyword: str, region: str = "US", rising: bool = False) -> List[str]:
+        """Suggestion strings only; empty without the autocomplete service or when it fails"""
+        return [suggestion["query"] for suggestion in self.get_autocomplete_suggestions(keyword, region, rising)]
+    
     def get_keyword_ideas(self, seed_keyword: str, region: str = "US") -> List[Dict]:
         """Get keyword ideas like Google Keyword Planner"""
         base_word = seed_keyword.split()[0].lower()
@@ -357,13 +498,13 @@ class GoogleTrendsAPI:
         all_patterns = long_tail_patterns + question_patterns + commercial_patterns
         
         for pattern in all_patterns[:20]:  # Limit to 20 suggestions
-            trends_data = self.get_google_trends_data(pattern, region)
+            trends_data = self.get_google_trends_data(pattern, region, fields=KEYWORD_IDEA_FIELDS)
             keyword_ideas.append({
                 "keyword": pattern,
                 "search_volume": trends_data["search_volume"]["monthly_searches"],
                 "competition": trends_data["competition_level"]["level"],
                 "cpc": trends_data["suggested_bid"]["suggested_bid"],
-                "trend": random.choice(["Rising", "Stable", "Declining"]),
+                "trend": self.key_rng(pattern, region, "idea_trend").choice(["Rising", "Stable", "Declining"]),
                 "intent": trends_data["search_intent"]["primary_intent"],
                 "difficulty": trends_data["competition_level"]["difficulty_rating"]
             })
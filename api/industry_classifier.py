@@ -0,0 +1,179 @@
+import json
+import logging
+import os
+import threading
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+TAXONOMIES_PATH = os.getenv(
+    'INDUSTRY_TAXONOMIES_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'industry_taxonomies.json')
+)
+
+# List-valued fields are joined with this; patterns never contain it, so a
+# match cannot span two items
+ITEM_SEPARATOR = '\n'
+
+Fields = Mapping[str, Union[str, Sequence[str]]]
+
+
+def site_fields(content: Mapping, keywords: Sequence[Mapping], top_n: int = 20) -> Dict[str, Union[str, List[str]]]:
+    """'text' (title, meta description, headings) and 'keywords' fields of a scraped site"""
+    title = content.get('title', '').lower()
+    meta_desc = content.get('meta_description', '').lower()
+    headings = ' '.join(h for heading_list in content.get('headings', {}).values() for h in heading_list).lower()
+    return {
+        'text': f"{title} {meta_desc} {headings}",
+        'keywords': [kw['keyword'].lower() for kw in keywords[:top_n]]
+    }
+
+
+class IndustryClassifier:
+    """
+    Data-driven industry classifier over one taxonomy.
+    Every label's patterns are compiled into one deduplicated pattern list and
+    a (patterns x labels) incidence matrix, so each pattern is searched once
+    per field however many labels share it, and all labels are scored together.
+    A pattern matches a field when it is a substring of it.
+
+    mode 'ranked' returns labels by descending score (ties in taxonomy order),
+    keeping at most max_labels with score >= min_score; mode 'first' returns
+    the first matching label in taxonomy order, or the default.
+    """
+
+    _taxonomies: Dict[str, Dict] = {}
+    _instances: Dict[str, 'IndustryClassifier'] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, labels: Sequence[Tuple[str, Sequence[str]]], field_weights: Mapping[str, float],
+                 mode: str = 'ranked', min_score: float = 1, max_labels: Optional[int] = None,
+                 default: Optional[str] = None):
+        if mode not in ('ranked', 'first'):
+            raise ValueError(f"Unknown classifier mode: {mode}")
+        self.labels = [label for label, _ in labels]
+        self.field_weights = dict(field_weights)
+        self.mode = mode
+        self.min_score = min_score
+        self.max_labels = max_labels
+        self.default = default
+
+        pattern_ids: Dict[str, int] = {}
+        entries = []
+        for label_id, (_, patterns) in enumerate(labels):
+            for pattern in patterns:
+                pattern = pattern.lower()
+                if ITEM_SEPARATOR in pattern:
+                    raise ValueError(f"Pattern may not contain a newline: {pattern!r}")
+                entries.append((pattern_ids.setdefault(pattern, len(pattern_ids)), label_id))
+        self.patterns = list(pattern_ids)
+
+        # A pattern listed twice under one label counts twice, as in a plain loop
+        self.incidence = np.zeros((len(self.patterns), len(self.labels)), dtype=np.float64)
+        for pattern_id, label_id in entries:
+            self.incidence[pattern_id, label_id] += 1
+        # pattern id -> [(label id, count)] for the single-document path
+        self._pattern_labels = [
+            [(label_id, count) for label_id, count in enumerate(row) if count] for row in self.incidence.tolist()
+        ]
+
+    @classmethod
+    def from_taxonomy(cls, name: str, path: str = None) -> 'IndustryClassifier':
+        """Shared classifier for a taxonomy in the taxonomies file, compiled on first use"""
+        path = path or TAXONOMIES_PATH
+        key = f"{path}:{name}"
+        with cls._instances_lock:
+            classifier = cls._instances.get(key)
+            if classifier is None:
+                if path not in cls._taxonomies:
+                    with open(path, encoding='utf-8') as f:
+                        cls._taxonomies[path] = json.load(f)['taxonomies']
+                spec = cls._taxonomies[path][name]
+                classifier = cls(
+                    [(entry['label'], entry['patterns']) for entry in spec['labels']],
+                    spec['field_weights'],
+                    mode=spec.get('mode', 'ranked'),
+                    min_score=spec.get('min_score', 1),
+                    max_labels=spec.get('max_labels'),
+                    default=spec.get('default')
+                )
+                cls._instances[key] = classifier
+            return classifier
+
+    def _field_text(self, value: Union[str, Sequence[str], None]) -> str:
+        if value is None:
+            return ''
+        if isinstance(value, str):
+            return value.lower()
+        return ITEM_SEPARATOR.join(item.lower() for item in value)
+
+    def matched_patterns(self, fields: Fields) -> Dict[str, List[int]]:
+        """{field: [pattern ids found in it]}"""
+        matched = {}
+        for field in self.field_weights:
+            text = self._field_text(fields.get(field))
+            matched[field] = [i for i, pattern in enumerate(self.patterns) if pattern in text] if text else []
+        return matched
+
+    def score(self, fields: Fields) -> Dict[str, float]:
+        """Score of every label for one document"""
+        scores = [0] * len(self.labels)
+        for field, pattern_ids in self.matched_patterns(fields).items():
+            weight = self.field_weights[field]
+            for pattern_id in pattern_ids:
+                for label_id, count in self._pattern_labels[pattern_id]:
+                    scores[label_id] += weight * count
+        return dict(zip(self.labels, scores))
+
+    def explain(self, fields: Fields) -> Dict[str, List[str]]:
+        """{label: ['field:pattern', ...]} for every label with a match"""
+        explained: Dict[str, List[str]] = {}
+        for field, pattern_ids in self.matched_patterns(fields).items():
+            for pattern_id in pattern_ids:
+                for label_id, _ in self._pattern_labels[pattern_id]:
+                    explained.setdefault(self.labels[label_id], []).append(f"{field}:{self.patterns[pattern_id]}")
+        return explained
+
+    def classify(self, fields: Fields) -> Union[List[str], Optional[str]]:
+        """Ranked label list ('ranked' mode) or a single label ('first' mode)"""
+        return self._decide(list(self.score(fields).values()))
+
+    def classify_text(self, text: str) -> Union[List[str], Optional[str]]:
+        """Classify a document with a single field (e.g. a domain name)"""
+        field = next(iter(self.field_weights))
+        return self.classify({field: text})
+
+    def classify_batch(self, documents: Iterable[Fields]) -> List[Union[List[str], Optional[str]]]:
+        """
+        Classify many documents: a (documents x patterns) weighted match
+        matrix per field, times the incidence matrix, scores every label of
+        every document at once.
+        """
+        rows, columns, weights = [], [], []
+        count = 0
+        for row, fields in enumerate(documents):
+            count += 1
+            for field, pattern_ids in self.matched_patterns(fields).items():
+                rows.extend([row] * len(pattern_ids))
+                columns.extend(pattern_ids)
+                weights.extend([self.field_weights[field]] * len(pattern_ids))
+
+        weighted = np.zeros((count, len(self.patterns)), dtype=np.float64)
+        np.add.at(weighted, (rows, columns), weights)
+        scores = weighted @ self.incidence
+        return [self._decide(row) for row in scores.tolist()]
+
+    def _decide(self, scores: List[float]) -> Union[List[str], Optional[str]]:
+        if self.mode == 'first':
+            for label, score in zip(self.labels, scores):
+                if score > 0:
+                    return label
+            return self.default
+
+        # sorted() is stable: equal scores keep taxonomy order
+        ranked = sorted(
+            ((label, score) for label, score in zip(self.labels, scores) if score > 0),
+            key=lambda item: item[1], reverse=True
+        )
+        logging.debug(f"Industry scores: {ranked}")
+        return [label for label, score in ranked[:self.max_labels] if score >= self.min_score]
@@ -0,0 +1,184 @@
+import heapq
+import threading
+from itertools import chain
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class _Node:
+    __slots__ = ('children', 'top', 'keywords')
+
+    def __init__(self):
+        self.children: Dict[str, '_Node'] = {}
+        # Best (score, keyword) pairs in this subtree, highest first
+        self.top: List[Tuple[float, str]] = []
+        # Keywords whose key ends exactly here
+        self.keywords: Optional[set] = None
+
+
+class ScoredTrie:
+    """
+    Character trie where every node caches the top-k keywords beneath it,
+    so prefix and top-k lookups cost O(len(prefix) + k).
+    """
+
+    def __init__(self, scores: Dict[str, float], top_k: int = 20):
+        # keyword -> score, shared with the owning index
+        self.scores = scores
+        self.top_k = top_k
+        self.root = _Node()
+
+    def insert(self, key: str, keyword: str, previous: Optional[float] = None):
+        """Index keyword under key; previous is its old score when rescoring"""
+        path = [self.root]
+        node = self.root
+        for char in key:
+            node = node.children.setdefault(char, _Node())
+            path.append(node)
+        if node.keywords is None:
+            node.keywords = set()
+        node.keywords.add(keyword)
+
+        entry = (self.scores[keyword], keyword)
+        if previous is None or entry[0] >= previous:
+            # New or raised score: insert into each cached top-k, leaf first.
+            # An ancestor's k-th best is never worse than its child's, so
+            # once the entry misses a node's top-k it misses every ancestor's.
+            old = (previous, keyword)
+            for node in reversed(path):
+                top = node.top
+                if entry in top:
+                    # Already added via another key of the same keyword
+                    # (a repeated word gives token keys sharing a prefix)
+                    continue
+                if previous is not None and old in top:
+                    top.remove(old)
+                elif len(top) >= self.top_k and entry <= top[-1]:
+                    break
+                i = len(top)
+                while i and top[i - 1] < entry:
+                    i -= 1
+                top.insert(i, entry)
+                if len(top) > self.top_k:
+                    top.pop()
+        else:
+            # Lowered score: an entry outside a cached top-k may now belong in it
+            for node in reversed(path):
+                own = ((self.scores[k], k) for k in node.keywords or ())
+                children = (child.top for child in node.children.values())
+                node.top = heapq.nlargest(self.top_k, set(chain(own, *children)))
+
+    def find(self, prefix: str) -> Optional[_Node]:
+        node = self.root
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return None
+        return node
+
+    def walk(self, node: _Node):
+        """Every (score, keyword) stored at or below node"""
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            for keyword in node.keywords or ():
+                yield self.scores[keyword], keyword
+            stack.extend(node.children.values())
+
+
+class KeywordIndex:
+    """
+    Prefix, infix-token and top-k index over scored keywords.
+    The prefix trie holds whole keywords; the token trie holds every
+    word-start suffix, so 'tools' finds 'best seo tools for agencies'.
+    """
+
+    def __init__(self, top_k: int = 20):
+        self.top_k = top_k
+        self.records: Dict[str, Dict] = {}
+        self.scores: Dict[str, float] = {}
+        self.prefix_trie = ScoredTrie(self.scores, top_k)
+        self.token_trie = ScoredTrie(self.scores, top_k)
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def add(self, keyword: str, score: float, record: Optional[Dict] = None) -> bool:
+        """Insert or rescore one keyword; returns True if it was new"""
+        key = keyword.strip().lower()
+        if not key:
+            return False
+        with self._lock:
+            previous = self.scores.get(key)
+            self.records[key] = record or self.records.get(key) or {"keyword": key}
+            if previous == score:
+                return False
+            self.scores[key] = score
+
+            self.prefix_trie.insert(key, key, previous)
+            words = key.split()
+            for i in range(len(words)):
+                self.token_trie.insert(' '.join(words[i:]), key, previous)
+            return previous is None
+
+    def add_many(self, keywords: Iterable[Dict], score_key: str = 'score') -> int:
+        """Insert keyword records; returns how many were new"""
+        added = 0
+        for record in keywords:
+            added += self.add(record['keyword'], float(record.get(score_key, 0)), record)
+        return added
+
+    def prefix(self, prefix: str, limit: int = 10) -> List[Dict]:
+        """Highest-scoring keywords starting with prefix"""
+        return self._query(self.prefix_trie, prefix, limit)
+
+    def infix(self, token_prefix: str, limit: int = 10) -> List[Dict]:
+        """Highest-scoring keywords containing a word (or word run) starting with token_prefix"""
+        return self._query(self.token_trie, token_prefix, limit)
+
+    def top(self, limit: int = 10) -> List[Dict]:
+        return self._query(self.prefix_trie, '', limit)
+
+    def _query(self, trie: ScoredTrie, prefix: str, limit: int) -> List[Dict]:
+        with self._lock:
+            node = trie.find(prefix.strip().lower())
+            if node is None:
+                return []
+            if limit <= self.top_k:
+                best = node.top[:limit]
+            else:
+                # Beyond the cached top-k: walk the subtree
+                best = heapq.nlargest(limit, set(trie.walk(node)))
+            return [dict(self.records[keyword], score=score) for score, keyword in best]
+
+
+class KeywordIndexRegistry:
+    """One KeywordIndex per (domain, industry)"""
+
+    _default_instance = None
+    _default_lock = threading.Lock()
+
+    def __init__(self, top_k: int = 20):
+        self.top_k = top_k
+        self._indexes: Dict[Tuple[str, str], KeywordIndex] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def default(cls) -> 'KeywordIndexRegistry':
+        """Process-wide registry shared by the generator and the query endpoint"""
+        with cls._default_lock:
+            if cls._default_instance is None:
+                cls._default_instance = cls()
+            return cls._default_instance
+
+    def get(self, domain: str, industry: str) -> KeywordIndex:
+        key = (domain.lower(), industry.lower())
+        with self._lock:
+            index = self._indexes.get(key)
+            if index is None:
+                index = self._indexes[key] = KeywordIndex(self.top_k)
+            return index
+
+    def find(self, domain: str, industry: str) -> Optional[KeywordIndex]:
+        with self._lock:
+            return self._indexes.get((domain.lower(), industry.lower()))
@@ -0,0 +1,147 @@
+import re
+import sys
+from itertools import product, starmap
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+PLACEHOLDER = re.compile(r'\{(\w+)\}')
+
+# Slots expanded in an outer loop ahead of the rest, which fan out in
+# pattern order. Matches the order the old str.replace filler used.
+OUTER_SLOTS = ('product',)
+
+# Industry context key holding each slot's values
+SLOT_SOURCES = {
+    'use_case': 'use_cases',
+    'feature': 'features',
+    'action': 'actions',
+    'industry': 'industries',
+    'problem': 'problems',
+    'timeframe': 'timeframes'
+}
+
+# Values used when the context does not provide a slot
+DEFAULT_SLOT_VALUES = {
+    'year': ['2025'],
+    'use_case': ['business'],
+    'feature': ['feature'],
+    'action': ['use'],
+    'industry': ['business'],
+    'problem': ['issues'],
+    'timeframe': ['quickly'],
+    'competitor': ['alternative', 'competitor', 'solution'],
+    'alternative': ['alternatives', 'competitors'],
+    'qualifier': ['solution', 'tool', 'software', 'platform']
+}
+
+# Max values per slot; a template's fan-out is the product over its slots
+DEFAULT_SLOT_LIMITS = {
+    'product': 2,
+    'year': 1,
+    'use_case': 3,
+    'feature': 3,
+    'action': 3,
+    'industry': 3,
+    'problem': 2,
+    'timeframe': 2,
+    'competitor': 2,
+    'alternative': 2,
+    'qualifier': 2
+}
+
+
+class CompiledTemplate:
+    """
+    A keyword pattern parsed once into literal pieces and slot names.
+    Expansion is prefix concatenation: each level appends one slot value and
+    the following literal, so no string is ever scanned or re-parsed.
+    """
+
+    __slots__ = ('pattern', 'literals', 'slots', 'format')
+
+    def __init__(self, pattern: str):
+        self.pattern = pattern
+        pieces = PLACEHOLDER.split(pattern)
+        self.literals: Tuple[str, ...] = tuple(sys.intern(piece) for piece in pieces[0::2])
+        self.slots: Tuple[str, ...] = tuple(pieces[1::2])
+
+        # A slot used twice must take the same value in both places, which
+        # prefix concatenation cannot express; fall back to str.format
+        self.format = None
+        if len(set(self.slots)) != len(self.slots):
+            position = {name: i for i, name in enumerate(dict.fromkeys(self.slots))}
+            escaped = [piece.replace('{', '{{').replace('}', '}}') for piece in self.literals]
+            self.format = escaped[0] + ''.join(
+                '{%d}%s' % (position[slot], literal) for slot, literal in zip(self.slots, escaped[1:])
+            )
+
+    def expand(self, slot_values: Dict[str, Sequence[str]]) -> Iterator[str]:
+        """Every combination of slot values; slots without values stay as '{name}'"""
+        columns = [slot_values.get(slot) or ('{%s}' % slot,) for slot in self.slots]
+
+        if self.format is not None:
+            unique = [slot_values.get(slot) or ('{%s}' % slot,) for slot in dict.fromkeys(self.slots)]
+            yield from starmap(self.format.format, product(*unique))
+            return
+
+        outer = next((i for i, slot in enumerate(self.slots) if slot in OUTER_SLOTS), None)
+        if outer is None:
+            yield from self._concat(columns)
+            return
+        for value in columns[outer]:
+            columns[outer] = (value,)
+            yield from self._concat(columns)
+
+    def _concat(self, columns: List[Sequence[str]]) -> List[str]:
+        keywords = [self.literals[0]]
+        for values, literal in zip(columns, self.literals[1:]):
+            keywords = [prefix + value + literal for prefix in keywords for value in values]
+        return keywords
+
+
+class TemplateEngine:
+    """
+    Expands keyword templates across all placeholder slots.
+    Templates are compiled on first use and cached; per-slot limits cap
+    how many values each slot fans out to.
+    """
+
+    def __init__(self, slot_limits: Optional[Dict[str, int]] = None):
+        self.slot_limits = dict(DEFAULT_SLOT_LIMITS)
+        if slot_limits:
+            self.slot_limits.update(slot_limits)
+        self._compiled: Dict[str, CompiledTemplate] = {}
+
+    def compile(self, pattern: str) -> CompiledTemplate:
+        template = self._compiled.get(pattern)
+        if template is None:
+            template = self._compiled[pattern] = CompiledTemplate(pattern)
+        return template
+
+    def slot_values(self, context: Dict, **overrides: Sequence[str]) -> Dict[str, List[str]]:
+        """Limited values for every known slot from an industry context, plus overrides"""
+        values = {}
+        for slot in set(DEFAULT_SLOT_VALUES) | set(overrides):
+            if slot in overrides:
+                source = overrides[slot]
+            else:
+                source = context.get(SLOT_SOURCES.get(slot, ''), DEFAULT_SLOT_VALUES[slot])
+            values[slot] = [sys.intern(value) for value in source[:self.slot_limits.get(slot, len(source))]]
+        return values
+
+    def expand(self, pattern: str, slot_values: Dict[str, Sequence[str]]) -> Iterator[str]:
+        return self.compile(pattern).expand(slot_values)
+
+    def expand_unique(self, patterns: Iterable[str], slot_values: Dict[str, Sequence[str]],
+                      seen: Optional[Set[str]] = None, intern: bool = False) -> Iterator[str]:
+        """
+        Expand many patterns, yielding each keyword once.
+        Pass intern=True when the keywords are kept around (seen sets,
+        indexes) so duplicates across structures share one string object.
+        """
+        seen = set() if seen is None else seen
+        add = seen.add
+        for pattern in patterns:
+            expanded = self.compile(pattern).expand(slot_values)
+            if intern:
+                expanded = map(sys.intern, expanded)
+            yield from [keyword for keyword in expanded if not (keyword in seen or add(keyword))]
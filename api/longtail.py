@@ -0,0 +1,125 @@
+from http.server import BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+import json
+import time
+import sys
+import os
+
+# Add current directory to path for imports
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from longtail_generator import ProgrammaticLongTailGenerator
+
+# Warm instances keep the generator and its keyword indexes between requests
+generator = ProgrammaticLongTailGenerator()
+
+QUERY_MODES = ('prefix', 'infix', 'top')
+
+
+class handler(BaseHTTPRequestHandler):
+    def do_OPTIONS(self):
+        self.send_response(200)
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.end_headers()
+
+    def do_GET(self):
+        """Typeahead over a domain's long-tail keywords: ?domain=&industry=&q=&mode=prefix|infix|top&limit="""
+        params = parse_qs(urlparse(self.path).query)
+        domain = params.get('domain', [''])[0].strip()
+        industry = params.get('industry', ['saas'])[0].strip() or 'saas'
+        query = params.get('q', [''])[0]
+        mode = params.get('mode', ['prefix'])[0]
+
+        if not domain:
+            self.send_json(400, {"error": "domain is required"})
+            return
+        if mode not in QUERY_MODES:
+            self.send_json(400, {"error": f"mode must be one of: {', '.join(QUERY_MODES)}"})
+            return
+
+        try:
+            limit = max(1, min(int(params.get('limit', ['10'])[0]), 500))
+            count = max(1, min(int(params.get('count', ['50'])[0]), 1000))
+
+            index = generator.keyword_indexes.find(domain, industry)
+            if index is None or len(index) == 0:
+                generator.generate_longtail_keywords(domain, industry, count)
+                index = generator.keyword_indexes.get(domain, industry)
+
+            start = time.perf_counter()
+            if mode == 'prefix':
+                results = index.prefix(query, limit)
+            elif mode == 'infix':
+                results = index.infix(query, limit)
+            else:
+                results = index.top(limit)
+            took_ms = (time.perf_counter() - start) * 1000
+
+            self.send_json(200, {
+                "domain": domain,
+                "industry": industry,
+                "mode": mode,
+                "query": query,
+                "indexed_keywords": len(index),
+                "results": results,
+                "query_time_ms": round(took_ms, 3)
+            })
+
+        except ValueError as e:
+            self.send_json(400, {"error": str(e)})
+        except Exception as e:
+            self.send_json(500, {"error": f"Keyword index query failed: {str(e)}"})
+
+    def do_POST(self):
+        """
+        Grow a domain's index: {domain, industry, count?, account?, keywords?: [...], rejected?: [...]}.
+        With an account, generated keywords skip ones it has seen and rejected
+        keywords are never suggested to it again.
+        """
+        try:
+            content_length = int(self.headers['Content-Length'])
+            data = json.loads(self.rfile.read(content_length).decode('utf-8'))
+
+            domain = data.get('domain', '').strip()
+            industry = data.get('industry', 'saas') or 'saas'
+            if not domain:
+                self.send_json(400, {"error": "domain is required"})
+                return
+
+            index = generator.keyword_indexes.get(domain, industry)
+            before = len(index)
+
+            # Extracted keywords are ranked on the same scale as generated ones
+            for record in data.get('keywords', []):
+                if record.get('keyword'):
+                    index.add(record['keyword'], generator.calculate_strategic_value(record), record)
+
+            account = data.get('account')
+            if account and data.get('rejected') and generator.seen_filters is not None:
+                generator.seen_filters.mark_seen(account, data['rejected'])
+
+            generated = []
+            if data.get('count'):
+                generated = generator.generate_longtail_keywords(
+                    domain, industry, min(int(data['count']), 1000), account=account
+                )
+
+            self.send_json(200, {
+                "domain": domain,
+                "industry": industry,
+                "added": len(index) - before,
+                "indexed_keywords": len(index),
+                "generated": generated
+            })
+
+        except Exception as e:
+            self.send_json(500, {"error": f"Keyword index update failed: {str(e)}"})
+
+    def send_json(self, status, response):
+        self.send_response(status)
+        self.send_header('Content-type', 'application/json')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+        self.wfile.write(json.dumps(response).encode())
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Bulk long-tail generation for many client domains.
+
+    python api/longtail_batch.py domains.csv -o longtail.ndjson.gz --count 50 --workers 8
+
+domains.csv holds one "domain,industry" pair per line (industry defaults to
+saas). Output is gzip-compressed NDJSON, one keyword per line. Every flush
+appends a complete gzip member, then records it in a checkpoint file
+(<output>.checkpoint). Rerunning the same command after a crash truncates
+any unrecorded tail and skips domains that are already done.
+
+Random metrics are seeded per domain from --seed (random by default), so a
+seeded run gives the same rows whichever worker handles a domain, and a
+resumed run never repeats another domain's draws.
+"""
+import argparse
+import csv
+import gzip
+import json
+import os
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# Add current directory to path for imports
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from longtail_generator import ProgrammaticLongTailGenerator
+
+# Per-process generator: pattern tables and industry contexts are built
+# and templates compiled once per worker, not once per domain
+_generator: Optional[ProgrammaticLongTailGenerator] = None
+_seed: Optional[int] = None
+
+
+def _init_worker(slot_limits: Optional[Dict[str, int]], seed: int):
+    global _generator, _seed
+    _seed = seed
+    _generator = ProgrammaticLongTailGenerator(slot_limits)
+    for intent_config in _generator.intent_patterns.values():
+        for pattern in intent_config['patterns']:
+            _generator.templates.compile(pattern)
+
+
+def _generate(domain: str, industry: str, count: int) -> Tuple[str, str, List[Dict]]:
+    # Forked workers inherit the parent's random state; without a reseed every
+    # worker would draw the same "random" metrics
+    random.seed(f"{_seed}:{domain}:{industry}")
+    keywords = _generator.generate_longtail_keywords(domain, industry, count, index=False)
+    return domain, industry, keywords
+
+
+def read_domains(path: str) -> List[Tuple[str, str]]:
+    """(domain, industry) pairs from a CSV file; blank lines and '#' comments are skipped"""
+    pairs = []
+    with open(path, newline='') as f:
+        for row in csv.reader(f):
+            if not row or not row[0].strip() or row[0].lstrip().startswith('#'):
+                continue
+            domain = row[0].strip()
+            industry = row[1].strip() if len(row) > 1 and row[1].strip() else 'saas'
+            pairs.append((domain, industry))
+    return pairs
+
+
+class BatchCheckpoint:
+    """
+    Append-only log of finished work: one JSON line [output_offset, [[domain, industry], ...]]
+    per flush, written after the output bytes it covers are on disk.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.done: Set[Tuple[str, str]] = set()
+        self.offset = 0
+        if os.path.exists(path):
+            self._load()
+
+    def _load(self):
+        complete_bytes = 0
+        with open(self.path, 'rb') as f:
+            for line in f:
+                # A torn final line (crash mid-append) is dropped below
+                if not line.endswith(b'\n'):
+                    break
+                offset, pairs = json.loads(line)
+                self.done.update((domain, industry) for domain, industry in pairs)
+                self.offset = max(self.offset, offset)
+                complete_bytes += len(line)
+        if complete_bytes != os.path.getsize(self.path):
+            with open(self.path, 'r+b') as f:
+                f.truncate(complete_bytes)
+
+    def record(self, pairs: Iterable[Tuple[str, str]], offset: int):
+        pairs = list(pairs)
+        with open(self.path, 'a') as f:
+            f.write(json.dumps([offset, pairs]) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        self.done.update(pairs)
+        self.offset = offset
+
+
+class LongTailBatchRunner:
+    """Shards (domain, industry) pairs across a process pool and streams results to gzip NDJSON"""
+
+    def __init__(self, output_path: str, count: int = 50, workers: Optional[int] = None,
+                 flush_every: int = 10, slot_limits: Optional[Dict[str, int]] = None,
+                 checkpoint_path: Optional[str] = None, seed: Optional[int] = None):
+        self.output_path = output_path
+        self.count = count
+        self.workers = workers or os.cpu_count() or 1
+        self.flush_every = flush_every
+        self.slot_limits = slot_limits
+        self.seed = seed if seed is not None else random.SystemRandom().randrange(2 ** 32)
+        self.checkpoint = BatchCheckpoint(checkpoint_path or output_path + '.checkpoint')
+
+    def run(self, pairs: Iterable[Tuple[str, str]]) -> Dict:
+        pairs = list(dict.fromkeys(pairs))
+        pending = [pair for pair in pairs if pair not in self.checkpoint.done]
+        skipped = len(pairs) - len(pending)
+        self._truncate_output()
+
+        buffer: List[str] = []
+        buffered_pairs: List[Tuple[str, str]] = []
+        written = 0
+        failed = []
+
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                 initargs=(self.slot_limits, self.seed)) as executor:
+            futures = {executor.submit(_generate, domain, industry, self.count): (domain, industry)
+                       for domain, industry in pending}
+
+            for future in as_completed(futures):
+                domain, industry = futures[future]
+                try:
+                    _, _, keywords = future.result()
+                except Exception as e:
+                    print(f"Error generating long-tail keywords for {domain}: {e}")
+                    failed.append(domain)
+                    continue
+
+                buffer.extend(
+                    json.dumps({"domain": domain, "industry": industry, **keyword}) + '\n'
+                    for keyword in keywords
+                )
+                buffered_pairs.append((domain, industry))
+                written += len(keywords)
+
+                if len(buffered_pairs) >= self.flush_every:
+                    self._flush(buffer, buffered_pairs)
+                    buffer, buffered_pairs = [], []
+
+        if buffered_pairs:
+            self._flush(buffer, buffered_pairs)
+
+        return {
+            "domains_processed": len(pending) - len(failed),
+            "domains_skipped": skipped,
+            "domains_failed": failed,
+            "keywords_written": written,
+            "output": self.output_path
+        }
+
+    def _truncate_output(self):
+        # Drop output written after the last checkpoint (it will be regenerated)
+        if os.path.exists(self.output_path) and os.path.getsize(self.output_path) > self.checkpoint.offset:
+            with open(self.output_path, 'r+b') as f:
+                f.truncate(self.checkpoint.offset)
+
+    def _flush(self, lines: List[str], pairs: List[Tuple[str, str]]):
+        # One complete gzip member per flush; concatenated members are valid gzip
+        member = gzip.compress(''.join(lines).encode('utf-8'))
+        with open(self.output_path, 'ab') as f:
+            f.write(member)
+            f.flush()
+            os.fsync(f.fileno())
+            offset = f.tell()
+        self.checkpoint.record(pairs, offset)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Generate long-tail keywords for many domains")
+    parser.add_argument('domains', help='CSV file of domain,industry pairs')
+    parser.add_argument('-o', '--output', default='longtail.ndjson.gz', help='gzip NDJSON output path')
+    parser.add_argument('--count', type=int, default=50, help='keywords per domain')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes (default: CPU count)')
+    parser.add_argument('--flush-every', type=int, default=10, help='domains per output flush')
+    parser.add_argument('--checkpoint', default=None, help='checkpoint path (default: <output>.checkpoint)')
+    parser.add_argument('--seed', type=int, default=None, help='seed for per-domain random metrics (default: random)')
+    args = parser.parse_args(argv)
+
+    runner = LongTailBatchRunner(args.output, args.count, args.workers, args.flush_every,
+                                 checkpoint_path=args.checkpoint, seed=args.seed)
+    summary = runner.run(read_domains(args.domains))
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,33 @@
+import heapq
 import random
 import re
-from typing import List, Dict, Set
-from datetime import datetime
+from itertools import islice
+from typing import List, Dict, Set, Iterator, Iterable, Tuple, Optional
+import sys
+import os
+
+# Add current directory to path for imports
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from keyword_templates import TemplateEngine
+from keyword_index import KeywordIndexRegistry
+from seen_filter import SeenFilterStore
 
 class ProgrammaticLongTailGenerator:
     """Advanced programmatic long-tail keyword generator for strategic SEO"""
     
-    def __init__(self):
+    def __init__(self, slot_limits: Optional[Dict[str, int]] = None,
+                 keyword_indexes: Optional[KeywordIndexRegistry] = None,
+                 seen_filters: Optional[SeenFilterStore] = None):
+        # Compiled pattern cache; slot_limits caps per-placeholder fan-out
+        self.templates = TemplateEngine(slot_limits)
+        
+        # Per (domain, industry) prefix/typeahead index of generated keywords
+        self.keyword_indexes = keyword_indexes if keyword_indexes is not None else KeywordIndexRegistry.default()
+        
+        # Per-account keywords already delivered or rejected; None disables suppression
+        self.seen_filters = seen_filters if seen_filters is not None else SeenFilterStore.from_env()
+        
         # Intent-based keyword patterns
         self.intent_patterns = {
             'commercial': {
@@ -138,6 +159,37 @@ class ProgrammaticLongTailGenerator:
             'privacy focused', 'sustainable', 'automated', 'intelligent', 'next generation'
         ]
         
+        # Metrics for candidates that do not come from intent patterns
+        self.fixed_profiles = {
+            'trending': {
+                'volume_range': (300, 2000),
+                'cpc_range': (1.5, 6.0),
+                'competition': 'Medium',
+                'intent': 'trending',
+                'difficulty': '40/100',
+                'commercial_value': 'Medium',
+                'content_opportunity': 'Thought leadership content'
+            },
+            'semantic_comparison': {
+                'volume_range': (200, 1500),
+                'cpc_range': (2.0, 8.0),
+                'competition': 'High',
+                'intent': 'commercial',
+                'difficulty': '65/100',
+                'commercial_value': 'High',
+                'content_opportunity': 'Comparison pages'
+            },
+            'semantic_cost': {
+                'volume_range': (300, 2000),
+                'cpc_range': (1.5, 5.0),
+                'competition': 'Medium',
+                'intent': 'commercial',
+                'difficulty': '45/100',
+                'commercial_value': 'High',
+                'content_opportunity': 'Pricing pages'
+            }
+        }
+        
         # Semantic keyword clusters
         self.semantic_clusters = {
             'comparison': ['vs', 'versus', 'compared to', 'alternative to', 'instead of', 'better than'],
@@ -147,151 +199,144 @@ class ProgrammaticLongTailGenerator:
             'size': ['small business', 'enterprise', 'startup', 'large scale', 'team', 'individual']
         }
     
-    def generate_longtail_keywords(self, domain: str, industry: str, count: int = 50) -> List[Dict]:
-        """Generate programmatic long-tail keywords for strategic SEO"""
+    def generate_longtail_keywords(self, domain: str, industry: str, count: int = 50,
+                                   index: bool = True, account: Optional[str] = None) -> List[Dict]:
+        """
+        Generate programmatic long-tail keywords for strategic SEO.
+        With an account, keywords it has already been given are skipped
+        and this batch is recorded as delivered.
+        """
+        # The first `count` unique candidates, ranked by strategic value;
+        # nothing past them is expanded or scored
+        keywords = heapq.nlargest(
+            count,
+            self.iter_longtail_keywords(domain, industry, limit=count, account=account),
+            key=self.calculate_strategic_value
+        )
+        
+        if account and self.seen_filters is not None:
+            self.seen_filters.mark_seen(account, (keyword_data['keyword'] for keyword_data in keywords))
+        
+        # Keep the typeahead index current with every new batch
+        if index:
+            keyword_index = self.keyword_indexes.get(domain, industry)
+            for keyword_data in keywords:
+                keyword_index.add(keyword_data['keyword'], self.calculate_strategic_value(keyword_data), keyword_data)
         
+        return keywords
+    
+    def iter_longtail_keywords(self, domain: str, industry: str, limit: Optional[int] = None,
+                               account: Optional[str] = None) -> Iterator[Dict]:
+        """
+        Stream unique scored keywords in generation order.
+        Pipeline: template expansion -> dedup -> seen filter -> scoring, all
+        lazy, so the work done is proportional to what the caller consumes.
+        """
         domain_name = domain.split('.')[0]
         company_name = self.extract_company_name(domain)
         
         # Get industry context
         context = self.industry_contexts.get(industry, self.industry_contexts['saas'])
         
-        keywords = []
-        used_keywords = set()
-        
-        # Generate keywords for each intent type
-        for intent_type, intent_config in self.intent_patterns.items():
-            intent_keywords = self.generate_intent_keywords(
-                domain_name, company_name, intent_type, intent_config, context
-            )
-            
-            for keyword_data in intent_keywords:
-                if keyword_data['keyword'] not in used_keywords and len(keywords) < count:
-                    keywords.append(keyword_data)
-                    used_keywords.add(keyword_data['keyword'])
+        candidates = self.dedupe_candidates(self.expand_candidates(domain_name, company_name, context))
+        if account and self.seen_filters is not None:
+            seen = self.seen_filters.get(account)
+            candidates = ((keyword, kind) for keyword, kind in candidates if keyword.lower() not in seen)
+        scored = (self.score_candidate(keyword, kind) for keyword, kind in candidates)
+        return islice(scored, limit)
+    
+    def expand_candidates(self, domain_name: str, company_name: str, context: Dict) -> Iterator[Tuple[str, str]]:
+        """Yield (keyword, kind) candidates: intent patterns, then trending, then semantic"""
+        for intent_type in self.intent_patterns:
+            for keyword in self.expand_intent_patterns(domain_name, company_name, intent_type, context):
+                yield keyword, intent_type
         
-        # Add trending/seasonal keywords
-        trending_keywords = self.generate_trending_keywords(domain_name, industry, context)
-        for keyword_data in trending_keywords:
-            if keyword_data['keyword'] not in used_keywords and len(keywords) < count:
-                keywords.append(keyword_data)
-                used_keywords.add(keyword_data['keyword'])
+        for keyword in self.expand_trending_patterns(domain_name):
+            yield keyword, 'trending'
         
-        # Add semantic variations
-        semantic_keywords = self.generate_semantic_keywords(domain_name, context)
-        for keyword_data in semantic_keywords:
-            if keyword_data['keyword'] not in used_keywords and len(keywords) < count:
-                keywords.append(keyword_data)
-                used_keywords.add(keyword_data['keyword'])
+        yield from self.expand_semantic_patterns(domain_name)
+    
+    def dedupe_candidates(self, candidates: Iterable[Tuple[str, str]]) -> Iterator[Tuple[str, str]]:
+        """Drop repeated keywords, keeping the first occurrence"""
+        seen: Set[str] = set()
+        for keyword, kind in candidates:
+            keyword = sys.intern(keyword)
+            if keyword not in seen:
+                seen.add(keyword)
+                yield keyword, kind
+    
+    def score_candidate(self, keyword: str, kind: str) -> Dict:
+        """Attach metrics to a candidate keyword"""
+        if kind in self.intent_patterns:
+            intent_config = self.intent_patterns[kind]
+            volume = random.randint(*intent_config['volume_range'])
+            cpc = round(random.uniform(*intent_config['cpc_range']), 2)
+            competition = random.choice(intent_config['competition'])
+            
+            return {
+                'keyword': keyword,
+                'volume': volume,
+                'cpc': cpc,
+                'competition': competition,
+                'intent': kind,
+                'keyword_type': 'long-tail',
+                'difficulty': self.calculate_difficulty(competition, volume),
+                'commercial_value': self.calculate_commercial_value(kind, cpc),
+                'content_opportunity': self.suggest_content_type(kind, keyword)
+            }
         
-        # Sort by strategic value (volume * commercial intent)
-        return sorted(keywords, key=lambda x: self.calculate_strategic_value(x), reverse=True)[:count]
+        profile = self.fixed_profiles[kind]
+        return {
+            'keyword': keyword,
+            'volume': random.randint(*profile['volume_range']),
+            'cpc': round(random.uniform(*profile['cpc_range']), 2),
+            'competition': profile['competition'],
+            'intent': profile['intent'],
+            'keyword_type': 'long-tail',
+            'difficulty': profile['difficulty'],
+            'commercial_value': profile['commercial_value'],
+            'content_opportunity': profile['content_opportunity']
+        }
     
     def generate_intent_keywords(self, domain_name: str, company_name: str, 
                                 intent_type: str, intent_config: Dict, context: Dict) -> List[Dict]:
         """Generate keywords for specific search intent"""
-        
-        keywords = []
-        patterns = intent_config['patterns']
+        return [
+            self.score_candidate(keyword, intent_type)
+            for keyword in self.expand_intent_patterns(domain_name, company_name, intent_type, context)
+        ]
+    
+    def expand_intent_patterns(self, domain_name: str, company_name: str,
+                               intent_type: str, context: Dict) -> Iterator[str]:
+        """Yield filled long-tail keywords for one search intent, one pattern at a time"""
+        patterns = self.intent_patterns[intent_type]['patterns']
+        slot_values = self.pattern_slot_values(domain_name, company_name, context)
         
         for pattern in patterns[:8]:  # Limit patterns per intent
-            try:
-                # Fill pattern with context-appropriate terms
-                filled_keywords = self.fill_pattern(pattern, domain_name, company_name, context)
-                
-                for keyword in filled_keywords:
-                    if len(keyword.split()) >= 3:  # Ensure long-tail
-                        volume = random.randint(*intent_config['volume_range'])
-                        cpc = round(random.uniform(*intent_config['cpc_range']), 2)
-                        competition = random.choice(intent_config['competition'])
-                        
-                        keywords.append({
-                            'keyword': keyword,
-                            'volume': volume,
-                            'cpc': cpc,
-                            'competition': competition,
-                            'intent': intent_type,
-                            'keyword_type': 'long-tail',
-                            'difficulty': self.calculate_difficulty(competition, volume),
-                            'commercial_value': self.calculate_commercial_value(intent_type, cpc),
-                            'content_opportunity': self.suggest_content_type(intent_type, keyword)
-                        })
-            except:
-                continue
-        
-        return keywords
+            for keyword in self.templates.expand(pattern, slot_values):
+                if len(keyword.split()) >= 3:  # Ensure long-tail
+                    yield keyword
+    
+    def pattern_slot_values(self, domain_name: str, company_name: str, context: Dict) -> Dict[str, List[str]]:
+        """Values for every placeholder, limited per slot"""
+        products = [domain_name, company_name.lower(), f"{domain_name} software", f"{domain_name} platform"]
+        return self.templates.slot_values(context, product=products)
     
     def fill_pattern(self, pattern: str, domain_name: str, company_name: str, context: Dict) -> List[str]:
         """Fill keyword patterns with contextual terms"""
-        
-        filled_keywords = []
-        
-        # Replace placeholders with actual terms
-        if '{product}' in pattern:
-            products = [domain_name, company_name.lower(), f"{domain_name} software", f"{domain_name} platform"]
-            for product in products[:2]:  # Limit variations
-                current_pattern = pattern.replace('{product}', product)
-                filled_keywords.extend(self.fill_remaining_placeholders(current_pattern, context))
-        else:
-            filled_keywords.extend(self.fill_remaining_placeholders(pattern, context))
-        
-        return filled_keywords
+        slot_values = self.pattern_slot_values(domain_name, company_name, context)
+        return list(self.templates.expand(pattern, slot_values))
     
     def fill_remaining_placeholders(self, pattern: str, context: Dict) -> List[str]:
-        """Fill remaining placeholders in the pattern"""
-        
-        # Replace year placeholder
-        if '{year}' in pattern:
-            pattern = pattern.replace('{year}', '2025')
-        
-        # Replace use case placeholder
-        if '{use_case}' in pattern:
-            use_cases = context.get('use_cases', ['business'])
-            return [pattern.replace('{use_case}', use_case) for use_case in use_cases[:3]]
-        
-        # Replace feature placeholder
-        if '{feature}' in pattern:
-            features = context.get('features', ['feature'])
-            return [pattern.replace('{feature}', feature) for feature in features[:3]]
-        
-        # Replace action placeholder
-        if '{action}' in pattern:
-            actions = context.get('actions', ['use'])
-            return [pattern.replace('{action}', action) for action in actions[:3]]
-        
-        # Replace industry placeholder
-        if '{industry}' in pattern:
-            industries = context.get('industries', ['business'])
-            return [pattern.replace('{industry}', industry) for industry in industries[:3]]
-        
-        # Replace problem placeholder
-        if '{problem}' in pattern:
-            problems = context.get('problems', ['issues'])
-            return [pattern.replace('{problem}', problem) for problem in problems[:2]]
-        
-        # Replace timeframe placeholder
-        if '{timeframe}' in pattern:
-            timeframes = context.get('timeframes', ['quickly'])
-            return [pattern.replace('{timeframe}', timeframe) for timeframe in timeframes[:2]]
-        
-        # Replace competitor placeholder (generic)
-        if '{competitor}' in pattern:
-            competitors = ['alternative', 'competitor', 'solution']
-            return [pattern.replace('{competitor}', comp) for comp in competitors[:2]]
-        
-        # Replace qualifier placeholder
-        if '{qualifier}' in pattern:
-            qualifiers = ['solution', 'tool', 'software', 'platform']
-            return [pattern.replace('{qualifier}', qual) for qual in qualifiers[:2]]
-        
-        return [pattern]
+        """Fill every placeholder except {product}"""
+        return list(self.templates.expand(pattern, self.templates.slot_values(context)))
     
     def generate_trending_keywords(self, domain_name: str, industry: str, context: Dict) -> List[Dict]:
         """Generate trending and seasonal keywords"""
-        
-        keywords = []
-        current_year = datetime.now().year
-        
+        return [self.score_candidate(keyword, 'trending') for keyword in self.expand_trending_patterns(domain_name)]
+    
+    def expand_trending_patterns(self, domain_name: str) -> Iterator[str]:
+        """Yield trending keyword phrases"""
         # AI-powered variations
         ai_patterns = [
             f"ai powered {domain_name}",
@@ -320,63 +365,27 @@ class ProgrammaticLongTailGenerator:
         ]
         
         all_patterns = ai_patterns + future_patterns + remote_patterns
-        
-        for pattern in all_patterns[:10]:
-            volume = random.randint(300, 2000)
-            cpc = round(random.uniform(1.5, 6.0), 2)
-            
-            keywords.append({
-                'keyword': pattern,
-                'volume': volume,
-                'cpc': cpc,
-                'competition': 'Medium',
-                'intent': 'trending',
-                'keyword_type': 'long-tail',
-                'difficulty': '40/100',
-                'commercial_value': 'Medium',
-                'content_opportunity': 'Thought leadership content'
-            })
-        
-        return keywords
+        yield from all_patterns[:10]
     
     def generate_semantic_keywords(self, domain_name: str, context: Dict) -> List[Dict]:
         """Generate semantically related keywords"""
+        return [self.score_candidate(keyword, kind) for keyword, kind in self.expand_semantic_patterns(domain_name)]
+    
+    def expand_semantic_patterns(self, domain_name: str) -> Iterator[Tuple[str, str]]:
+        """Yield (keyword, kind) semantic variations"""
+        
+        def variations():
+            # Generate comparison keywords
+            for comparison in self.semantic_clusters['comparison']:
+                for quality in self.semantic_clusters['quality']:
+                    yield f"{quality} {domain_name} {comparison} competitors", 'semantic_comparison'
+            
+            # Generate cost-focused keywords
+            for cost_term in self.semantic_clusters['cost']:
+                for size in self.semantic_clusters['size']:
+                    yield f"{cost_term} {domain_name} for {size}", 'semantic_cost'
         
-        keywords = []
-        
-        # Generate comparison keywords
-        for comparison in self.semantic_clusters['comparison']:
-            for quality in self.semantic_clusters['quality']:
-                keyword = f"{quality} {domain_name} {comparison} competitors"
-                keywords.append({
-                    'keyword': keyword,
-                    'volume': random.randint(200, 1500),
-                    'cpc': round(random.uniform(2.0, 8.0), 2),
-                    'competition': 'High',
-                    'intent': 'commercial',
-                    'keyword_type': 'long-tail',
-                    'difficulty': '65/100',
-                    'commercial_value': 'High',
-                    'content_opportunity': 'Comparison pages'
-                })
-        
-        # Generate cost-focused keywords
-        for cost_term in self.semantic_clusters['cost']:
-            for size in self.semantic_clusters['size']:
-                keyword = f"{cost_term} {domain_name} for {size}"
-                keywords.append({
-                    'keyword': keyword,
-                    'volume': random.randint(300, 2000),
-                    'cpc': round(random.uniform(1.5, 5.0), 2),
-                    'competition': 'Medium',
-                    'intent': 'commercial',
-                    'keyword_type': 'long-tail',
-                    'difficulty': '45/100',
-                    'commercial_value': 'High',
-                    'content_opportunity': 'Pricing pages'
-                })
-        
-        return keywords[:15]  # Limit semantic keywords
+        return islice(variations(), 15)  # Limit semantic keywords
     
     def extract_company_name(self, domain: str) -> str:
         """Extract company name from domain"""
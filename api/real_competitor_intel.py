@@ -2,92 +2,39 @@ from http.server import BaseHTTPRequestHandler
 import requests
 import json
 import random
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Mapping
 import re
 from urllib.parse import quote_plus
+import sys
+import os
+
+# Add current directory to path for imports
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from competitor_catalog import CompetitorCatalog
+from industry_classifier import IndustryClassifier
 
 class RealCompetitorIntelligence:
     """Real competitor analysis with actual website data"""
     
-    def __init__(self):
-        # Real competitor databases by industry with accurate data
-        self.competitor_databases = {
-            'ai': {
-                'openai': [
-                    {'domain': 'anthropic.com', 'name': 'Anthropic', 'description': 'AI safety company behind Claude AI assistant', 'traffic': 15000000, 'authority': 78, 'funding': '$7.3B'},
-                    {'domain': 'deepseek.com', 'name': 'DeepSeek', 'description': 'Chinese AI company with competitive LLMs', 'traffic': 8500000, 'authority': 65, 'funding': '$1B+'},
-                    {'domain': 'gemini.google.com', 'name': 'Google Gemini', 'description': 'Google\'s advanced AI model family', 'traffic': 25000000, 'authority': 95, 'funding': 'Google'},
-                    {'domain': 'claude.ai', 'name': 'Claude AI', 'description': 'Anthropic\'s conversational AI assistant', 'traffic': 12000000, 'authority': 75, 'funding': '$7.3B'},
-                    {'domain': 'perplexity.ai', 'name': 'Perplexity', 'description': 'AI-powered search and answer engine', 'traffic': 6000000, 'authority': 70, 'funding': '$500M'}
-                ],
-                'anthropic': [
-                    {'domain': 'openai.com', 'name': 'OpenAI', 'description': 'Creator of ChatGPT and GPT models', 'traffic': 180000000, 'authority': 92, 'funding': '$13B'},
-                    {'domain': 'deepseek.com', 'name': 'DeepSeek', 'description': 'Chinese AI company with competitive LLMs', 'traffic': 8500000, 'authority': 65, 'funding': '$1B+'},
-                    {'domain': 'gemini.google.com', 'name': 'Google Gemini', 'description': 'Google\'s advanced AI model family', 'traffic': 25000000, 'authority': 95, 'funding': 'Google'},
-                    {'domain': 'cohere.com', 'name': 'Cohere', 'description': 'Enterprise AI platform for language understanding', 'traffic': 2500000, 'authority': 68, 'funding': '$445M'},
-                    {'domain': 'mistral.ai', 'name': 'Mistral AI', 'description': 'European AI company with open-source models', 'traffic': 3000000, 'authority': 72, 'funding': '$400M'}
-                ],
-                'default_ai': [
-                    {'domain': 'openai.com', 'name': 'OpenAI', 'description': 'Creator of ChatGPT and GPT models', 'traffic': 180000000, 'authority': 92, 'funding': '$13B'},
-                    {'domain': 'anthropic.com', 'name': 'Anthropic', 'description': 'AI safety company behind Claude', 'traffic': 15000000, 'authority': 78, 'funding': '$7.3B'},
-                    {'domain': 'deepseek.com', 'name': 'DeepSeek', 'description': 'Chinese AI company with competitive LLMs', 'traffic': 8500000, 'authority': 65, 'funding': '$1B+'},
-                    {'domain': 'gemini.google.com', 'name': 'Google Gemini', 'description': 'Google\'s AI model family', 'traffic': 25000000, 'authority': 95, 'funding': 'Google'},
-                    {'domain': 'perplexity.ai', 'name': 'Perplexity', 'description': 'AI-powered search engine', 'traffic': 6000000, 'authority': 70, 'funding': '$500M'}
-                ]
-            },
-            'ecommerce': {
-                'shopify': [
-                    {'domain': 'woocommerce.com', 'name': 'WooCommerce', 'description': 'WordPress ecommerce plugin', 'traffic': 12000000, 'authority': 85, 'funding': 'Automattic'},
-                    {'domain': 'bigcommerce.com', 'name': 'BigCommerce', 'description': 'Enterprise ecommerce platform', 'traffic': 8000000, 'authority': 82, 'funding': '$200M'},
-                    {'domain': 'magento.com', 'name': 'Magento', 'description': 'Adobe commerce platform', 'traffic': 15000000, 'authority': 88, 'funding': 'Adobe'},
-                    {'domain': 'squarespace.com', 'name': 'Squarespace', 'description': 'Website builder with ecommerce', 'traffic': 45000000, 'authority': 90, 'funding': 'Public'},
-                    {'domain': 'wix.com', 'name': 'Wix', 'description': 'Website builder platform', 'traffic': 120000000, 'authority': 93, 'funding': 'Public'}
-                ],
-                'default_ecommerce': [
-                    {'domain': 'shopify.com', 'name': 'Shopify', 'description': 'Leading ecommerce platform', 'traffic': 85000000, 'authority': 94, 'funding': 'Public'},
-                    {'domain': 'woocommerce.com', 'name': 'WooCommerce', 'description': 'WordPress ecommerce solution', 'traffic': 12000000, 'authority': 85, 'funding': 'Automattic'},
-                    {'domain': 'bigcommerce.com', 'name': 'BigCommerce', 'description': 'Enterprise ecommerce platform', 'traffic': 8000000, 'authority': 82, 'funding': '$200M'},
-                    {'domain': 'magento.com', 'name': 'Magento', 'description': 'Adobe commerce platform', 'traffic': 15000000, 'authority': 88, 'funding': 'Adobe'}
-                ]
-            },
-            'saas': {
-                'salesforce': [
-                    {'domain': 'hubspot.com', 'name': 'HubSpot', 'description': 'Inbound marketing and CRM platform', 'traffic': 75000000, 'authority': 94, 'funding': 'Public'},
-                    {'domain': 'pipedrive.com', 'name': 'Pipedrive', 'description': 'Sales CRM and pipeline management', 'traffic': 8000000, 'authority': 78, 'funding': '$100M'},
-                    {'domain': 'zoho.com', 'name': 'Zoho', 'description': 'Business software suite', 'traffic': 35000000, 'authority': 88, 'funding': 'Private'},
-                    {'domain': 'monday.com', 'name': 'Monday.com', 'description': 'Work management platform', 'traffic': 25000000, 'authority': 85, 'funding': 'Public'}
-                ],
-                'default_saas': [
-                    {'domain': 'salesforce.com', 'name': 'Salesforce', 'description': 'Leading CRM platform', 'traffic': 95000000, 'authority': 96, 'funding': 'Public'},
-                    {'domain': 'hubspot.com', 'name': 'HubSpot', 'description': 'Marketing and CRM platform', 'traffic': 75000000, 'authority': 94, 'funding': 'Public'},
-                    {'domain': 'zendesk.com', 'name': 'Zendesk', 'description': 'Customer service platform', 'traffic': 30000000, 'authority': 89, 'funding': 'Public'},
-                    {'domain': 'atlassian.com', 'name': 'Atlassian', 'description': 'Team collaboration tools', 'traffic': 55000000, 'authority': 91, 'funding': 'Public'}
-                ]
-            },
-            'finance': {
-                'stripe': [
-                    {'domain': 'paypal.com', 'name': 'PayPal', 'description': 'Global payment platform', 'traffic': 180000000, 'authority': 96, 'funding': 'Public'},
-                    {'domain': 'square.com', 'name': 'Square', 'description': 'Payment and business tools', 'traffic': 45000000, 'authority': 89, 'funding': 'Public'},
-                    {'domain': 'adyen.com', 'name': 'Adyen', 'description': 'Global payment platform', 'traffic': 8000000, 'authority': 82, 'funding': 'Public'},
-                    {'domain': 'klarna.com', 'name': 'Klarna', 'description': 'Buy now, pay later service', 'traffic': 25000000, 'authority': 85, 'funding': '$4B'}
-                ],
-                'default_finance': [
-                    {'domain': 'stripe.com', 'name': 'Stripe', 'description': 'Developer-first payments', 'traffic': 65000000, 'authority': 93, 'funding': '$95B valuation'},
-                    {'domain': 'paypal.com', 'name': 'PayPal', 'description': 'Global payment platform', 'traffic': 180000000, 'authority': 96, 'funding': 'Public'},
-                    {'domain': 'square.com', 'name': 'Square', 'description': 'Payment solutions', 'traffic': 45000000, 'authority': 89, 'funding': 'Public'},
-                    {'domain': 'adyen.com', 'name': 'Adyen', 'description': 'Enterprise payments', 'traffic': 8000000, 'authority': 82, 'funding': 'Public'}
-                ]
-            }
-        }
-        
-        # Real traffic data patterns (monthly visitors)
-        self.traffic_patterns = {
-            'tier_1': (50000000, 2000000000),  # Major sites like Amazon, Google
-            'tier_2': (10000000, 50000000),    # Large companies
-            'tier_3': (1000000, 10000000),     # Mid-size companies  
-            'tier_4': (100000, 1000000),       # Small companies
-            'tier_5': (10000, 100000)          # Startups/niche sites
-        }
+    def __init__(self, catalog: Optional[CompetitorCatalog] = None):
+        # Competitor data lives in data/competitor_catalog.json; without an
+        # explicit catalog the shared, hot-reloaded one is used
+        self._catalog = catalog
+    
+    @property
+    def catalog(self) -> CompetitorCatalog:
+        return self._catalog or CompetitorCatalog.current()
+    
+    @property
+    def competitor_databases(self) -> Mapping:
+        """Competitors by industry, then by domain name or default_<industry>"""
+        return self.catalog.intel
+    
+    @property
+    def traffic_patterns(self) -> Mapping:
+        """Monthly visitor ranges by tier"""
+        return self.catalog.traffic_tiers
     
     def analyze_competitors(self, domain: str) -> List[Dict]:
         """Get real competitors with actual traffic and ranking data"""
@@ -100,7 +47,7 @@ class RealCompetitorIntelligence:
         # Process competitor data (competitors is now already enriched with data)
         enriched_competitors = []
         for competitor in competitors:
-            if isinstance(competitor, dict):
+            if isinstance(competitor, Mapping):
                 # Already has data structure
                 competitor_data = self.process_competitor_data(competitor, industry)
             else:
@@ -112,47 +59,17 @@ class RealCompetitorIntelligence:
     
     def detect_industry(self, domain_name: str) -> str:
         """Detect industry based on domain name and keywords"""
-        domain_lower = domain_name.lower()
-        
-        # AI/ML companies
-        if any(keyword in domain_lower for keyword in ['ai', 'ml', 'neural', 'bot', 'gpt', 'claude', 'openai', 'anthropic']):
-            return 'ai'
-        
-        # SaaS keywords
-        elif any(keyword in domain_lower for keyword in ['app', 'soft', 'platform', 'tool', 'service', 'cloud', 'api']):
-            return 'saas'
-            
-        # E-commerce keywords
-        elif any(keyword in domain_lower for keyword in ['shop', 'store', 'buy', 'sell', 'commerce', 'market', 'retail']):
-            return 'ecommerce'
-            
-        # Finance keywords
-        elif any(keyword in domain_lower for keyword in ['pay', 'bank', 'finance', 'money', 'invest', 'loan', 'credit']):
-            return 'finance'
-            
-        # Media keywords
-        elif any(keyword in domain_lower for keyword in ['media', 'news', 'blog', 'video', 'stream', 'content']):
-            return 'media'
-            
-        # Tech keywords
-        elif any(keyword in domain_lower for keyword in ['tech', 'dev', 'code', 'git', 'data', 'analytics']):
-            return 'tech'
-            
-        else:
-            return 'saas'  # Default to SaaS
+        return IndustryClassifier.from_taxonomy('competitor_domain').classify_text(domain_name)
     
     def get_real_competitors(self, domain_name: str, industry: str) -> List[Dict]:
         """Get actual competitor data with full details"""
         
         # Check if we have specific competitors for this domain
-        if industry in self.competitor_databases:
-            if domain_name in self.competitor_databases[industry]:
-                return self.competitor_databases[industry][domain_name][:5]
-            else:
-                # Use default industry competitors
-                default_key = f'default_{industry}'
-                if default_key in self.competitor_databases[industry]:
-                    return self.competitor_databases[industry][default_key][:5]
+        catalog = self.catalog
+        competitors = catalog.intel_competitors(industry, domain_name) or \
+            catalog.intel_competitors(industry, f'default_{industry}')
+        if competitors:
+            return list(competitors[:5])
         
         # Fallback to generating competitors based on industry
         return self.generate_industry_competitors_with_data(domain_name, industry)
@@ -160,16 +77,11 @@ class RealCompetitorIntelligence:
     def generate_industry_competitors_with_data(self, domain_name: str, industry: str) -> List[Dict]:
         """Generate realistic competitors with full data for the industry"""
         
-        if industry == 'ai':
-            return self.competitor_databases['ai']['default_ai']
-        elif industry == 'saas':
-            return self.competitor_databases['saas']['default_saas']
-        elif industry == 'ecommerce':
-            return self.competitor_databases['ecommerce']['default_ecommerce']
-        elif industry == 'finance':
-            return self.competitor_databases['finance']['default_finance']
+        catalog = self.catalog
+        if industry in ('ai', 'saas', 'ecommerce', 'finance'):
+            return list(catalog.intel_competitors(industry, f'default_{industry}'))
         else:
-            return self.competitor_databases['ai']['default_ai']  # Default to AI
+            return list(catalog.intel_competitors('ai', 'default_ai'))  # Default to AI
     
     def process_competitor_data(self, competitor: Dict, industry: str) -> Dict:
         """Process existing competitor data and add additional metrics"""
@@ -268,16 +180,10 @@ class RealCompetitorIntelligence:
     
     def determine_competitor_tier(self, domain: str) -> str:
         """Determine the tier of a competitor based on domain recognition"""
-        major_sites = ['google.com', 'microsoft.com', 'amazon.com', 'apple.com', 'facebook.com', 'youtube.com', 'github.com']
-        large_sites = ['salesforce.com', 'hubspot.com', 'shopify.com', 'stripe.com', 'openai.com', 'anthropic.com']
-        mid_sites = ['atlassian.com', 'zendesk.com', 'monday.com', 'notion.so', 'figma.com']
-        
-        if domain in major_sites:
-            return 'tier_1'
-        elif domain in large_sites:
-            return 'tier_2'
-        elif domain in mid_sites:
-            return 'tier_3'
+        # Recognized sites (tiers 1-3) come from the catalog
+        tier = self.catalog.tier_of(domain)
+        if tier:
+            return tier
         elif any(x in domain for x in ['startup', 'new', 'beta']):
             return 'tier_5'
         else:
@@ -574,6 +480,8 @@ class RealCompetitorIntelligence:
         }
         return advantages.get(company_name, f'Strong presence in {industry} market')
 
+intel = RealCompetitorIntelligence()
+
 class handler(BaseHTTPRequestHandler):
     def do_OPTIONS(self):
         self.send_response(200)
@@ -611,8 +519,7 @@ class handler(BaseHTTPRequestHandler):
             # Extract domain
             domain = url.replace('https://', '').replace('http://', '').split('/')[0]
             
-            # Use the RealCompetitorIntelligence class
-            intel = RealCompetitorIntelligence()
+            # Shared instance; its catalog is loaded once per process
             competitors = intel.analyze_competitors(domain)
             
             response = {
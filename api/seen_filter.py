@@ -0,0 +1,178 @@
+import hashlib
+import math
+import os
+import re
+import struct
+import threading
+from typing import Dict, Iterable, List, Optional
+
+_LAYER_HEADER = struct.Struct('<QQIQ')   # capacity, bit count, hash count, items
+_FILE_HEADER = struct.Struct('<4sBdI')   # magic, version, error rate, layer count
+_MAGIC = b'SBF1'
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter using double hashing over one blake2b digest"""
+
+    def __init__(self, capacity: int, error_rate: float, bit_count: Optional[int] = None,
+                 hash_count: Optional[int] = None, bits: Optional[bytearray] = None, count: int = 0):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        # Optimal sizing: m = -n ln p / (ln 2)^2, k = m/n ln 2
+        self.bit_count = bit_count or max(8, int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)))
+        self.hash_count = hash_count or max(1, int(round(self.bit_count / capacity * math.log(2))))
+        self.bits = bits if bits is not None else bytearray((self.bit_count + 7) // 8)
+        self.count = count
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.bit_count for i in range(self.hash_count)]
+
+    def __contains__(self, item: str) -> bool:
+        bits = self.bits
+        return all(bits[p >> 3] & (1 << (p & 7)) for p in self._positions(item))
+
+    def add(self, item: str) -> bool:
+        """Set the item's bits; returns False if they were all set already"""
+        bits = self.bits
+        new = False
+        for p in self._positions(item):
+            mask = 1 << (p & 7)
+            if not bits[p >> 3] & mask:
+                bits[p >> 3] |= mask
+                new = True
+        if new:
+            self.count += 1
+        return new
+
+    @property
+    def full(self) -> bool:
+        return self.count >= self.capacity
+
+
+class ScalableBloomFilter:
+    """
+    Bloom filter that grows by adding layers (Almeida et al., 2007).
+    Each layer doubles in capacity and tightens its error rate by `ratio`,
+    so the compound false-positive rate stays below error_rate however
+    many items are added. Membership is O(1) per layer; there is no delete.
+    """
+
+    GROWTH = 2
+    RATIO = 0.9
+
+    def __init__(self, initial_capacity: int = 1000, error_rate: float = 0.001):
+        self.initial_capacity = initial_capacity
+        self.error_rate = error_rate
+        self.layers: List[BloomFilter] = []
+
+    def __contains__(self, item: str) -> bool:
+        # Newest layers hold the most items; check them first
+        return any(item in layer for layer in reversed(self.layers))
+
+    def __len__(self) -> int:
+        return sum(layer.count for layer in self.layers)
+
+    def add(self, item: str) -> bool:
+        """Add an item; returns False if it was (probably) present already"""
+        if item in self:
+            return False
+        if not self.layers or self.layers[-1].full:
+            i = len(self.layers)
+            self.layers.append(BloomFilter(
+                self.initial_capacity * self.GROWTH ** i,
+                self.error_rate * (1 - self.RATIO) * self.RATIO ** i
+            ))
+        self.layers[-1].add(item)
+        return True
+
+    def update(self, items: Iterable[str]) -> int:
+        return sum(self.add(item) for item in items)
+
+    def to_bytes(self) -> bytes:
+        parts = [_FILE_HEADER.pack(_MAGIC, 1, self.error_rate, len(self.layers))]
+        for layer in self.layers:
+            parts.append(_LAYER_HEADER.pack(layer.capacity, layer.bit_count, layer.hash_count, layer.count))
+            parts.append(bytes(layer.bits))
+        return b''.join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, initial_capacity: int = 1000) -> 'ScalableBloomFilter':
+        magic, _, error_rate, layer_count = _FILE_HEADER.unpack_from(data, 0)
+        if magic != _MAGIC:
+            raise ValueError("Not a seen-keyword filter file")
+        bloom = cls(initial_capacity, error_rate)
+        offset = _FILE_HEADER.size
+        for i in range(layer_count):
+            capacity, bit_count, hash_count, count = _LAYER_HEADER.unpack_from(data, offset)
+            offset += _LAYER_HEADER.size
+            size = (bit_count + 7) // 8
+            bloom.layers.append(BloomFilter(
+                capacity, error_rate * (1 - cls.RATIO) * cls.RATIO ** i,
+                bit_count, hash_count, bytearray(data[offset:offset + size]), count
+            ))
+            offset += size
+        if bloom.layers:
+            bloom.initial_capacity = bloom.layers[0].capacity
+        return bloom
+
+
+class SeenFilterStore:
+    """Per-account ScalableBloomFilters of keywords already delivered or rejected, one file each"""
+
+    def __init__(self, directory: str, error_rate: float = 0.001, initial_capacity: int = 1000):
+        self.directory = directory
+        self.error_rate = error_rate
+        self.initial_capacity = initial_capacity
+        os.makedirs(directory, exist_ok=True)
+        self._filters: Dict[str, ScalableBloomFilter] = {}
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_env(cls) -> Optional['SeenFilterStore']:
+        """Store at SEEN_FILTER_DIR (false-positive rate SEEN_FILTER_ERROR_RATE), or None when unset"""
+        directory = os.getenv('SEEN_FILTER_DIR')
+        if not directory:
+            return None
+        return cls(directory, float(os.getenv('SEEN_FILTER_ERROR_RATE', '0.001')))
+
+    def _path(self, account: str) -> str:
+        # The readable part alone is lossy ('a/b' and 'a_b' both give 'a_b');
+        # the hash of the exact account name keeps every account's file apart
+        safe = re.sub(r'[^A-Za-z0-9_.-]', '_', account)[:64]
+        digest = hashlib.sha256(account.encode('utf-8')).hexdigest()[:16]
+        return os.path.join(self.directory, f"{safe}-{digest}.bloom")
+
+    def get(self, account: str) -> ScalableBloomFilter:
+        with self._lock:
+            bloom = self._filters.get(account)
+            if bloom is None:
+                path = self._path(account)
+                if os.path.exists(path):
+                    with open(path, 'rb') as f:
+                        bloom = ScalableBloomFilter.from_bytes(f.read(), self.initial_capacity)
+                else:
+                    bloom = ScalableBloomFilter(self.initial_capacity, self.error_rate)
+                self._filters[account] = bloom
+            return bloom
+
+    def mark_seen(self, account: str, keywords: Iterable[str]) -> int:
+        """Record delivered or rejected keywords and persist the account's filter"""
+        with self._lock:
+            bloom = self.get(account)
+            added = bloom.update(keyword.strip().lower() for keyword in keywords)
+            if added:
+                self.save(account)
+            return added
+
+    def save(self, account: str):
+        with self._lock:
+            path = self._path(account)
+            tmp_path = path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(self._filters[account].to_bytes())
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
@@ -0,0 +1,85 @@
+from http.server import BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+import json
+import sys
+import os
+
+# Add current directory to path for imports
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from google_trends_api import GoogleTrendsAPI
+
+# Responses are deterministic per (keyword, region, fields, data version),
+# so one instance serves every request in a warm function
+trends_api = GoogleTrendsAPI()
+
+CACHE_CONTROL = 'public, max-age=3600, s-maxage=86400, stale-while-revalidate=3600'
+
+
+class handler(BaseHTTPRequestHandler):
+    def do_OPTIONS(self):
+        self.send_response(200)
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Allow-Methods', 'GET, OPTIONS')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type, If-None-Match')
+        self.send_header('Access-Control-Expose-Headers', 'ETag')
+        self.end_headers()
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = parse_qs(url.query)
+        keyword = params.get('keyword', [''])[0].strip()
+        region = params.get('region', ['US'])[0].strip() or 'US'
+        fields = [f for f in params.get('fields', [''])[0].split(',') if f] or None
+        view = 'ideas' if url.path.rstrip('/').endswith('keyword-ideas') else 'trends'
+
+        if not keyword:
+            self.send_json(400, {"error": "keyword is required"})
+            return
+
+        try:
+            etag = trends_api.etag(view, keyword, region, fields if view == 'trends' else None)
+
+            # Revalidation: nothing is generated when the client copy is current
+            client_tags = self.if_none_match()
+            if etag in client_tags or '*' in client_tags:
+                self.send_response(304)
+                self.send_header('ETag', etag)
+                self.send_header('Cache-Control', CACHE_CONTROL)
+                self.send_header('Access-Control-Allow-Origin', '*')
+                self.send_header('Access-Control-Expose-Headers', 'ETag')
+                self.end_headers()
+                return
+
+            if view == 'ideas':
+                response = {"keyword": keyword, "region": region,
+                            "ideas": trends_api.get_keyword_ideas(keyword, region)}
+            else:
+                response = trends_api.get_google_trends_data(keyword, region, fields)
+
+            # Generating may have stored a new series, which changes the data version
+            etag = trends_api.etag(view, keyword, region, fields if view == 'trends' else None)
+            self.send_json(200, response, etag)
+
+        except ValueError as e:
+            self.send_json(400, {"error": str(e)})
+        except Exception as e:
+            self.send_json(500, {"error": f"Trends lookup failed: {str(e)}"})
+
+    def if_none_match(self):
+        header = self.headers.get('If-None-Match', '')
+        # Weak validators compare equal for GET revalidation
+        return {tag.strip().removeprefix('W/') for tag in header.split(',') if tag.strip()}
+
+    def send_json(self, status, response, etag=None):
+        body = json.dumps(response, sort_keys=True).encode()
+        self.send_response(status)
+        self.send_header('Content-type', 'application/json')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        if etag:
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', CACHE_CONTROL)
+            self.send_header('Access-Control-Expose-Headers', 'ETag')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
@@ -0,0 +1,138 @@
+import calendar
+import hashlib
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Seasonal multipliers indexed by month number (index 0 unused)
+SEASONAL_FACTORS = np.array([
+    1.0,
+    0.8, 0.8,             # Jan-Feb: post-holiday dip
+    1.0, 1.0, 1.0,
+    1.1, 1.1, 1.1,        # Jun-Aug: summer
+    1.0, 1.0,
+    1.3, 1.3              # Nov-Dec: holiday season
+])
+
+
+def month_axis(months: int = 12, now: Optional[datetime] = None) -> Tuple[List[str], np.ndarray]:
+    """
+    "YYYY-MM" labels and month numbers for the trailing series, oldest first:
+    the current calendar month and the months before it. The axis only moves
+    when the month changes, like the month in the data version.
+    """
+    now = now or datetime.now()
+    current = now.year * 12 + now.month - 1
+    indexes = range(current - months + 1, current + 1)
+    return [f"{i // 12:04d}-{i % 12 + 1:02d}" for i in indexes], np.array([i % 12 + 1 for i in indexes])
+
+
+class TrendsMatrix:
+    """Interest series for many keywords: one row per keyword, one column per month"""
+
+    def __init__(self, keywords: List[str], labels: List[str], month_numbers: np.ndarray, interest: np.ndarray):
+        self.keywords = keywords
+        self.labels = labels
+        self.month_numbers = month_numbers
+        self.interest = interest
+
+    def seasonal_stats(self) -> Dict:
+        """
+        Column-wise seasonal statistics for every keyword at once.
+        Months are ordered by first appearance in the series, so ties
+        resolve the same way as GoogleTrendsAPI.analyze_seasonal_patterns.
+        """
+        _, first_index = np.unique(self.month_numbers, return_index=True)
+        months = self.month_numbers[np.sort(first_index)]
+
+        # (columns x months) one-hot membership: averages become one matmul
+        membership = (self.month_numbers[:, None] == months[None, :]).astype(np.float64)
+        monthly_means = np.round(self.interest @ membership / membership.sum(axis=0), 1)
+
+        peak = monthly_means.argmax(axis=1)
+        trough = monthly_means.argmin(axis=1)
+        spread = monthly_means.max(axis=1) - monthly_means.min(axis=1)
+
+        return {
+            "months": months,
+            "monthly_means": monthly_means,
+            "peak_index": peak,
+            "trough_index": trough,
+            "volatile": spread > 20
+        }
+
+    def to_json_rows(self) -> List[Dict]:
+        """Format per-keyword trend_data and seasonal_patterns like the single-keyword API"""
+        stats = self.seasonal_stats()
+        month_names = [calendar.month_name[m] for m in stats["months"]]
+        interest = self.interest.tolist()
+        means = stats["monthly_means"].tolist()
+
+        rows = []
+        for i, keyword in enumerate(self.keywords):
+            peak = stats["peak_index"][i]
+            trough = stats["trough_index"][i]
+            rows.append({
+                "keyword": keyword,
+                "trend_data": [
+                    {"date": label, "interest": value}
+                    for label, value in zip(self.labels, interest[i])
+                ],
+                "seasonal_patterns": {
+                    "monthly_averages": dict(zip(month_names, means[i])),
+                    "peak_season": f"{month_names[peak]} (Interest: {means[i][peak]})",
+                    "low_season": f"{month_names[trough]} (Interest: {means[i][trough]})",
+                    "volatility": "Medium" if stats["volatile"][i] else "Low"
+                }
+            })
+        return rows
+
+
+def keyword_seeds(keywords: List[str], namespace: str = "") -> np.ndarray:
+    """Stable 64-bit seed per keyword (case-insensitive) within a namespace"""
+    return np.array([
+        int.from_bytes(hashlib.blake2b(f"{namespace}|{keyword.lower()}".encode(), digest_size=8).digest(), 'little')
+        for keyword in keywords
+    ], dtype=np.uint64)
+
+
+def _splitmix64(x: np.ndarray) -> np.ndarray:
+    x = x + np.uint64(0x9E3779B97F4A7C15)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def keyed_uniform(seeds: np.ndarray, columns: int, stream: int = 0) -> np.ndarray:
+    """
+    (keywords x columns) uniforms in [0, 1), a pure function of (seed, stream, column).
+    Each keyword gets its own counter-based generator, so a row never
+    depends on which other keywords are in the batch.
+    """
+    counters = np.arange(columns, dtype=np.uint64) + np.uint64(stream << 32)
+    mixed = _splitmix64(seeds[:, None] ^ _splitmix64(counters)[None, :])
+    return (mixed >> np.uint64(11)).astype(np.float64) * (1.0 / (1 << 53))
+
+
+class TrendsMatrixEngine:
+    """
+    Generates keywords x months interest matrices in NumPy.
+    Output is deterministic per (keyword, region, version) and month axis.
+    """
+
+    def __init__(self, months: int = 12, version: str = ""):
+        self.months = months
+        self.version = version
+
+    def generate(self, keywords: List[str], region: str = "US", now: Optional[datetime] = None) -> TrendsMatrix:
+        labels, month_numbers = month_axis(self.months, now)
+        seeds = keyword_seeds(keywords, f"{self.version}|{region.upper()}|trend")
+
+        base_interest = 40 + np.floor(keyed_uniform(seeds, 1, stream=1) * 61)
+        noise = 0.7 + keyed_uniform(seeds, self.months, stream=2) * 0.6
+
+        interest = base_interest * SEASONAL_FACTORS[month_numbers][None, :] * noise
+        interest = np.clip(interest.astype(np.int64), 0, 100)
+
+        return TrendsMatrix(list(keywords), labels, month_numbers, interest)
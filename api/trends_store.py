@@ -0,0 +1,203 @@
+import json
+import mmap
+import os
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+def month_index(label: str) -> int:
+    """'YYYY-MM' -> months since year 0"""
+    year, month = label.split('-')
+    return int(year) * 12 + int(month) - 1
+
+
+def month_label(index: int) -> str:
+    return f"{index // 12:04d}-{index % 12 + 1:02d}"
+
+
+def encode_block(values: List[int]) -> bytes:
+    """Delta + zigzag + varint encoding of one column of monthly values"""
+    out = bytearray()
+    previous = 0
+    for value in values:
+        delta = value - previous
+        previous = value
+        zigzag = (delta << 1) ^ (delta >> 63)
+        while zigzag >= 0x80:
+            out.append((zigzag & 0x7F) | 0x80)
+            zigzag >>= 7
+        out.append(zigzag)
+    return bytes(out)
+
+
+def decode_block(data, offset: int, count: int) -> List[int]:
+    values = []
+    previous = 0
+    pos = offset
+    for _ in range(count):
+        shift = 0
+        zigzag = 0
+        while True:
+            byte = data[pos]
+            pos += 1
+            zigzag |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                break
+            shift += 7
+        previous += (zigzag >> 1) ^ -(zigzag & 1)
+        values.append(previous)
+    return values
+
+
+def _series_key(keyword: str, region: str) -> Tuple[str, str]:
+    return keyword.lower(), region.upper()
+
+
+class TrendsTimeSeriesStore:
+    """
+    Append-only store of monthly interest series per (keyword, region).
+    Each block is one series' values over a contiguous month range,
+    delta/varint encoded; months are implicit from the block start.
+    The data file is memory-mapped for reads; the block index is an
+    append-only log replayed on open.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.data_path = os.path.join(directory, 'series.dat')
+        self.index_path = os.path.join(directory, 'index.log')
+
+        self._lock = threading.RLock()
+        self._map = None
+        self._mapped_size = 0
+
+        # (keyword, region) -> [[start_month, count, offset, length], ...] in append order
+        self.index: Dict[Tuple[str, str], List[List[int]]] = {}
+        # Number of blocks ever written; changes whenever stored data changes
+        self.version = 0
+        if os.path.exists(self.index_path):
+            self._load_index()
+        open(self.data_path, 'ab').close()
+
+    def _load_index(self):
+        complete_bytes = 0
+        with open(self.index_path, 'rb') as f:
+            for line in f:
+                # A torn final line (crash mid-append) is dropped below
+                if not line.endswith(b'\n'):
+                    break
+                keyword, region, start, count, offset, length = json.loads(line)
+                self.index.setdefault((keyword, region), []).append([start, count, offset, length])
+                self.version += 1
+                complete_bytes += len(line)
+        if complete_bytes != os.path.getsize(self.index_path):
+            with open(self.index_path, 'r+b') as f:
+                f.truncate(complete_bytes)
+
+    @classmethod
+    def from_env(cls) -> Optional['TrendsTimeSeriesStore']:
+        """Store at TRENDS_STORE_DIR, or None when the variable is unset"""
+        directory = os.getenv('TRENDS_STORE_DIR')
+        return cls(directory) if directory else None
+
+    def append_many(self, series: Dict[str, Iterable[Tuple[str, int]]], region: str = "US") -> int:
+        """
+        Bulk append {keyword: [("YYYY-MM", value), ...]} for one region.
+        Points are split into contiguous month runs; newer data for a month
+        overrides older blocks on read.
+        """
+        with self._lock:
+            offset = os.path.getsize(self.data_path)
+            chunks = []
+            index_lines = []
+            written = 0
+
+            for keyword, points in series.items():
+                key = _series_key(keyword, region)
+                by_month = {month_index(label): int(value) for label, value in points}
+                for start, values in self._contiguous_runs(by_month):
+                    block = encode_block(values)
+                    chunks.append(block)
+                    entry = [start, len(values), offset, len(block)]
+                    self.index.setdefault(key, []).append(entry)
+                    index_lines.append(json.dumps(list(key) + entry) + '\n')
+                    offset += len(block)
+                    written += len(values)
+
+            if not chunks:
+                return 0
+
+            # Data is durable before the index lines that point at it
+            with open(self.data_path, 'ab') as f:
+                f.write(b''.join(chunks))
+                f.flush()
+                os.fsync(f.fileno())
+            with open(self.index_path, 'a') as f:
+                f.writelines(index_lines)
+
+            self.version += len(index_lines)
+            return written
+
+    def _contiguous_runs(self, by_month: Dict[int, int]):
+        run_start, run = None, []
+        for month in sorted(by_month):
+            if run and month != run_start + len(run):
+                yield run_start, run
+                run_start, run = None, []
+            if run_start is None:
+                run_start = month
+            run.append(by_month[month])
+        if run:
+            yield run_start, run
+
+    def _data(self):
+        size = os.path.getsize(self.data_path)
+        if self._map is None or size != self._mapped_size:
+            if self._map is not None:
+                self._map.close()
+            if size == 0:
+                return b''
+            with open(self.data_path, 'rb') as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._mapped_size = size
+        return self._map
+
+    def read_range(self, keyword: str, start: Optional[str] = None, end: Optional[str] = None,
+                   region: str = "US") -> List[Dict]:
+        """Stored points for a keyword in a region between two 'YYYY-MM' labels (inclusive)"""
+        with self._lock:
+            blocks = self.index.get(_series_key(keyword, region))
+            if not blocks:
+                return []
+
+            low = month_index(start) if start else None
+            high = month_index(end) if end else None
+            data = self._data()
+
+            points = {}
+            for block_start, count, offset, _ in blocks:
+                block_end = block_start + count - 1
+                if (low is not None and block_end < low) or (high is not None and block_start > high):
+                    continue
+                for i, value in enumerate(decode_block(data, offset, count)):
+                    month = block_start + i
+                    if (low is None or month >= low) and (high is None or month <= high):
+                        points[month] = value
+
+        return [{"date": month_label(month), "interest": points[month]} for month in sorted(points)]
+
+    def block_count(self, keyword: str, region: str = "US") -> int:
+        """Blocks stored for a keyword in a region; changes whenever that history changes"""
+        with self._lock:
+            return len(self.index.get(_series_key(keyword, region), ()))
+
+    def keywords(self, region: str = "US") -> List[str]:
+        with self._lock:
+            return [keyword for keyword, series_region in self.index if series_region == region.upper()]
+
+    def close(self):
+        with self._lock:
+            if self._map is not None:
+                self._map.close()
+                self._map = None
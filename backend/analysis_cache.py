@@ -0,0 +1,125 @@
+import asyncio
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+# Seconds a scraped and parsed site is reused across requests
+ANALYSIS_TTL = 300
+ANALYSIS_MAX_ENTRIES = 256
+
+
+def normalize_url(url: str) -> str:
+    """Cache key for a URL: scheme defaulted to https, host lowercased, no fragment or trailing slash"""
+    url = url.strip()
+    if '://' not in url:
+        url = f"https://{url}"
+    parts = urlsplit(url)
+    path = parts.path.rstrip('/')
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, parts.query, ''))
+
+
+class AnalysisSession:
+    """
+    One site's scrape and keyword extraction, plus keyword metrics per region
+    as they are requested. Shared between requests: treat as read-only.
+    """
+
+    def __init__(self, url: str, content: Dict, keywords: List[Dict]):
+        self.url = url
+        self.content = content
+        self.keywords = keywords
+        self.created_at = time.monotonic()
+        # region -> {keyword: metrics}
+        self.metrics: Dict[str, Dict[str, Dict]] = {}
+        self._metrics_lock = threading.Lock()
+
+    def metrics_for(self, region: str, fetch: Callable[[str, str], Dict]) -> Dict[str, Dict]:
+        """
+        {keyword: metrics} for every extracted keyword in region, fetched once
+        per region. Blocks while another thread fetches the same session's
+        metrics: call from a worker thread, not the event loop.
+        """
+        with self._metrics_lock:
+            metrics = self.metrics.get(region)
+            if metrics is None:
+                metrics = {kw['keyword']: fetch(kw['keyword'], region) for kw in self.keywords}
+                self.metrics[region] = metrics
+            return metrics
+
+
+class AnalysisSessionCache:
+    """
+    Short-lived cache of target-site analyses keyed by normalized URL, so
+    /analyze followed by /analyze-competitors scrapes and parses the site once.
+    Concurrent requests for the same URL share one in-flight analysis.
+    """
+
+    _default_instance = None
+    _default_lock = threading.Lock()
+
+    def __init__(self, ttl: float = ANALYSIS_TTL, max_entries: int = ANALYSIS_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._sessions: Dict[str, AnalysisSession] = {}
+        self._in_flight: Dict[str, asyncio.Task] = {}
+
+    @classmethod
+    def default(cls) -> 'AnalysisSessionCache':
+        """Process-wide cache shared by the analysis endpoints"""
+        with cls._default_lock:
+            if cls._default_instance is None:
+                cls._default_instance = cls()
+            return cls._default_instance
+
+    def get(self, url: str) -> Optional[AnalysisSession]:
+        key = normalize_url(url)
+        session = self._sessions.get(key)
+        if session is None:
+            return None
+        if time.monotonic() - session.created_at > self.ttl:
+            del self._sessions[key]
+            return None
+        return session
+
+    async def get_or_analyze(self, url: str, scraper, nlp_engine) -> AnalysisSession:
+        """Cached session for url, or scrape and extract keywords once and cache the result"""
+        session = self.get(url)
+        if session is not None:
+            return session
+
+        key = normalize_url(url)
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._analyze(key, url, scraper, nlp_engine))
+            self._in_flight[key] = task
+        # Shielded: one caller giving up does not cancel the others' analysis
+        return await asyncio.shield(task)
+
+    async def _analyze(self, key: str, url: str, scraper, nlp_engine) -> AnalysisSession:
+        try:
+            content = await scraper.scrape_website(url)
+            keywords = await asyncio.to_thread(nlp_engine.extract_keywords, content)
+            session = AnalysisSession(url, content, keywords)
+            self._store(key, session)
+            return session
+        finally:
+            # Failures are not cached; the next request retries
+            self._in_flight.pop(key, None)
+
+    def put(self, session: AnalysisSession):
+        """Cache a session analyzed outside get_or_analyze (e.g. by the bulk pipeline)"""
+        self._store(normalize_url(session.url), session)
+
+    def _store(self, key: str, session: AnalysisSession):
+        self._sessions.pop(key, None)
+        while len(self._sessions) >= self.max_entries:
+            # Oldest insertion first; dicts keep insertion order
+            self._sessions.pop(next(iter(self._sessions)))
+        self._sessions[key] = session
+
+    def invalidate(self, url: str):
+        self._sessions.pop(normalize_url(url), None)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
@@ -0,0 +1,149 @@
+import asyncio
+import logging
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+from backend.analysis_cache import AnalysisSession, AnalysisSessionCache, normalize_url
+from backend.keyword_analysis import build_keyword_response
+from backend.keyword_metrics import KeywordMetricsService
+from backend.nlp_engine import NLPKeywordEngine
+from backend.scraper import KeywordScraperAgent
+
+BULK_MAX_URLS = 5000
+# Per-stage workers: scraping waits on the network (one browser context each),
+# extraction is CPU-bound in threads, metrics mostly hit the local cache
+BULK_SCRAPE_CONCURRENCY = 8
+BULK_NLP_CONCURRENCY = 2
+BULK_METRICS_CONCURRENCY = 4
+# Items buffered between two stages; a slow consumer stalls every stage
+# upstream of it instead of letting results pile up
+BULK_QUEUE_SIZE = 16
+
+
+class BulkAnalysisPipeline:
+    """
+    Runs /analyze over many URLs as three stages (scrape -> extract keywords
+    -> metrics) connected by bounded queues, each stage with its own worker
+    count. Results come out in completion order, one per input URL; at most
+    the queued items plus one per worker are held in memory at any time.
+    """
+
+    def __init__(self, scraper_factory: Callable[[], KeywordScraperAgent], nlp_engine: NLPKeywordEngine,
+                 metrics_service: KeywordMetricsService, analysis_cache: AnalysisSessionCache,
+                 scrape_concurrency: int = BULK_SCRAPE_CONCURRENCY, nlp_concurrency: int = BULK_NLP_CONCURRENCY,
+                 metrics_concurrency: int = BULK_METRICS_CONCURRENCY, queue_size: int = BULK_QUEUE_SIZE):
+        self.scraper_factory = scraper_factory
+        self.nlp_engine = nlp_engine
+        self.metrics_service = metrics_service
+        self.analysis_cache = analysis_cache
+        self.scrape_concurrency = scrape_concurrency
+        self.nlp_concurrency = nlp_concurrency
+        self.metrics_concurrency = metrics_concurrency
+        self.queue_size = queue_size
+
+    async def run(self, urls: List[str], region: Union[str, List[str]]) -> AsyncIterator[Dict]:
+        """
+        Yield {'index', 'url', 'status': 'ok', ...analysis} or
+        {'index', 'url', 'status': 'error', 'stage', 'error'} per URL as each
+        finishes. A URL listed more than once is scraped once. Closing the
+        generator early cancels the remaining work.
+        """
+        scrape_queue = asyncio.Queue(self.queue_size)
+        nlp_queue = asyncio.Queue(self.queue_size)
+        metrics_queue = asyncio.Queue(self.queue_size)
+        results = asyncio.Queue(self.queue_size)
+        # normalized URL -> (index, url) of every entry waiting on its scrape
+        waiting: Dict[str, List[Tuple[int, str]]] = {}
+
+        async def fail(key: Optional[str], index: int, url: str, stage: str, error: Exception):
+            entries = waiting.pop(key, None) if key is not None else None
+            for entry_index, entry_url in entries or [(index, url)]:
+                await results.put(_error(entry_index, entry_url, stage, error))
+
+        async def feed():
+            for index, url in enumerate(urls):
+                await scrape_queue.put((index, url))
+
+        async def scrape_worker():
+            while True:
+                index, url = await scrape_queue.get()
+                key = None
+                try:
+                    key = normalize_url(url)
+                    # A site analyzed recently (by /analyze, or earlier in this batch) is not scraped again
+                    session = self.analysis_cache.get(url)
+                    if session is not None:
+                        await metrics_queue.put((index, url, session))
+                        continue
+                    if key in waiting:
+                        # Same site already being scraped in this batch
+                        waiting[key].append((index, url))
+                        continue
+                    waiting[key] = [(index, url)]
+                    content = await self.scraper_factory().scrape_website(url)
+                except Exception as e:
+                    await fail(key, index, url, 'scrape', e)
+                    continue
+                await nlp_queue.put((key, index, url, content))
+
+        async def nlp_worker():
+            while True:
+                key, index, url, content = await nlp_queue.get()
+                try:
+                    keywords = await asyncio.to_thread(self.nlp_engine.extract_keywords, content)
+                    session = AnalysisSession(url, content, keywords)
+                    self.analysis_cache.put(session)
+                except Exception as e:
+                    await fail(key, index, url, 'extract', e)
+                    continue
+                for entry_index, entry_url in waiting.pop(key, [(index, url)]):
+                    await metrics_queue.put((entry_index, entry_url, session))
+
+        async def metrics_worker():
+            while True:
+                index, url, session = await metrics_queue.get()
+                try:
+                    response = await asyncio.to_thread(
+                        build_keyword_response, url, region, session, self.metrics_service
+                    )
+                    line = {'index': index, 'url': url, 'status': 'ok', **response}
+                except Exception as e:
+                    line = _error(index, url, 'metrics', e)
+                await results.put(line)
+
+        tasks = [asyncio.ensure_future(feed())]
+        tasks += [asyncio.ensure_future(scrape_worker()) for _ in range(self.scrape_concurrency)]
+        tasks += [asyncio.ensure_future(nlp_worker()) for _ in range(self.nlp_concurrency)]
+        tasks += [asyncio.ensure_future(metrics_worker()) for _ in range(self.metrics_concurrency)]
+        try:
+            # Every URL produces exactly one result, success or error
+            for _ in range(len(urls)):
+                yield await results.get()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def validate_urls(urls: List[str]) -> List[str]:
+    """Normalized URLs, or ValueError naming the positions of unusable ones"""
+    normalized, invalid = [], []
+    for index, url in enumerate(urls):
+        try:
+            url = normalize_url(url)
+            parts = urlsplit(url)
+            if parts.scheme not in ('http', 'https') or not parts.hostname:
+                raise ValueError(url)
+        except ValueError:
+            invalid.append(index)
+            continue
+        normalized.append(url)
+    if invalid:
+        shown = ', '.join(str(index) for index in invalid[:20])
+        raise ValueError(f"Invalid URLs at positions {shown}{' ...' if len(invalid) > 20 else ''}")
+    return normalized
+
+
+def _error(index: int, url: str, stage: str, error: Exception) -> Dict:
+    logging.warning(f"Bulk analysis of {url} failed at {stage}: {error}")
+    return {'index': index, 'url': url, 'status': 'error', 'stage': stage, 'error': str(error)}
@@ -1,102 +1,271 @@
 import asyncio
-from typing import List, Dict, Optional
-from backend.scraper import KeywordScraperAgent
+import logging
+from typing import AsyncIterator, Callable, List, Dict, Mapping, Optional, Set, Tuple
+from backend.scraper import BrowserPool, KeywordScraperAgent
 from backend.nlp_engine import NLPKeywordEngine
 from backend.keyword_metrics import KeywordMetricsService
+from backend.keyword_similarity import SiteSimilarityIndex, keyword_weights, weighted_jaccard
+from backend.competitor_keyword_index import CompetitorKeywordIndex
+from backend.analysis_cache import AnalysisSessionCache
+from backend.competitor_snapshots import (
+    SNAPSHOT_REGIONS, CompetitorSnapshot, CompetitorSnapshotStore, content_hash
+)
+from api.competitor_catalog import CompetitorCatalog
+from api.industry_classifier import IndustryClassifier, site_fields
 import hashlib
 
+# Competitor pages scraped at once (each scrape runs its own browser)
+COMPETITOR_CONCURRENCY = 4
+# Seconds allowed per competitor (scrape, extraction and metrics) before
+# it is reported as a timeout entry
+COMPETITOR_TIMEOUT = 25.0
+
 class CompetitorAnalysisService:
-    def __init__(self):
-        self.scraper = KeywordScraperAgent()
-        self.nlp_engine = NLPKeywordEngine()
-        self.metrics_service = KeywordMetricsService()
+    def __init__(self, max_concurrency: int = COMPETITOR_CONCURRENCY,
+                 competitor_timeout: float = COMPETITOR_TIMEOUT,
+                 analysis_cache: Optional[AnalysisSessionCache] = None,
+                 snapshots: Optional[CompetitorSnapshotStore] = None,
+                 nlp_engine: Optional[NLPKeywordEngine] = None,
+                 metrics_service: Optional[KeywordMetricsService] = None,
+                 browser_pool: Optional[BrowserPool] = None):
+        self.browser_pool = browser_pool
+        self.nlp_engine = nlp_engine or NLPKeywordEngine()
+        self.metrics_service = metrics_service or KeywordMetricsService()
+        self.similarity_index = SiteSimilarityIndex.default()
+        self.analysis_cache = analysis_cache or AnalysisSessionCache.default()
+        self.snapshots = snapshots if snapshots is not None else CompetitorSnapshotStore.default()
+        self.industry_classifier = IndustryClassifier.from_taxonomy('site_content')
+        self.max_concurrency = max_concurrency
+        self.competitor_timeout = competitor_timeout
+    
+    def _scraper(self) -> KeywordScraperAgent:
+        # A scraper per task: without a started pool KeywordScraperAgent keeps its browser on the instance
+        return KeywordScraperAgent(self.browser_pool)
     
-    async def analyze_competitors(self, target_url: str, region: str = "us") -> Dict:
+    async def analyze_competitors(self, target_url: str, region: str = "us",
+                                  on_event: Optional[Callable[[str, Dict], None]] = None) -> Dict:
         """
-        Analyze competitors by finding similar websites and their keywords
+        Analyze competitors by finding similar websites and their keywords.
+        on_event(event, data) sees each stream_competitor_analysis event.
         """
         try:
-            # First analyze the target website once
-            target_content = await self.scraper.scrape_website(target_url)
-            target_keywords = self.nlp_engine.extract_keywords(target_content)
-            
-            # Get competitors based on target analysis
-            competitors = await self._find_competitors_from_content(target_content, target_keywords, target_url)
-            
-            competitor_analysis = []
-            
-            for competitor in competitors:
-                try:
-                    # Scrape competitor website
-                    content = await self.scraper.scrape_website(competitor['url'])
-                    
-                    # Extract keywords
-                    keywords = self.nlp_engine.extract_keywords(content)
-                    
-                    # Get top 20 keywords with metrics
-                    top_keywords = []
-                    total_volume = 0
-                    total_cpc = 0
-                    
-                    for keyword_data in keywords[:20]:  # Limit to top 20 for performance
-                        metrics = self.metrics_service.get_keyword_metrics(
-                            keyword_data['keyword'], region
-                        )
-                        
-                        keyword_with_metrics = {
-                            'keyword': keyword_data['keyword'],
-                            'volume': metrics['volume'],
-                            'cpc': metrics['cpc'],
-                            'competition': metrics['competition'],
-                            'type': keyword_data['type'],
-                            'intent': keyword_data['intent']
-                        }
-                        
-                        top_keywords.append(keyword_with_metrics)
-                        total_volume += metrics['volume'] or 0
-                        total_cpc += metrics['cpc'] or 0
-                    
-                    avg_cpc = round(total_cpc / len(top_keywords), 2) if top_keywords else 0
-                    
-                    competitor_analysis.append({
-                        'website': competitor['url'],
-                        'domain': competitor['domain'],
-                        'estimated_traffic': competitor['estimated_traffic'],
-                        'domain_authority': competitor['domain_authority'],
-                        'total_keywords': len(keywords),
-                        'top_keywords': top_keywords,
-                        'total_volume': total_volume,
-                        'avg_cpc': avg_cpc,
-                        'keyword_overlap': self._calculate_overlap(target_url, competitor['url'])
-                    })
-                    
-                except Exception as e:
-                    print(f"Error analyzing competitor {competitor['url']}: {e}")
-                    continue
-            
-            # Sort by estimated traffic
-            competitor_analysis.sort(key=lambda x: x['estimated_traffic'], reverse=True)
-            
-            # Use the already analyzed content for debugging
-            detected_industries = self._identify_industry(target_keywords, target_content)
-            
-            return {
-                'target_url': target_url,
-                'region': region,
-                'competitors_found': len(competitor_analysis),
-                'competitors': competitor_analysis,
-                'keyword_gaps': await self._find_keyword_gaps_from_content(target_content, target_keywords, competitor_analysis, region),
-                'debug_info': {
-                    'detected_industries': detected_industries,
-                    'title': target_content.get('title', ''),
-                    'meta_description': target_content.get('meta_description', ''),
-                    'top_keywords': [kw['keyword'] for kw in target_keywords[:10]]
-                }
-            }
+            analysis = {}
+            async for event, data in self.stream_competitor_analysis(target_url, region):
+                if on_event is not None:
+                    on_event(event, data)
+                if event == 'target':
+                    analysis.update(target_url=data['target_url'], region=data['region'])
+                    debug_info = data['debug_info']
+                elif event == 'gaps':
+                    analysis.update(data)
+            analysis['debug_info'] = debug_info
+            return analysis
             
         except Exception as e:
             raise Exception(f"Error in competitor analysis: {str(e)}")
     
+    async def stream_competitor_analysis(self, target_url: str, region: str = "us") -> AsyncIterator[Tuple[str, Dict]]:
+        """
+        Same analysis as analyze_competitors, as (event, data) pairs:
+        'target' once the target site is analyzed, 'competitor' for each
+        competitor as soon as it finishes, then 'gaps' with the sorted
+        competitors and the gap/overlap analysis.
+        """
+        # First analyze the target website once (or reuse a recent /analyze of it)
+        target = await self.analysis_cache.get_or_analyze(target_url, self._scraper(), self.nlp_engine)
+        target_content = target.content
+        target_keywords = target.keywords
+        
+        # Every analyzed site joins the keyword-overlap index
+        target_domain = self._domain(target_url)
+        target_weights = keyword_weights(target_keywords)
+        self.similarity_index.add(target_domain, target_weights)
+        
+        # Get competitors based on target analysis
+        competitors = await self._find_competitors_from_content(target_content, target_keywords, target_url)
+        
+        # Use the already analyzed content for debugging
+        detected_industries = self._identify_industry(target_keywords, target_content)
+        
+        yield 'target', {
+            'target_url': target_url,
+            'region': region,
+            'competitors_pending': [competitor['domain'] for competitor in competitors],
+            'debug_info': {
+                'detected_industries': detected_industries,
+                'title': target_content.get('title', ''),
+                'meta_description': target_content.get('meta_description', ''),
+                'top_keywords': [kw['keyword'] for kw in target_keywords[:10]]
+            }
+        }
+        
+        # Scrape and analyze all competitors concurrently; each one has its
+        # own deadline so a slow site cannot hold up the response
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        tasks = [
+            asyncio.ensure_future(self._analyze_competitor_with_deadline(competitor, target_weights, region, semaphore))
+            for competitor in competitors
+        ]
+        competitor_analysis = []
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                result = await next_done
+                if result is not None:
+                    competitor_analysis.append(result)
+                    yield 'competitor', result
+        finally:
+            # The consumer went away (e.g. client disconnect): stop scraping
+            for task in tasks:
+                task.cancel()
+        
+        # Sort by estimated traffic
+        competitor_analysis.sort(key=lambda x: x['estimated_traffic'], reverse=True)
+        
+        # keyword -> competitors postings shared by gap and overlap analysis
+        keyword_index = CompetitorKeywordIndex.from_competitors(competitor_analysis)
+        target_keyword_set = {keyword_index.normalize(kw['keyword']) for kw in target_keywords}
+        gap_keywords = keyword_index.gap_keywords(target_keyword_set)
+        
+        yield 'gaps', {
+            'competitors_found': len(competitor_analysis),
+            'competitors': competitor_analysis,
+            'keyword_gaps': await self._find_keyword_gaps_from_content(
+                target_content, target_keywords, competitor_analysis, region, keyword_index, gap_keywords
+            ),
+            'keyword_sets': self._keyword_sets(target_keyword_set, gap_keywords, keyword_index),
+            'similar_sites': [
+                {'domain': domain, 'keyword_overlap': round(score * 100, 1)}
+                for domain, score in self.similarity_index.most_similar_to_site(target_domain)
+            ]
+        }
+    
+    async def _analyze_competitor_with_deadline(self, competitor: Dict, target_weights: Dict[str, float], region: str,
+                                                semaphore: asyncio.Semaphore) -> Optional[Dict]:
+        """
+        Analyze one competitor within competitor_timeout.
+        On timeout, returns whatever was gathered so far marked 'timeout';
+        on error, returns None (the competitor is skipped, as before).
+        """
+        progress = {'keywords': [], 'top_keywords': []}
+        async with semaphore:
+            try:
+                return await asyncio.wait_for(
+                    self._analyze_competitor(competitor, target_weights, region, progress),
+                    timeout=self.competitor_timeout
+                )
+            except asyncio.TimeoutError:
+                print(f"Competitor {competitor['url']} timed out after {self.competitor_timeout}s")
+                return self._build_competitor_entry(competitor, target_weights, progress, status='timeout')
+            except Exception as e:
+                print(f"Error analyzing competitor {competitor['url']}: {e}")
+                return None
+    
+    async def _analyze_competitor(self, competitor: Dict, target_weights: Dict[str, float], region: str, progress: Dict) -> Dict:
+        # Catalog competitors are normally served from a precomputed snapshot
+        snapshot = self.snapshots.get_fresh(competitor['domain'])
+        if snapshot is not None:
+            return await self._analyze_competitor_from_snapshot(snapshot, competitor, target_weights, region, progress)
+        
+        content = await self._scraper().scrape_website(competitor['url'])
+        
+        # Extraction is CPU-bound NLTK work; keep it off the event loop
+        progress['keywords'] = await asyncio.to_thread(self.nlp_engine.extract_keywords, content)
+        weights = keyword_weights(progress['keywords'])
+        self.similarity_index.add(competitor['domain'], weights)
+        
+        await self._collect_top_keywords(progress['keywords'], region, progress['top_keywords'])
+        
+        # A live analysis doubles as the competitor's next snapshot
+        self.snapshots.put(CompetitorSnapshot(
+            competitor['domain'], competitor['url'], content_hash(content), progress['keywords'],
+            {region: progress['top_keywords']}, self.similarity_index.hasher.signature(weights)
+        ))
+        
+        return self._build_competitor_entry(competitor, target_weights, progress)
+    
+    async def _analyze_competitor_from_snapshot(self, snapshot: CompetitorSnapshot, competitor: Dict,
+                                                target_weights: Dict[str, float], region: str, progress: Dict) -> Dict:
+        progress['keywords'] = snapshot.keywords
+        self.similarity_index.add(competitor['domain'], keyword_weights(snapshot.keywords), snapshot.signature)
+        
+        top_keywords = snapshot.top_keywords.get(region)
+        if top_keywords is not None:
+            progress['top_keywords'].extend(top_keywords)
+        else:
+            # Keywords are region-independent; only the metrics are missing
+            await self._collect_top_keywords(snapshot.keywords, region, progress['top_keywords'])
+            self.snapshots.put_top_keywords(competitor['domain'], region, progress['top_keywords'])
+        
+        return self._build_competitor_entry(competitor, target_weights, progress)
+    
+    async def _collect_top_keywords(self, keywords: List[Dict], region: str, top_keywords: List[Dict]):
+        """Append metrics for the top 20 keywords to top_keywords as they arrive"""
+        for keyword_data in keywords[:20]:  # Limit to top 20 for performance
+            metrics = await asyncio.to_thread(
+                self.metrics_service.get_keyword_metrics, keyword_data['keyword'], region
+            )
+            
+            top_keywords.append({
+                'keyword': keyword_data['keyword'],
+                'volume': metrics['volume'],
+                'cpc': metrics['cpc'],
+                'competition': metrics['competition'],
+                'type': keyword_data['type'],
+                'intent': keyword_data['intent']
+            })
+    
+    async def refresh_snapshot(self, competitor: Mapping, regions=SNAPSHOT_REGIONS) -> CompetitorSnapshot:
+        """
+        Re-analyze one competitor into a new snapshot (scheduler job).
+        Keywords are only re-extracted when the page content changed.
+        """
+        content = await self._scraper().scrape_website(competitor['url'])
+        digest = content_hash(content)
+        
+        previous = self.snapshots.get(competitor['domain'])
+        if previous is not None and previous.content_hash == digest:
+            keywords = previous.keywords
+        else:
+            keywords = await asyncio.to_thread(self.nlp_engine.extract_keywords, content)
+        
+        # Regions requested since the last refresh stay precomputed too
+        if previous is not None:
+            regions = list(dict.fromkeys(list(regions) + list(previous.top_keywords)))
+        
+        top_keywords = {}
+        for region in regions:
+            top_keywords[region] = []
+            await self._collect_top_keywords(keywords, region, top_keywords[region])
+        
+        weights = keyword_weights(keywords)
+        snapshot = CompetitorSnapshot(
+            competitor['domain'], competitor['url'], digest, keywords, top_keywords,
+            self.similarity_index.hasher.signature(weights)
+        )
+        self.snapshots.put(snapshot)
+        self.similarity_index.add(competitor['domain'], weights, snapshot.signature)
+        return snapshot
+    
+    def _build_competitor_entry(self, competitor: Dict, target_weights: Dict[str, float], progress: Dict,
+                                status: str = 'complete') -> Dict:
+        top_keywords = list(progress['top_keywords'])
+        total_volume = sum(keyword['volume'] or 0 for keyword in top_keywords)
+        total_cpc = sum(keyword['cpc'] or 0 for keyword in top_keywords)
+        avg_cpc = round(total_cpc / len(top_keywords), 2) if top_keywords else 0
+        
+        return {
+            'website': competitor['url'],
+            'domain': competitor['domain'],
+            'estimated_traffic': competitor['estimated_traffic'],
+            'domain_authority': competitor['domain_authority'],
+            'total_keywords': len(progress['keywords']),
+            'top_keywords': top_keywords,
+            'total_volume': total_volume,
+            'avg_cpc': avg_cpc,
+            'keyword_overlap': self._calculate_overlap(target_weights, keyword_weights(progress['keywords'])),
+            'status': status
+        }
+    
     async def _find_competitors_from_content(self, target_content: Dict, target_keywords: List[Dict], target_url: str) -> List[Dict]:
         """
         Find relevant competitor websites based on already analyzed content
@@ -119,55 +288,11 @@ class CompetitorAnalysisService:
         """
         Identify the industry/niche based on website content
         """
-        # Extract key terms from title, headings, and top keywords
-        title = content.get('title', '').lower()
-        meta_desc = content.get('meta_description', '').lower()
-        headings = ' '.join([h for heading_list in content.get('headings', {}).values() for h in heading_list]).lower()
-        
-        all_text = f"{title} {meta_desc} {headings}"
-        top_keywords = [kw['keyword'].lower() for kw in keywords[:20]]
-        
-        # Industry classification patterns
-        industry_patterns = {
-            'ai_ml': ['artificial intelligence', 'machine learning', 'ai', 'neural', 'deep learning', 'language model', 'llm', 'chatbot', 'gpt', 'claude', 'anthropic', 'openai', 'transformer', 'nlp', 'conversational', 'assistant', 'generative', 'text generation', 'ai research', 'research lab', 'large language', 'chatgpt'],
-            'ecommerce': ['shop', 'buy', 'store', 'ecommerce', 'retail', 'cart', 'checkout', 'payment', 'marketplace', 'product', 'amazon', 'shopify'],
-            'saas': ['software', 'saas', 'platform', 'cloud', 'api', 'dashboard', 'subscription', 'enterprise', 'solution', 'tool'],
-            'finance': ['finance', 'fintech', 'banking', 'payment', 'cryptocurrency', 'bitcoin', 'trading', 'investment', 'lending'],
-            'healthcare': ['health', 'medical', 'doctor', 'patient', 'healthcare', 'medicine', 'clinic', 'hospital'],
-            'education': ['education', 'learning', 'course', 'student', 'teacher', 'university', 'school', 'training'],
-            'media': ['news', 'media', 'content', 'blog', 'journalism', 'video', 'streaming', 'entertainment'],
-            'social': ['social', 'community', 'network', 'connect', 'share', 'post', 'follow', 'friend'],
-            'productivity': ['productivity', 'project', 'management', 'collaboration', 'workflow', 'task', 'team']
-        }
-        
-        detected_industries = []
-        
-        for industry, patterns in industry_patterns.items():
-            score = 0
-            matched_patterns = []
-            for pattern in patterns:
-                if pattern in all_text:
-                    score += 3
-                    matched_patterns.append(f"text:{pattern}")
-                if any(pattern in kw for kw in top_keywords):
-                    score += 2
-                    matched_patterns.append(f"keyword:{pattern}")
-            
-            if score > 0:  # Lower threshold and log all scores
-                detected_industries.append((industry, score, matched_patterns))
-                print(f"Industry detection - {industry}: score={score}, matches={matched_patterns}")
-        
-        # Sort by score and return top industries
-        detected_industries.sort(key=lambda x: x[1], reverse=True)
-        
-        # Debug output
-        print(f"Content analysis:")
-        print(f"Title: {content.get('title', '')}")
-        print(f"Meta: {content.get('meta_description', '')}")
-        print(f"Top keywords: {[kw['keyword'] for kw in keywords[:10]]}")
-        print(f"Detected industries: {[(ind, score) for ind, score, _ in detected_industries]}")
-        
-        return [industry for industry, score, _ in detected_industries[:2] if score >= 2]
+        # Title, meta description, headings and the top 20 keywords
+        fields = site_fields(content, keywords)
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug(f"Industry matches for {content.get('url', '')}: {self.industry_classifier.explain(fields)}")
+        return self.industry_classifier.classify(fields)
     
     def _get_industry_competitors(self, industries: List[str], target_url: str) -> List[Dict]:
         """
@@ -175,40 +300,7 @@ class CompetitorAnalysisService:
         """
         domain = target_url.replace('https://', '').replace('http://', '').split('/')[0]
         
-        competitor_db = {
-            'ai_ml': [
-                {'url': 'https://openai.com', 'domain': 'openai.com', 'estimated_traffic': 180000000, 'domain_authority': 85},
-                {'url': 'https://cohere.ai', 'domain': 'cohere.ai', 'estimated_traffic': 2500000, 'domain_authority': 72},
-                {'url': 'https://huggingface.co', 'domain': 'huggingface.co', 'estimated_traffic': 25000000, 'domain_authority': 78},
-                {'url': 'https://mistral.ai', 'domain': 'mistral.ai', 'estimated_traffic': 1800000, 'domain_authority': 68},
-                {'url': 'https://ai.google.dev', 'domain': 'ai.google.dev', 'estimated_traffic': 15000000, 'domain_authority': 88},
-                {'url': 'https://together.ai', 'domain': 'together.ai', 'estimated_traffic': 800000, 'domain_authority': 65}
-            ],
-            'ecommerce': [
-                {'url': 'https://shopify.com', 'domain': 'shopify.com', 'estimated_traffic': 120000000, 'domain_authority': 89},
-                {'url': 'https://amazon.com', 'domain': 'amazon.com', 'estimated_traffic': 2800000000, 'domain_authority': 95},
-                {'url': 'https://ebay.com', 'domain': 'ebay.com', 'estimated_traffic': 850000000, 'domain_authority': 92},
-                {'url': 'https://etsy.com', 'domain': 'etsy.com', 'estimated_traffic': 480000000, 'domain_authority': 87}
-            ],
-            'saas': [
-                {'url': 'https://salesforce.com', 'domain': 'salesforce.com', 'estimated_traffic': 95000000, 'domain_authority': 90},
-                {'url': 'https://hubspot.com', 'domain': 'hubspot.com', 'estimated_traffic': 85000000, 'domain_authority': 88},
-                {'url': 'https://slack.com', 'domain': 'slack.com', 'estimated_traffic': 25000000, 'domain_authority': 85},
-                {'url': 'https://notion.so', 'domain': 'notion.so', 'estimated_traffic': 90000000, 'domain_authority': 82}
-            ],
-            'finance': [
-                {'url': 'https://stripe.com', 'domain': 'stripe.com', 'estimated_traffic': 45000000, 'domain_authority': 87},
-                {'url': 'https://paypal.com', 'domain': 'paypal.com', 'estimated_traffic': 780000000, 'domain_authority': 91},
-                {'url': 'https://coinbase.com', 'domain': 'coinbase.com', 'estimated_traffic': 65000000, 'domain_authority': 84},
-                {'url': 'https://robinhood.com', 'domain': 'robinhood.com', 'estimated_traffic': 25000000, 'domain_authority': 79}
-            ],
-            'social': [
-                {'url': 'https://twitter.com', 'domain': 'twitter.com', 'estimated_traffic': 1200000000, 'domain_authority': 93},
-                {'url': 'https://linkedin.com', 'domain': 'linkedin.com', 'estimated_traffic': 890000000, 'domain_authority': 94},
-                {'url': 'https://instagram.com', 'domain': 'instagram.com', 'estimated_traffic': 1800000000, 'domain_authority': 95},
-                {'url': 'https://discord.com', 'domain': 'discord.com', 'estimated_traffic': 180000000, 'domain_authority': 83}
-            ]
-        }
+        competitor_db = CompetitorCatalog.current().analysis
         
         # Prioritize the primary industry (first one with highest score)
         all_competitors = []
@@ -217,7 +309,7 @@ class CompetitorAnalysisService:
             # First, try to get competitors from the primary industry
             primary_industry = industries[0]
             if primary_industry in competitor_db:
-                all_competitors = competitor_db[primary_industry].copy()
+                all_competitors = list(competitor_db[primary_industry])
             
             # If we don't have enough competitors, add from secondary industries
             if len(all_competitors) < 4 and len(industries) > 1:
@@ -237,66 +329,47 @@ class CompetitorAnalysisService:
         """
         Fallback competitors when industry detection fails
         """
-        return [
-            {'url': 'https://google.com', 'domain': 'google.com', 'estimated_traffic': 8500000000, 'domain_authority': 100},
-            {'url': 'https://microsoft.com', 'domain': 'microsoft.com', 'estimated_traffic': 1200000000, 'domain_authority': 97},
-            {'url': 'https://apple.com', 'domain': 'apple.com', 'estimated_traffic': 900000000, 'domain_authority': 95}
-        ]
+        return list(CompetitorCatalog.current().analysis_fallback)
     
-    def _calculate_overlap(self, target_url: str, competitor_url: str) -> float:
+    def _calculate_overlap(self, target_weights: Dict[str, float], competitor_weights: Dict[str, float]) -> float:
         """
-        Calculate keyword overlap percentage (mock calculation)
+        Keyword overlap percentage: weighted Jaccard of the two sites'
+        extracted keywords, weighted by occurrence count
         """
-        # Mock overlap based on domain similarity
-        target_domain = target_url.replace('https://', '').replace('http://', '').split('/')[0]
-        competitor_domain = competitor_url.replace('https://', '').replace('http://', '').split('/')[0]
-        
-        # Simple character-based similarity for mock data
-        common_chars = set(target_domain) & set(competitor_domain)
-        total_chars = set(target_domain) | set(competitor_domain)
-        
-        overlap = len(common_chars) / len(total_chars) if total_chars else 0
-        return round(overlap * 100, 1)
+        return round(weighted_jaccard(target_weights, competitor_weights) * 100, 1)
     
-    async def _find_keyword_gaps_from_content(self, target_content: Dict, target_keywords: List[Dict], competitors: List[Dict], region: str) -> List[Dict]:
+    def _domain(self, url: str) -> str:
+        return url.replace('https://', '').replace('http://', '').split('/')[0].lower()
+    
+    async def _find_keyword_gaps_from_content(self, target_content: Dict, target_keywords: List[Dict], competitors: List[Dict], region: str,
+                                              index: Optional[CompetitorKeywordIndex] = None,
+                                              gap_keywords: Optional[Set[str]] = None) -> List[Dict]:
         """
         Find keyword opportunities that competitors rank for but target doesn't
         """
         try:
-            # Use already analyzed target keywords
-            target_keyword_set = {kw['keyword'].lower() for kw in target_keywords}
-            
-            # Find gaps
-            keyword_gaps = []
+            index = index or CompetitorKeywordIndex.from_competitors(competitors)
+            if gap_keywords is None:
+                gap_keywords = index.gap_keywords({index.normalize(kw['keyword']) for kw in target_keywords})
             
-            for competitor in competitors:
-                for keyword in competitor['top_keywords']:
-                    if keyword['keyword'].lower() not in target_keyword_set:
-                        gap = {
-                            'keyword': keyword['keyword'],
-                            'volume': keyword['volume'],
-                            'cpc': keyword['cpc'],
-                            'competition': keyword['competition'],
-                            'competitor_domain': competitor['domain'],
-                            'opportunity_score': self._calculate_opportunity_score(keyword)
-                        }
-                        keyword_gaps.append(gap)
-            
-            # Remove duplicates and sort by opportunity score
-            seen = set()
-            unique_gaps = []
-            for gap in keyword_gaps:
-                if gap['keyword'] not in seen:
-                    seen.add(gap['keyword'])
-                    unique_gaps.append(gap)
-            
-            unique_gaps.sort(key=lambda x: x['opportunity_score'], reverse=True)
-            return unique_gaps[:15]  # Return top 15 opportunities
+            # Top 15 opportunities, with every competitor sharing each gap
+            return index.top_k(gap_keywords, 15, self._calculate_opportunity_score)
             
         except Exception as e:
             print(f"Error finding keyword gaps: {e}")
             return []
     
+    def _keyword_sets(self, target_keyword_set: Set[str], gap_keywords: Set[str],
+                      index: CompetitorKeywordIndex) -> Dict:
+        """Shared keywords and per-competitor unique keyword counts from the inverted index"""
+        shared = index.shared_keywords(target_keyword_set)
+        return {
+            'shared_keywords': index.top_k(shared, 15, self._calculate_opportunity_score),
+            'shared_keyword_count': len(shared),
+            'gap_keyword_count': len(gap_keywords),
+            'unique_keyword_counts': index.unique_keyword_counts()
+        }
+    
     def _calculate_opportunity_score(self, keyword: Dict) -> float:
         """
         Calculate opportunity score based on volume, CPC, and competition
@@ -0,0 +1,93 @@
+import heapq
+from typing import Callable, Dict, Iterable, List, Set
+
+
+class CompetitorKeywordIndex:
+    """
+    Inverted index from normalized keyword to the competitors using it.
+    Postings keep each competitor's metrics for the keyword, in the order
+    competitors were added; gap, shared and unique sets are set algebra
+    over the posting keys.
+    """
+
+    def __init__(self):
+        # keyword -> {domain: keyword record with metrics}
+        self.postings: Dict[str, Dict[str, Dict]] = {}
+        # keyword -> first-seen order, for stable tie-breaking
+        self._rank: Dict[str, int] = {}
+        self.domains: List[str] = []
+
+    @classmethod
+    def from_competitors(cls, competitors: Iterable[Dict]) -> 'CompetitorKeywordIndex':
+        """Build from competitor analysis entries ({'domain', 'top_keywords'})"""
+        index = cls()
+        for competitor in competitors:
+            index.add_competitor(competitor['domain'], competitor.get('top_keywords', []))
+        return index
+
+    @staticmethod
+    def normalize(keyword: str) -> str:
+        return ' '.join(keyword.lower().split())
+
+    def add_competitor(self, domain: str, keywords: Iterable[Dict]):
+        if domain not in self.domains:
+            self.domains.append(domain)
+        for record in keywords:
+            term = self.normalize(record['keyword'])
+            if not term:
+                continue
+            posting = self.postings.get(term)
+            if posting is None:
+                posting = self.postings[term] = {}
+                self._rank[term] = len(self._rank)
+            # A competitor listing a keyword twice keeps its first record
+            posting.setdefault(domain, record)
+
+    def competitors_for(self, keyword: str) -> List[str]:
+        return list(self.postings.get(self.normalize(keyword), ()))
+
+    def gap_keywords(self, target_keywords: Set[str]) -> Set[str]:
+        """Keywords some competitor uses and the target does not"""
+        return self.postings.keys() - target_keywords
+
+    def shared_keywords(self, target_keywords: Set[str]) -> Set[str]:
+        """Keywords both the target and at least one competitor use"""
+        return self.postings.keys() & target_keywords
+
+    def unique_keywords(self, domain: str) -> Set[str]:
+        """Keywords only this competitor uses"""
+        return {term for term, posting in self.postings.items() if len(posting) == 1 and domain in posting}
+
+    def unique_keyword_counts(self) -> Dict[str, int]:
+        """Number of keywords only each competitor uses, in one pass over the postings"""
+        counts = dict.fromkeys(self.domains, 0)
+        for posting in self.postings.values():
+            if len(posting) == 1:
+                counts[next(iter(posting))] += 1
+        return counts
+
+    def top_k(self, terms: Iterable[str], k: int, score: Callable[[Dict], float]) -> List[Dict]:
+        """
+        Highest-scoring terms, each represented by its first competitor's
+        record and annotated with every competitor that uses it.
+        Ties keep first-seen order.
+        """
+        def entries():
+            for term in terms:
+                posting = self.postings[term]
+                domain, record = next(iter(posting.items()))
+                yield score(record), -self._rank[term], term, domain, record
+
+        best = heapq.nlargest(k, entries(), key=lambda entry: (entry[0], entry[1]))
+        return [
+            {
+                'keyword': record['keyword'],
+                'volume': record['volume'],
+                'cpc': record['cpc'],
+                'competition': record['competition'],
+                'competitor_domain': domain,
+                'competitor_domains': list(self.postings[term]),
+                'opportunity_score': opportunity
+            }
+            for opportunity, _, term, domain, record in best
+        ]
@@ -0,0 +1,287 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Awaitable, Callable, Dict, Iterable, List, Mapping, Optional
+
+import numpy as np
+
+from api.competitor_catalog import CompetitorCatalog
+
+DEFAULT_DB_PATH = os.getenv(
+    'COMPETITOR_SNAPSHOT_DB',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'competitor_snapshots.db')
+)
+
+SNAPSHOT_MAX_AGE = 24 * 3600       # served instead of scraping while younger than this
+SNAPSHOT_REFRESH_AGE = 18 * 3600   # the scheduler re-analyzes before snapshots go stale
+# Seconds between scheduler passes over the catalog. Off (0) by default: every
+# process that enables it scrapes the whole catalog, so enable it in one only
+SNAPSHOT_CHECK_INTERVAL = float(os.getenv('COMPETITOR_SNAPSHOT_INTERVAL', 0))
+SNAPSHOT_CONCURRENCY = 2
+SNAPSHOT_REGIONS = ('us',)
+
+
+def content_hash(content: Dict) -> str:
+    """Stable hash of scraped page content; unchanged pages skip re-extraction"""
+    encoded = json.dumps(content, sort_keys=True, ensure_ascii=False, default=str).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def _pack(value) -> bytes:
+    return zlib.compress(json.dumps(value, separators=(',', ':')).encode('utf-8'))
+
+
+def _unpack(blob: bytes):
+    return json.loads(zlib.decompress(blob))
+
+
+class CompetitorSnapshot:
+    """
+    One competitor's analysis at a point in time: every extracted keyword,
+    the top keywords with metrics per region, and the MinHash signature of
+    its keyword set.
+    """
+
+    def __init__(self, domain: str, url: str, content_hash: str, keywords: List[Dict],
+                 top_keywords: Dict[str, List[Dict]], signature: Optional[np.ndarray] = None,
+                 analyzed_at: Optional[float] = None):
+        self.domain = domain
+        self.url = url
+        self.content_hash = content_hash
+        self.keywords = keywords
+        self.top_keywords = top_keywords
+        self.signature = signature
+        self.analyzed_at = analyzed_at if analyzed_at is not None else time.time()
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.analyzed_at
+
+    def is_fresh(self, max_age: float = SNAPSHOT_MAX_AGE) -> bool:
+        return self.age <= max_age
+
+
+class CompetitorSnapshotStore:
+    """
+    Local SQLite store of competitor snapshots, one row per domain, and of
+    the keyword weights and MinHash signature of every analyzed site (the
+    persistent side of SiteSimilarityIndex).
+    """
+
+    _default_instance = None
+    _default_lock = threading.Lock()
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH, max_age: float = SNAPSHOT_MAX_AGE):
+        self.db_path = db_path
+        self.max_age = max_age
+        if db_path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        if db_path != ':memory:':
+            self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS competitor_snapshots (
+                domain TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                keywords BLOB NOT NULL,
+                top_keywords BLOB NOT NULL,
+                signature BLOB,
+                analyzed_at REAL NOT NULL
+            ) WITHOUT ROWID
+        """)
+        # version orders writes across processes, so readers can pick up
+        # only what changed since they last looked
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS site_signatures (
+                site TEXT PRIMARY KEY,
+                weights BLOB NOT NULL,
+                signature BLOB NOT NULL,
+                version INTEGER NOT NULL
+            ) WITHOUT ROWID;
+
+            CREATE INDEX IF NOT EXISTS idx_site_signatures_version ON site_signatures (version);
+        """)
+
+    @classmethod
+    def default(cls) -> 'CompetitorSnapshotStore':
+        """Process-wide store at DEFAULT_DB_PATH"""
+        with cls._default_lock:
+            if cls._default_instance is None:
+                cls._default_instance = cls()
+            return cls._default_instance
+
+    def get(self, domain: str) -> Optional[CompetitorSnapshot]:
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT domain, url, content_hash, keywords, top_keywords, signature, analyzed_at '
+                'FROM competitor_snapshots WHERE domain = ?',
+                (domain.lower(),)
+            ).fetchone()
+        if row is None:
+            return None
+        domain, url, digest, keywords, top_keywords, signature, analyzed_at = row
+        return CompetitorSnapshot(
+            domain, url, digest, _unpack(keywords), _unpack(top_keywords),
+            np.frombuffer(signature, dtype=np.uint64) if signature else None,
+            analyzed_at
+        )
+
+    def get_fresh(self, domain: str) -> Optional[CompetitorSnapshot]:
+        """Snapshot for domain if it is younger than max_age"""
+        snapshot = self.get(domain)
+        return snapshot if snapshot is not None and snapshot.is_fresh(self.max_age) else None
+
+    def put(self, snapshot: CompetitorSnapshot):
+        signature = snapshot.signature.astype(np.uint64).tobytes() if snapshot.signature is not None else None
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO competitor_snapshots
+                    (domain, url, content_hash, keywords, top_keywords, signature, analyzed_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (snapshot.domain.lower(), snapshot.url, snapshot.content_hash, _pack(snapshot.keywords),
+                 _pack(snapshot.top_keywords), signature, snapshot.analyzed_at)
+            )
+
+    def put_top_keywords(self, domain: str, region: str, top_keywords: List[Dict]):
+        """Add one region's top-keyword metrics to an existing snapshot"""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT top_keywords FROM competitor_snapshots WHERE domain = ?', (domain.lower(),)
+            ).fetchone()
+            if row is None:
+                return
+            by_region = _unpack(row[0])
+            by_region[region] = top_keywords
+            self._conn.execute(
+                'UPDATE competitor_snapshots SET top_keywords = ? WHERE domain = ?',
+                (_pack(by_region), domain.lower())
+            )
+
+    def analyzed_at(self, domains: Iterable[str]) -> Dict[str, float]:
+        """{domain: analyzed_at} for the domains that have a snapshot"""
+        domains = [domain.lower() for domain in domains]
+        if not domains:
+            return {}
+        placeholders = ','.join('?' * len(domains))
+        with self._lock:
+            return dict(self._conn.execute(
+                f'SELECT domain, analyzed_at FROM competitor_snapshots WHERE domain IN ({placeholders})',
+                domains
+            ).fetchall())
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM competitor_snapshots').fetchone()[0]
+
+    def put_site(self, site: str, weights: Dict[str, float], signature: np.ndarray):
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO site_signatures (site, weights, signature, version)
+                VALUES (?, ?, ?, (SELECT COALESCE(MAX(version), 0) + 1 FROM site_signatures))
+                """,
+                (site, _pack(weights), signature.astype(np.uint64).tobytes())
+            )
+
+    def delete_site(self, site: str):
+        with self._lock:
+            self._conn.execute('DELETE FROM site_signatures WHERE site = ?', (site,))
+
+    def sites_since(self, version: int = 0) -> List[tuple]:
+        """(site, weights, signature, version) written after version, oldest first"""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT site, weights, signature, version FROM site_signatures WHERE version > ? ORDER BY version',
+                (version,)
+            ).fetchall()
+        return [(site, _unpack(weights), np.frombuffer(signature, dtype=np.uint64), row_version)
+                for site, weights, signature, row_version in rows]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def catalog_competitors(catalog: Optional[CompetitorCatalog] = None) -> List[Mapping]:
+    """Every competitor the analysis catalog can suggest, one entry per domain"""
+    catalog = catalog or CompetitorCatalog.current()
+    competitors = {}
+    for entries in list(catalog.analysis.values()) + [catalog.analysis_fallback]:
+        for competitor in entries:
+            competitors.setdefault(competitor['domain'], competitor)
+    return list(competitors.values())
+
+
+class SnapshotScheduler:
+    """
+    Periodically re-analyzes catalog competitors whose snapshots are missing
+    or older than refresh_age, so requests are served from fresh snapshots.
+    """
+
+    def __init__(self, store: CompetitorSnapshotStore, refresh: Callable[[Mapping], Awaitable],
+                 interval: float = SNAPSHOT_CHECK_INTERVAL, refresh_age: float = SNAPSHOT_REFRESH_AGE,
+                 concurrency: int = SNAPSHOT_CONCURRENCY):
+        self.store = store
+        self.refresh = refresh
+        self.interval = interval
+        self.refresh_age = refresh_age
+        self.concurrency = concurrency
+        self._task: Optional[asyncio.Task] = None
+
+    def due(self, competitors: List[Mapping]) -> List[Mapping]:
+        analyzed_at = self.store.analyzed_at(competitor['domain'] for competitor in competitors)
+        cutoff = time.time() - self.refresh_age
+        return [c for c in competitors if analyzed_at.get(c['domain'].lower(), 0) < cutoff]
+
+    async def run_once(self) -> int:
+        """Refresh every due catalog competitor; returns how many succeeded"""
+        due = self.due(catalog_competitors())
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def refresh(competitor: Mapping) -> bool:
+            async with semaphore:
+                try:
+                    await self.refresh(competitor)
+                    return True
+                except Exception as e:
+                    logging.warning(f"Snapshot refresh failed for {competitor['domain']}: {e}")
+                    return False
+
+        results = await asyncio.gather(*(refresh(competitor) for competitor in due))
+        return sum(results)
+
+    async def run_forever(self):
+        while True:
+            refreshed = await self.run_once()
+            if refreshed:
+                logging.info(f"Refreshed {refreshed} competitor snapshots")
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> bool:
+        """Start the periodic job on the running loop (no-op when interval is 0)"""
+        if self.interval <= 0 or self._task is not None:
+            return False
+        self._task = asyncio.ensure_future(self.run_forever())
+        return True
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
@@ -0,0 +1,169 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+from fastapi import Request
+
+from backend.scraper import BrowserPool, KeywordScraperAgent
+from backend.nlp_engine import NLPKeywordEngine
+from backend.keyword_metrics import KeywordMetricsService
+from backend.metrics_store import KeywordMetricsStore
+from backend.metrics_refresher import BackgroundRefresher
+from backend.analysis_cache import AnalysisSessionCache
+from backend.competitor_analysis import CompetitorAnalysisService
+from backend.competitor_snapshots import CompetitorSnapshotStore, SnapshotScheduler
+from backend.keyword_similarity import SiteSimilarityIndex
+from backend.bulk_pipeline import BulkAnalysisPipeline
+from backend.jobs import JobRunner, JobStore
+from backend.job_handlers import build_job_handlers
+from api.competitor_catalog import CompetitorCatalog
+from api.industry_classifier import IndustryClassifier, TAXONOMIES_PATH
+
+# Pages open at once in the shared browser
+BROWSER_MAX_CONTEXTS = 8
+# Set to 0 to skip launching the shared browser at startup (each scrape then
+# launches its own, as without the container)
+BROWSER_POOL_ENABLED = os.getenv('BROWSER_POOL', '1') != '0'
+
+WARMUP_CONTENT = {
+    'title': 'Keyword research platform',
+    'meta_description': 'Find long-tail keywords and analyze competitors',
+    'headings': {'h1': ['Keyword research'], 'h2': ['Competitor analysis']},
+    'paragraphs': ['Discover the search terms your customers use every day.']
+}
+
+
+class AppContainer:
+    """
+    The application's long-lived services, built and warmed up once per
+    process by the FastAPI lifespan and handed to endpoints via Depends.
+    Startup and warm-up durations are recorded in timings (milliseconds).
+    """
+
+    def __init__(self, browser_pool_enabled: bool = BROWSER_POOL_ENABLED):
+        self.browser_pool: Optional[BrowserPool] = BrowserPool(BROWSER_MAX_CONTEXTS) if browser_pool_enabled else None
+        self.nlp_engine: Optional[NLPKeywordEngine] = None
+        self.metrics_refresher: Optional[BackgroundRefresher] = None
+        self.metrics_service: Optional[KeywordMetricsService] = None
+        self.analysis_cache: Optional[AnalysisSessionCache] = None
+        self.snapshots: Optional[CompetitorSnapshotStore] = None
+        self.competitor_service: Optional[CompetitorAnalysisService] = None
+        self.snapshot_scheduler: Optional[SnapshotScheduler] = None
+        self.bulk_pipeline: Optional[BulkAnalysisPipeline] = None
+        self.job_runner: Optional[JobRunner] = None
+        self._longtail_generator = None
+        self.timings: Dict[str, float] = {}
+
+    @contextmanager
+    def _timed(self, step: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[step] = round((time.perf_counter() - start) * 1000, 2)
+
+    async def start(self):
+        started = time.perf_counter()
+
+        with self._timed('build_services'):
+            self.nlp_engine = NLPKeywordEngine()
+            # Owned (not the process default) so shutdown can stop its workers
+            self.metrics_refresher = BackgroundRefresher()
+            self.metrics_service = KeywordMetricsService(refresher=self.metrics_refresher)
+            self.analysis_cache = AnalysisSessionCache.default()
+            self.snapshots = CompetitorSnapshotStore.default()
+            self.competitor_service = CompetitorAnalysisService(
+                analysis_cache=self.analysis_cache,
+                snapshots=self.snapshots,
+                nlp_engine=self.nlp_engine,
+                metrics_service=self.metrics_service,
+                browser_pool=self.browser_pool
+            )
+            self.bulk_pipeline = BulkAnalysisPipeline(
+                self.new_scraper, self.nlp_engine, self.metrics_service, self.analysis_cache,
+                # One scrape per shared-browser context
+                scrape_concurrency=BROWSER_MAX_CONTEXTS
+            )
+
+        with self._timed('warm_tokenizer'):
+            # First tokenization loads the punkt model
+            await asyncio.to_thread(self.nlp_engine.extract_keywords, WARMUP_CONTENT)
+
+        with self._timed('warm_classifiers'):
+            CompetitorCatalog.current()
+            with open(TAXONOMIES_PATH, encoding='utf-8') as f:
+                for name in json.load(f)['taxonomies']:
+                    IndustryClassifier.from_taxonomy(name)
+
+        with self._timed('warm_caches'):
+            KeywordMetricsStore.default().count()
+            SiteSimilarityIndex.default()
+
+        if self.browser_pool is not None:
+            with self._timed('warm_browser'):
+                try:
+                    await self.browser_pool.start()
+                except Exception as e:
+                    logging.warning(f"Shared browser unavailable, scrapes will launch their own: {e}")
+
+        self.snapshot_scheduler = SnapshotScheduler(self.snapshots, self.competitor_service.refresh_snapshot)
+        self.snapshot_scheduler.start()
+
+        # Jobs left queued (or orphaned mid-run) by a previous process resume here
+        self.job_runner = JobRunner(JobStore.default(), build_job_handlers(self))
+        self.job_runner.start()
+
+        self.timings['startup_total'] = round((time.perf_counter() - started) * 1000, 2)
+        logging.info(f"Service container ready: {self.timings}")
+
+    async def shutdown(self):
+        if self.job_runner is not None:
+            await self.job_runner.stop()
+        if self.snapshot_scheduler is not None:
+            await self.snapshot_scheduler.stop()
+        if self.browser_pool is not None:
+            await self.browser_pool.close()
+        if self.metrics_refresher is not None:
+            self.metrics_refresher.shutdown(wait=True)
+
+    def new_scraper(self) -> KeywordScraperAgent:
+        return KeywordScraperAgent(self.browser_pool)
+
+    def longtail_generator(self):
+        """Long-tail generator for jobs, built on first use"""
+        if self._longtail_generator is None:
+            from api.longtail_generator import ProgrammaticLongTailGenerator
+            self._longtail_generator = ProgrammaticLongTailGenerator()
+        return self._longtail_generator
+
+
+def get_container(request: Request) -> AppContainer:
+    return request.app.state.container
+
+
+def get_nlp_engine(request: Request) -> NLPKeywordEngine:
+    return request.app.state.container.nlp_engine
+
+
+def get_metrics_service(request: Request) -> KeywordMetricsService:
+    return request.app.state.container.metrics_service
+
+
+def get_competitor_service(request: Request) -> CompetitorAnalysisService:
+    return request.app.state.container.competitor_service
+
+
+def get_bulk_pipeline(request: Request) -> BulkAnalysisPipeline:
+    return request.app.state.container.bulk_pipeline
+
+
+def get_job_runner(request: Request) -> JobRunner:
+    return request.app.state.container.job_runner
+
+
+def get_scraper(request: Request) -> KeywordScraperAgent:
+    return request.app.state.container.new_scraper()
@@ -0,0 +1,168 @@
+import asyncio
+import logging
+from typing import Dict, List
+
+from fastapi.encoders import jsonable_encoder
+
+from backend.analysis_cache import normalize_url
+from backend.jobs import JobContext, JobHandler
+from backend.keyword_analysis import analyze_keywords
+from backend.keyword_metrics import resolve_regions
+
+CRAWL_MAX_PAGES = 50
+CRAWL_CONCURRENCY = 4
+LONGTAIL_MAX_COUNT = 1000
+
+
+def normalize_job_params(kind: str, params: Dict) -> Dict:
+    """
+    Validate a job submission and put its params in canonical form, so
+    equivalent submissions deduplicate. Raises ValueError on bad input.
+    """
+    if kind in ('analyze', 'competitors', 'crawl'):
+        url = params.get('url')
+        if not url or not isinstance(url, str):
+            raise ValueError("url is required")
+        region = params.get('region')
+        if region is None:
+            region = 'auto'
+        if isinstance(region, list) and all(isinstance(r, str) for r in region):
+            region = [r.lower() for r in region]
+        elif isinstance(region, str):
+            region = region.lower()
+        else:
+            raise ValueError("region must be a string or a list of strings")
+        normalized = {'url': normalize_url(url), 'region': region}
+        multi_region = resolve_regions(region) is not None
+
+        if multi_region and kind != 'analyze':
+            raise ValueError(f"{kind} jobs take a single region")
+
+        if kind == 'crawl':
+            pages = params.get('pages') or [url]
+            if not isinstance(pages, list) or not all(isinstance(page, str) for page in pages):
+                raise ValueError("pages must be a list of URLs")
+            pages = list(dict.fromkeys(normalize_url(page) for page in pages))
+            if len(pages) > CRAWL_MAX_PAGES:
+                raise ValueError(f"at most {CRAWL_MAX_PAGES} pages per crawl")
+            normalized['pages'] = pages
+        return normalized
+
+    if kind == 'longtail':
+        domain = (params.get('domain') or '').strip().lower()
+        if not domain:
+            raise ValueError("domain is required")
+        try:
+            count = max(1, min(int(params.get('count', 50)), LONGTAIL_MAX_COUNT))
+        except (TypeError, ValueError):
+            raise ValueError("count must be an integer")
+        normalized = {
+            'domain': domain,
+            'industry': (params.get('industry') or 'saas').strip().lower(),
+            'count': count
+        }
+        if params.get('account'):
+            normalized['account'] = str(params['account'])
+        return normalized
+
+    raise ValueError(f"Unknown job kind: {kind}")
+
+
+def build_job_handlers(container) -> Dict[str, JobHandler]:
+    """Job kind -> handler, running on the container's shared services"""
+
+    async def analyze(params: Dict, job: JobContext):
+        job.report(progress={'stage': 'analyzing'})
+        result = await analyze_keywords(
+            params['url'], params['region'], container.new_scraper(),
+            container.nlp_engine, container.metrics_service, container.analysis_cache
+        )
+        return jsonable_encoder(result)
+
+    async def competitors(params: Dict, job: JobContext):
+        partial = {'target': None, 'competitors': []}
+        total = {'competitors': 0}
+
+        def on_event(event: str, data: Dict):
+            if event == 'target':
+                partial['target'] = data
+                total['competitors'] = len(data['competitors_pending'])
+            elif event == 'competitor':
+                partial['competitors'].append(data)
+            job.report(
+                progress={'stage': event, 'done': len(partial['competitors']), 'total': total['competitors']},
+                partial=jsonable_encoder(partial)
+            )
+
+        job.report(progress={'stage': 'analyzing target'})
+        result = await container.competitor_service.analyze_competitors(params['url'], params['region'], on_event)
+        return jsonable_encoder(result)
+
+    async def crawl(params: Dict, job: JobContext):
+        """Analyze each listed page of a site and merge their keywords"""
+        pages = params['pages']
+        semaphore = asyncio.Semaphore(CRAWL_CONCURRENCY)
+        summaries: List[Dict] = []
+        failed: List[Dict] = []
+        merged: Dict[str, Dict] = {}
+
+        async def analyze_page(page: str):
+            async with semaphore:
+                try:
+                    return page, await analyze_keywords(
+                        page, params['region'], container.new_scraper(),
+                        container.nlp_engine, container.metrics_service, container.analysis_cache
+                    ), None
+                except Exception as e:
+                    logging.warning(f"Crawl of {page} failed: {e}")
+                    return page, None, str(e)
+
+        for next_done in asyncio.as_completed([analyze_page(page) for page in pages]):
+            page, analysis, error = await next_done
+            if analysis is None:
+                failed.append({'url': page, 'error': error})
+            else:
+                summaries.append({
+                    'url': page,
+                    'keywords_found': analysis['keywords_found'],
+                    'total_volume': analysis['total_volume']
+                })
+                for keyword in jsonable_encoder(analysis['keywords']):
+                    entry = merged.setdefault(keyword['keyword'], dict(keyword, pages=0, count=0))
+                    entry['pages'] += 1
+                    entry['count'] += keyword.get('count') or 0
+            job.report(
+                progress={'stage': 'crawling', 'done': len(summaries) + len(failed), 'total': len(pages)},
+                partial={'pages': summaries, 'failed': failed}
+            )
+
+        keywords = sorted(merged.values(), key=lambda k: (k['pages'], k['volume'] or 0), reverse=True)
+        return {
+            'url': params['url'],
+            'region': params['region'],
+            'pages_analyzed': len(summaries),
+            'pages': summaries,
+            'failed': failed,
+            'keywords_found': len(keywords),
+            'keywords': keywords
+        }
+
+    async def longtail(params: Dict, job: JobContext):
+        job.report(progress={'stage': 'generating'})
+        keywords = await asyncio.to_thread(
+            container.longtail_generator().generate_longtail_keywords,
+            params['domain'], params['industry'], params['count'], account=params.get('account')
+        )
+        return {
+            'domain': params['domain'],
+            'industry': params['industry'],
+            'keywords_found': len(keywords),
+            'keywords': keywords
+        }
+
+    return {
+        'analyze': analyze,
+        'competitors': competitors,
+        'crawl': crawl,
+        'longtail': longtail
+    }
@@ -0,0 +1,333 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+DEFAULT_DB_PATH = os.getenv(
+    'JOBS_DB',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'jobs.db')
+)
+
+JOB_WORKERS = 2
+JOB_POLL_INTERVAL = 1.0        # seconds between queue checks when idle
+JOB_HEARTBEAT_INTERVAL = 15.0
+JOB_STALE_AFTER = 120.0        # a running job without a heartbeat this long is requeued
+JOB_RESULT_TTL = 600.0         # identical submissions reuse a finished job this long
+JOB_RETENTION = 7 * 24 * 3600  # finished jobs are purged after this
+JOB_MAX_ATTEMPTS = 3           # runs (claims) before a job that keeps dying is failed
+JOB_SUBMIT_RETRIES = 5
+
+
+def dedupe_key(kind: str, params: Dict) -> str:
+    """Identity of a submission: kind plus canonical params"""
+    canonical = json.dumps([kind, params], sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class JobStore:
+    """
+    Persistent job queue in SQLite. Queued and running jobs survive restarts:
+    a running job whose worker stopped heartbeating is put back in the queue,
+    until it has been run JOB_MAX_ATTEMPTS times. At most one active job
+    exists per dedupe key.
+    """
+
+    _default_instance = None
+    _default_lock = threading.Lock()
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH):
+        self.db_path = db_path
+        if db_path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        if db_path != ':memory:':
+            self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        # Other processes sharing the queue may hold the write lock briefly
+        self._conn.execute('PRAGMA busy_timeout=5000')
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                params TEXT NOT NULL,
+                dedupe_key TEXT NOT NULL,
+                status TEXT NOT NULL,
+                progress TEXT,
+                partial TEXT,
+                result TEXT,
+                error TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                created_at REAL NOT NULL,
+                started_at REAL,
+                heartbeat_at REAL,
+                finished_at REAL
+            );
+
+            CREATE INDEX IF NOT EXISTS idx_jobs_queue ON jobs (status, created_at);
+            CREATE INDEX IF NOT EXISTS idx_jobs_dedupe ON jobs (dedupe_key, finished_at);
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_jobs_active_dedupe
+                ON jobs (dedupe_key) WHERE status IN ('queued', 'running');
+        """)
+        columns = {row['name'] for row in self._conn.execute('PRAGMA table_info(jobs)')}
+        if 'attempts' not in columns:
+            # Queue created before attempts were counted
+            self._conn.execute('ALTER TABLE jobs ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0')
+
+    @classmethod
+    def default(cls) -> 'JobStore':
+        """Process-wide store at DEFAULT_DB_PATH"""
+        with cls._default_lock:
+            if cls._default_instance is None:
+                cls._default_instance = cls()
+            return cls._default_instance
+
+    def submit(self, kind: str, params: Dict, result_ttl: float = JOB_RESULT_TTL) -> Dict:
+        """
+        Queue a job, or return the matching queued/running job (or one that
+        succeeded within result_ttl) with deduplicated=True.
+        """
+        key = dedupe_key(kind, params)
+        now = time.time()
+        with self._lock:
+            for _ in range(JOB_SUBMIT_RETRIES):
+                existing = self._find_duplicate(key, now - result_ttl)
+                if existing is not None:
+                    return dict(existing, deduplicated=True)
+
+                job_id = uuid.uuid4().hex
+                try:
+                    self._conn.execute(
+                        """
+                        INSERT INTO jobs (id, kind, params, dedupe_key, status, created_at)
+                        VALUES (?, ?, ?, ?, 'queued', ?)
+                        """,
+                        (job_id, kind, json.dumps(params), key, now)
+                    )
+                except sqlite3.IntegrityError:
+                    # Another process queued the same job between our check and insert.
+                    # Look again: return that job, or insert if it has already ended.
+                    continue
+                return dict(self.get(job_id), deduplicated=False)
+        raise RuntimeError(f"Could not queue {kind} job: the active job kept changing")
+
+    def _find_duplicate(self, key: str, finished_after: float) -> Optional[Dict]:
+        row = self._conn.execute(
+            """
+            SELECT * FROM jobs
+            WHERE dedupe_key = ?
+              AND (status IN ('queued', 'running') OR (status = 'succeeded' AND finished_at >= ?))
+            ORDER BY created_at DESC LIMIT 1
+            """,
+            (key, finished_after)
+        ).fetchone()
+        return self._decode(row) if row else None
+
+    def claim(self) -> Optional[Dict]:
+        """Atomically move the oldest queued job to running"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                """
+                UPDATE jobs SET status = 'running', started_at = ?, heartbeat_at = ?, attempts = attempts + 1
+                WHERE id = (
+                    SELECT id FROM jobs WHERE status = 'queued' ORDER BY created_at LIMIT 1
+                ) AND status = 'queued'
+                RETURNING *
+                """,
+                (now, now)
+            ).fetchone()
+        return self._decode(row) if row else None
+
+    def heartbeat(self, job_id: str):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET heartbeat_at = ? WHERE id = ? AND status = 'running'", (time.time(), job_id)
+            )
+
+    def report(self, job_id: str, progress: Optional[Dict] = None, partial: Any = None):
+        """Record progress and/or partial results of a running job"""
+        with self._lock:
+            self._conn.execute(
+                """
+                UPDATE jobs SET
+                    progress = COALESCE(?, progress),
+                    partial = COALESCE(?, partial),
+                    heartbeat_at = ?
+                WHERE id = ? AND status = 'running'
+                """,
+                (json.dumps(progress) if progress is not None else None,
+                 json.dumps(partial) if partial is not None else None,
+                 time.time(), job_id)
+            )
+
+    def finish(self, job_id: str, result: Any = None, error: Optional[str] = None):
+        with self._lock:
+            self._conn.execute(
+                """
+                UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ?
+                WHERE id = ? AND status = 'running'
+                """,
+                ('failed' if error is not None else 'succeeded',
+                 json.dumps(result) if result is not None else None, error, time.time(), job_id)
+            )
+
+    def requeue(self, job_id: str, max_attempts: int = JOB_MAX_ATTEMPTS):
+        """Put a running job back in the queue (e.g. interrupted by shutdown)"""
+        self._requeue('id = ?', (job_id,), max_attempts)
+
+    def requeue_stale(self, stale_after: float = JOB_STALE_AFTER, max_attempts: int = JOB_MAX_ATTEMPTS) -> int:
+        """Requeue running jobs whose worker went silent (e.g. a crashed process); returns how many"""
+        return self._requeue('heartbeat_at < ?', (time.time() - stale_after,), max_attempts)
+
+    def _requeue(self, condition: str, params: tuple, max_attempts: int) -> int:
+        """
+        Requeue the running jobs matching condition, dropping their progress
+        and partial results. Jobs that have already used max_attempts runs
+        are failed instead, so a job that keeps killing its worker ends.
+        """
+        with self._lock:
+            self._conn.execute(
+                f"""
+                UPDATE jobs SET status = 'failed', finished_at = ?,
+                    error = 'Abandoned after ' || attempts || ' interrupted runs'
+                WHERE status = 'running' AND attempts >= ? AND {condition}
+                """,
+                (time.time(), max_attempts, *params)
+            )
+            return self._conn.execute(
+                f"""
+                UPDATE jobs SET status = 'queued', progress = NULL, partial = NULL
+                WHERE status = 'running' AND {condition}
+                """,
+                params
+            ).rowcount
+
+    def purge(self, older_than: float = JOB_RETENTION) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "DELETE FROM jobs WHERE status NOT IN ('queued', 'running') AND finished_at < ?",
+                (time.time() - older_than,)
+            ).rowcount
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        return self._decode(row) if row else None
+
+    def count(self, status: Optional[str] = None) -> int:
+        with self._lock:
+            if status is None:
+                return self._conn.execute('SELECT COUNT(*) FROM jobs').fetchone()[0]
+            return self._conn.execute('SELECT COUNT(*) FROM jobs WHERE status = ?', (status,)).fetchone()[0]
+
+    def _decode(self, row: sqlite3.Row) -> Dict:
+        job = dict(row)
+        del job['dedupe_key']
+        for field in ('params', 'progress', 'partial', 'result'):
+            if job[field] is not None:
+                job[field] = json.loads(job[field])
+        return job
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class JobContext:
+    """Handed to a job handler to publish progress and partial results"""
+
+    def __init__(self, store: JobStore, job: Dict):
+        self.store = store
+        self.job = job
+        self.id = job['id']
+
+    def report(self, progress: Optional[Dict] = None, partial: Any = None):
+        self.store.report(self.id, progress, partial)
+
+
+JobHandler = Callable[[Dict, JobContext], Awaitable[Any]]
+
+
+class JobRunner:
+    """
+    Runs queued jobs on a fixed number of asyncio workers. Handlers are
+    looked up by job kind; a handler's return value becomes the job result
+    and an exception marks the job failed.
+    """
+
+    def __init__(self, store: JobStore, handlers: Dict[str, JobHandler], workers: int = JOB_WORKERS,
+                 poll_interval: float = JOB_POLL_INTERVAL):
+        self.store = store
+        self.handlers = handlers
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self._wakeup: Optional[asyncio.Event] = None
+        self._tasks = []
+
+    def submit(self, kind: str, params: Dict) -> Dict:
+        if kind not in self.handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+        job = self.store.submit(kind, params)
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return job
+
+    def start(self):
+        if self._tasks:
+            return
+        self.store.requeue_stale()
+        self.store.purge()
+        self._wakeup = asyncio.Event()
+        self._tasks = [asyncio.ensure_future(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+
+    async def _worker(self):
+        while True:
+            job = self.store.claim()
+            if job is None:
+                self.store.requeue_stale()
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self._run(job)
+
+    async def _run(self, job: Dict):
+        heartbeat = asyncio.ensure_future(self._heartbeat(job['id']))
+        try:
+            result = await self.handlers[job['kind']](job['params'], JobContext(self.store, job))
+            self.store.finish(job['id'], result=result)
+        except asyncio.CancelledError:
+            # Shutting down: the job starts over on the next run
+            self.store.requeue(job['id'])
+            raise
+        except Exception as e:
+            logging.error(f"Job {job['id']} ({job['kind']}) failed: {e}")
+            self.store.finish(job['id'], error=str(e))
+        finally:
+            heartbeat.cancel()
+
+    async def _heartbeat(self, job_id: str):
+        while True:
+            await asyncio.sleep(JOB_HEARTBEAT_INTERVAL)
+            self.store.heartbeat(job_id)
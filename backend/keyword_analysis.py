@@ -0,0 +1,94 @@
+import asyncio
+from typing import List, Optional, Union
+from backend.scraper import KeywordScraperAgent
+from backend.nlp_engine import NLPKeywordEngine
+from backend.keyword_metrics import KeywordMetricsService, resolve_regions
+from backend.analysis_cache import AnalysisSession, AnalysisSessionCache
+
+async def analyze_keywords(url: str, region: Union[str, List[str]], scraper: KeywordScraperAgent,
+                           nlp_engine: NLPKeywordEngine, metrics_service: KeywordMetricsService,
+                           analysis_cache: Optional[AnalysisSessionCache] = None) -> dict:
+    """Keywords of one page with metrics: the /analyze response"""
+    # Reuses a recent scrape of the same URL (e.g. from /analyze-competitors)
+    session = await (analysis_cache or AnalysisSessionCache.default()).get_or_analyze(url, scraper, nlp_engine)
+    # Metrics lookups hit SQLite (and the session's metrics lock): keep them off the event loop
+    return await asyncio.to_thread(build_keyword_response, url, region, session, metrics_service)
+
+def build_keyword_response(url: str, region: Union[str, List[str]], session: AnalysisSession,
+                           metrics_service: KeywordMetricsService) -> dict:
+    """The /analyze response for an already scraped and parsed site"""
+    keywords = session.keywords
+    
+    regions = resolve_regions(region)
+    if regions is not None:
+        return _build_multi_region_response(url, region, regions, keywords, metrics_service)
+    
+    keyword_metrics = session.metrics_for(region, metrics_service.get_keyword_metrics)
+    
+    # Plain dicts: a model per row costs more to build and validate than the
+    # rest of the response put together
+    results = []
+    for keyword in keywords:
+        metrics = keyword_metrics[keyword['keyword']]
+        results.append({
+            "keyword": keyword['keyword'],
+            "volume": metrics['volume'],
+            "cpc": metrics['cpc'],
+            "competition": metrics['competition'],
+            "competition_score": metrics['competition_score'],
+            "trend": metrics['trend'],
+            "type": keyword['type'],
+            "intent": keyword['intent'],
+            "count": keyword.get('count', 0)
+        })
+    
+    # Sort by volume (highest first)
+    results.sort(key=lambda x: x['volume'] or 0, reverse=True)
+    
+    return {
+        "url": url,
+        "region": region,
+        "keywords_found": len(results),
+        "keywords": results,
+        "total_volume": sum(r['volume'] or 0 for r in results),
+        "avg_cpc": round(sum(r['cpc'] or 0 for r in results) / len(results), 2) if results else 0
+    }
+
+def _build_multi_region_response(url: str, region: Union[str, List[str]], regions: List[str], keywords: List[dict],
+                                 metrics_service: KeywordMetricsService) -> dict:
+    """Scrape and extraction ran once; metrics come from one keyword x region matrix"""
+    metrics = metrics_service.get_batch_metrics([k['keyword'] for k in keywords], regions)
+    
+    results = []
+    for keyword in keywords:
+        per_region = metrics[keyword['keyword']]
+        first = per_region[regions[0]]
+        results.append({
+            "keyword": keyword['keyword'],
+            "competition": first['competition'],
+            "competition_score": first['competition_score'],
+            "trend": first['trend'],
+            "type": keyword['type'],
+            "intent": keyword['intent'],
+            "count": keyword.get('count', 0),
+            "volume_by_region": {region: per_region[region]['volume'] for region in regions},
+            "cpc_by_region": {region: per_region[region]['cpc'] for region in regions}
+        })
+    
+    # Region multipliers are uniform, so volume ordering is the same in every region
+    results.sort(key=lambda x: x['volume_by_region'][regions[0]] or 0, reverse=True)
+    
+    return {
+        "url": url,
+        "region": region,
+        "regions": regions,
+        "keywords_found": len(results),
+        "keywords": results,
+        "total_volume_by_region": {
+            region: sum(r['volume_by_region'][region] or 0 for r in results) for region in regions
+        },
+        "avg_cpc_by_region": {
+            region: round(sum(r['cpc_by_region'][region] or 0 for r in results) / len(results), 2) if results else 0
+            for region in regions
+        }
+    }
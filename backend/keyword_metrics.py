@@ -1,16 +1,76 @@
 import random
 import hashlib
-from typing import Dict, Optional
+import time
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple, Union
+import numpy as np
+from backend.metrics_store import KeywordMetricsStore
+from backend.metrics_refresher import BackgroundRefresher
+
+# Regional volume/CPC adjustments relative to the US market
+REGION_MULTIPLIERS = {
+    "us": 1.0,
+    "uk": 0.8,
+    "ca": 0.6,
+    "au": 0.5,
+    "ae": 0.3,
+    "in": 0.7,
+    "global": 1.2
+}
+
+# Stale-while-revalidate windows (seconds)
+METRICS_TTL = 24 * 3600          # served as fresh
+METRICS_MAX_AGE = 7 * 24 * 3600  # served stale while a background refresh runs
 
 class KeywordMetricsService:
-    def __init__(self):
-        self.mock_data = True  # Set to False when real APIs are integrated
+    def __init__(self, store: Optional[KeywordMetricsStore] = None,
+                 refresher: Optional[BackgroundRefresher] = None,
+                 ttl: float = METRICS_TTL, max_age: float = METRICS_MAX_AGE,
+                 mock_data: bool = True):
+        if not mock_data:
+            # Set to False when real APIs are integrated
+            raise ValueError("No real keyword metrics provider is integrated yet; mock_data must be True")
+        self.mock_data = mock_data
+        self.store = store if store is not None else KeywordMetricsStore.default()
+        self.refresher = refresher if refresher is not None else BackgroundRefresher.default()
+        self.ttl = ttl
+        self.max_age = max_age
         
     def get_keyword_metrics(self, keyword: str, region: str = "us") -> Dict:
         """
         Get keyword metrics including volume, CPC, and competition.
+        Stored metrics are served stale-while-revalidate: an expired entry is
+        returned immediately and refreshed in the background, and only entries
+        older than max_age wait for the provider.
         Currently uses mock data for demonstration.
         """
+        cached = self._get_cached(keyword, region)
+        if cached is not None:
+            return cached
+        
+        metrics = self._fetch_metrics(keyword, region)
+        self.store.upsert(keyword, region, metrics)
+        return metrics
+    
+    def _get_cached(self, keyword: str, region: str) -> Optional[Dict]:
+        row = self.store.get_latest(keyword, region)
+        if not row:
+            return None
+        
+        age = time.time() - row['updated_at']
+        if age > self.max_age:
+            return None
+        if age > self.ttl:
+            self.refresher.schedule((keyword.lower(), region), self.refresh_metrics, keyword, region)
+        return self._format_stored_metrics(keyword, row)
+    
+    def refresh_metrics(self, keyword: str, region: str) -> Dict:
+        """Fetch metrics from the provider and overwrite the stored entry"""
+        metrics = self._fetch_metrics(keyword, region)
+        self.store.upsert(keyword, region, metrics)
+        return metrics
+    
+    def _fetch_metrics(self, keyword: str, region: str) -> Dict:
         if self.mock_data:
             return self._generate_mock_metrics(keyword, region)
         else:
@@ -19,10 +79,78 @@ class KeywordMetricsService:
             # - SEMrush API
             # - Ahrefs API
             # - Ubersuggest API
-            return self._get_real_metrics(keyword, region)
+            metrics = self._get_real_metrics(keyword, region)
+            metrics['trend'] = self._get_trend_from_history(keyword, region) or metrics.get('trend')
+            return metrics
+    
+    def _format_stored_metrics(self, keyword: str, row: Dict) -> Dict:
+        return {
+            "volume": row['volume'],
+            "cpc": row['cpc'],
+            "competition": row['competition'],
+            "competition_score": row['competition_score'],
+            "trend": row['trend'],
+            "related_keywords": self._get_related_keywords(keyword)
+        }
+    
+    def _get_trend_from_history(self, keyword: str, region: str, days: int = 90) -> Optional[str]:
+        """
+        Derive the trend from stored volume history.
+        Only meaningful for real metrics: mock volumes are constant per keyword.
+        """
+        start = (date.today() - timedelta(days=days)).isoformat()
+        history = [row['volume'] for row in self.store.get_history(keyword, region, start=start)
+                   if row['volume'] is not None]
+        if len(history) < 3 or not history[0]:
+            return None
+        
+        change = (history[-1] - history[0]) / history[0]
+        if change > 0.1:
+            return "Rising"
+        elif change < -0.1:
+            return "Declining"
+        return "Stable"
+    
+    def search_metrics(self, region: str = "us", prefix: Optional[str] = None,
+                       min_volume: Optional[int] = None, max_volume: Optional[int] = None,
+                       min_cpc: Optional[float] = None, max_cpc: Optional[float] = None,
+                       limit: int = 100) -> List[Dict]:
+        """Filter stored metrics without recomputing them"""
+        if prefix:
+            rows = self.store.query_prefix(prefix, region, limit=limit)
+        elif min_volume is not None or max_volume is not None:
+            rows = self.store.query_volume_range(region, min_volume or 0, max_volume, limit=limit)
+        else:
+            rows = self.store.query_cpc_range(region, min_cpc or 0.0, max_cpc, limit=limit)
+        
+        # Remaining bounds are applied to the (already narrowed) index results
+        return [
+            row for row in rows
+            if (min_volume is None or (row['volume'] or 0) >= min_volume)
+            and (max_volume is None or (row['volume'] or 0) <= max_volume)
+            and (min_cpc is None or (row['cpc'] or 0) >= min_cpc)
+            and (max_cpc is None or (row['cpc'] or 0) <= max_cpc)
+        ]
     
     def _generate_mock_metrics(self, keyword: str, region: str) -> Dict:
         """Generate realistic mock data based on keyword characteristics"""
+        base_volume, base_cpc, competition_level, competition_score = self._generate_base_metrics(keyword)
+        
+        multiplier = REGION_MULTIPLIERS.get(region, 1.0)
+        final_volume = int(base_volume * multiplier)
+        final_cpc = round(base_cpc * multiplier, 2)
+        
+        return {
+            "volume": final_volume,
+            "cpc": final_cpc,
+            "competition": competition_level,
+            "competition_score": round(competition_score, 2),
+            "trend": self._get_trend_data(keyword),
+            "related_keywords": self._get_related_keywords(keyword)
+        }
+    
+    def _generate_base_metrics(self, keyword: str) -> Tuple[int, float, str, float]:
+        """Region-independent mock metrics: (volume, cpc, competition, competition_score)"""
         
         # Create consistent random values based on keyword hash
         seed = int(hashlib.md5(keyword.encode()).hexdigest()[:8], 16)
@@ -64,28 +192,29 @@ class KeywordMetricsService:
             competition_score = random.uniform(0.1, 0.4)
             competition_level = "Low"
         
-        # Regional adjustments
-        region_multipliers = {
-            "us": 1.0,
-            "uk": 0.8,
-            "ca": 0.6,
-            "au": 0.5,
-            "ae": 0.3,
-            "in": 0.7,
-            "global": 1.2
-        }
+        return base_volume, base_cpc, competition_level, competition_score
+    
+    def get_region_matrix(self, keywords: List[str], regions: List[str]) -> Dict:
+        """
+        Compute metrics for every keyword in every region in one pass.
+        Base metrics are generated once per keyword and scaled by the region
+        multipliers as a keyword x region matrix.
+        """
+        multipliers = np.array([REGION_MULTIPLIERS.get(region, 1.0) for region in regions])
+        bases = [self._generate_base_metrics(keyword) for keyword in keywords]
         
-        multiplier = region_multipliers.get(region, 1.0)
-        final_volume = int(base_volume * multiplier)
-        final_cpc = round(base_cpc * multiplier, 2)
+        base_volume = np.array([base[0] for base in bases], dtype=np.int64).reshape(-1, 1)
+        base_cpc = np.array([base[1] for base in bases], dtype=np.float64).reshape(-1, 1)
         
         return {
-            "volume": final_volume,
-            "cpc": final_cpc,
-            "competition": competition_level,
-            "competition_score": round(competition_score, 2),
-            "trend": self._get_trend_data(keyword),
-            "related_keywords": self._get_related_keywords(keyword)
+            "keywords": list(keywords),
+            "regions": list(regions),
+            # int() truncation, matching the single-region path
+            "volume": (base_volume * multipliers).astype(np.int64),
+            "cpc": np.round(base_cpc * multipliers, 2),
+            "competition": [base[2] for base in bases],
+            "competition_score": [round(base[3], 2) for base in bases],
+            "trend": [self._get_trend_data(keyword) for keyword in keywords]
         }
     
     def _get_trend_data(self, keyword: str) -> str:
@@ -116,9 +245,81 @@ class KeywordMetricsService:
         # This would call actual APIs like Google Keyword Planner
         pass
     
-    def get_batch_metrics(self, keywords: list, region: str = "us") -> Dict:
-        """Get metrics for multiple keywords at once"""
+    def get_batch_metrics(self, keywords: list, region: Union[str, List[str]] = "us") -> Dict:
+        """
+        Get metrics for multiple keywords at once.
+        With region="all" or a list of regions, returns {keyword: {region: metrics}}.
+        """
+        regions = resolve_regions(region)
+        if regions is not None:
+            return self._get_multi_region_metrics(keywords, regions)
+        
         results = {}
+        missing = []
         for keyword in keywords:
-            results[keyword] = self.get_keyword_metrics(keyword, region)
-        return results
\ No newline at end of file
+            cached = self._get_cached(keyword, region)
+            if cached is not None:
+                results[keyword] = cached
+            else:
+                results[keyword] = self._fetch_metrics(keyword, region)
+                missing.append(keyword)
+        
+        # Persist everything that was computed in a single transaction
+        self.store.upsert_many(
+            dict(results[keyword], keyword=keyword, region=region) for keyword in missing
+        )
+        return results
+    
+    def _get_multi_region_metrics(self, keywords: list, regions: List[str]) -> Dict:
+        keywords = list(dict.fromkeys(keywords))
+        if not self.mock_data:
+            return {
+                keyword: {region: self.get_keyword_metrics(keyword, region) for region in regions}
+                for keyword in keywords
+            }
+        
+        matrix = self.get_region_matrix(keywords, regions)
+        volume = matrix['volume'].tolist()
+        cpc = matrix['cpc'].tolist()
+        
+        results = {}
+        rows = []
+        for i, keyword in enumerate(keywords):
+            related = self._get_related_keywords(keyword)
+            per_region = {}
+            for j, region in enumerate(regions):
+                metrics = {
+                    "volume": volume[i][j],
+                    "cpc": cpc[i][j],
+                    "competition": matrix['competition'][i],
+                    "competition_score": matrix['competition_score'][i],
+                    "trend": matrix['trend'][i],
+                    "related_keywords": related
+                }
+                per_region[region] = metrics
+                rows.append(dict(metrics, keyword=keyword, region=region))
+            results[keyword] = per_region
+        
+        # The whole keyword x region matrix is written in one transaction
+        self.store.upsert_many(rows)
+        return results
+
+
+def resolve_regions(region: Union[str, List[str], None]) -> Optional[List[str]]:
+    """
+    Return the region list for multi-region requests, or None for a single region.
+    Raises ValueError for an empty list or one naming an unknown region.
+    """
+    if isinstance(region, (list, tuple)):
+        regions = list(dict.fromkeys(r.lower() for r in region))
+        if not regions:
+            raise ValueError("region list is empty")
+        unknown = [r for r in regions if r not in REGION_MULTIPLIERS]
+        if unknown:
+            raise ValueError(
+                f"Unknown regions: {', '.join(unknown)} (known: {', '.join(REGION_MULTIPLIERS)})"
+            )
+        return regions
+    if isinstance(region, str) and region.lower() == "all":
+        return list(REGION_MULTIPLIERS)
+    return None
@@ -0,0 +1,189 @@
+import hashlib
+import threading
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+_MASK61 = np.uint64((1 << 61) - 1)
+
+
+def keyword_weights(keywords: Iterable[Dict], weight_key: str = 'count') -> Dict[str, float]:
+    """Normalized keyword -> weight from extracted keyword records (repeats add up)"""
+    weights: Dict[str, float] = defaultdict(float)
+    for keyword in keywords:
+        term = keyword['keyword'].strip().lower()
+        if term:
+            weights[term] += float(keyword.get(weight_key) or 1)
+    return dict(weights)
+
+
+def weighted_jaccard(a: Dict[str, float], b: Dict[str, float]) -> float:
+    """sum(min) / sum(max) over the union of keys; 0.0 when both are empty"""
+    if len(a) > len(b):
+        a, b = b, a
+    shared_min = 0.0
+    for term, weight in a.items():
+        other = b.get(term)
+        if other is not None:
+            shared_min += min(weight, other)
+    # sum(max) over the union = sum(a) + sum(b) - sum(min) over shared keys
+    total = sum(a.values()) + sum(b.values()) - shared_min
+    return shared_min / total if total else 0.0
+
+
+def _splitmix64(x: np.ndarray) -> np.ndarray:
+    x = x + np.uint64(0x9E3779B97F4A7C15)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+class MinHasher:
+    """MinHash signatures over keyword sets: num_perm seeded 64-bit mixers, vectorized in NumPy"""
+
+    def __init__(self, num_perm: int = 128, seed: int = 1):
+        self.num_perm = num_perm
+        self.seeds = _splitmix64(np.arange(num_perm, dtype=np.uint64) + np.uint64(seed << 32))
+
+    def signature(self, terms: Iterable[str]) -> np.ndarray:
+        hashes = np.array([
+            int.from_bytes(hashlib.blake2b(term.encode('utf-8'), digest_size=8).digest(), 'little')
+            for term in terms
+        ], dtype=np.uint64)
+        if hashes.size == 0:
+            return np.full(self.num_perm, _MASK61, dtype=np.uint64)
+        # (terms x permutations) -> column minima
+        return (_splitmix64(hashes[:, None] ^ self.seeds[None, :]) & _MASK61).min(axis=0)
+
+    @staticmethod
+    def estimate(a: np.ndarray, b: np.ndarray) -> float:
+        """Estimated (unweighted) Jaccard similarity of two signatures"""
+        return float(np.count_nonzero(a == b)) / len(a)
+
+
+class SiteSimilarityIndex:
+    """
+    Keyword-overlap index over every analyzed site.
+    MinHash signatures are banded into an LSH table, so sites sharing a
+    band with the query are the only candidates; candidates are then ranked
+    by exact weighted Jaccard on their stored keyword weights.
+    With 32 bands of 4 rows, pairs at Jaccard 0.3 collide with ~23%
+    probability and pairs at 0.5 with ~87%.
+
+    With a store (see CompetitorSnapshotStore.put_site), sites are written
+    through to SQLite, loaded on creation, and sites added by other
+    processes are picked up before each query.
+    """
+
+    _default_instance = None
+    _default_lock = threading.Lock()
+
+    def __init__(self, num_perm: int = 128, bands: int = 32, store=None):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.hasher = MinHasher(num_perm)
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.weights: Dict[str, Dict[str, float]] = {}
+        self.signatures: Dict[str, np.ndarray] = {}
+        self.buckets: List[Dict[bytes, Set[str]]] = [defaultdict(set) for _ in range(bands)]
+        self._lock = threading.RLock()
+        self.store = store
+        # Highest store version indexed so far
+        self._version = 0
+        self.sync()
+
+    @classmethod
+    def default(cls) -> 'SiteSimilarityIndex':
+        """Process-wide index of sites seen by competitor analysis, persisted with the snapshots"""
+        with cls._default_lock:
+            if cls._default_instance is None:
+                from backend.competitor_snapshots import CompetitorSnapshotStore
+                cls._default_instance = cls(store=CompetitorSnapshotStore.default())
+            return cls._default_instance
+
+    def sync(self) -> int:
+        """Index sites written to the store since the last sync (e.g. by other workers); returns how many"""
+        if self.store is None:
+            return 0
+        with self._lock:
+            rows = self.store.sites_since(self._version)
+            for site, weights, signature, version in rows:
+                self._index(site, weights, signature)
+                self._version = version
+        return len(rows)
+
+    def __len__(self) -> int:
+        return len(self.weights)
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [signature[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+    def add(self, site: str, weights: Dict[str, float], signature: Optional[np.ndarray] = None):
+        """Insert or replace a site's keyword weights (signature: precomputed MinHash of weights)"""
+        if signature is None or len(signature) != self.hasher.num_perm:
+            signature = self.hasher.signature(weights)
+        with self._lock:
+            self._index(site, weights, signature)
+            if self.store is not None:
+                self.store.put_site(site, weights, signature)
+
+    def _index(self, site: str, weights: Dict[str, float], signature: np.ndarray):
+        with self._lock:
+            if len(signature) != self.hasher.num_perm:
+                # Stored with a different configuration
+                signature = self.hasher.signature(weights)
+            self._discard(site)
+            self.weights[site] = weights
+            self.signatures[site] = signature
+            for band, key in zip(self.buckets, self._band_keys(signature)):
+                band[key].add(site)
+
+    def remove(self, site: str):
+        """Drop a site (other processes drop it on their next restart)"""
+        with self._lock:
+            self._discard(site)
+            if self.store is not None:
+                self.store.delete_site(site)
+
+    def _discard(self, site: str):
+        with self._lock:
+            signature = self.signatures.pop(site, None)
+            self.weights.pop(site, None)
+            if signature is None:
+                return
+            for band, key in zip(self.buckets, self._band_keys(signature)):
+                members = band.get(key)
+                if members is not None:
+                    members.discard(site)
+                    if not members:
+                        del band[key]
+
+    def candidates(self, weights: Dict[str, float]) -> Set[str]:
+        self.sync()
+        signature = self.hasher.signature(weights)
+        found: Set[str] = set()
+        with self._lock:
+            for band, key in zip(self.buckets, self._band_keys(signature)):
+                found |= band.get(key, set())
+        return found
+
+    def most_similar(self, weights: Dict[str, float], limit: int = 10,
+                     exclude: Optional[str] = None) -> List[Tuple[str, float]]:
+        """Top sites by weighted Jaccard among LSH candidates, highest first"""
+        with self._lock:
+            scored = [
+                (site, weighted_jaccard(weights, self.weights[site]))
+                for site in self.candidates(weights) if site != exclude
+            ]
+        scored.sort(key=lambda item: item[1], reverse=True)
+        return [(site, score) for site, score in scored[:limit] if score > 0]
+
+    def most_similar_to_site(self, site: str, limit: int = 10) -> List[Tuple[str, float]]:
+        self.sync()
+        with self._lock:
+            weights = self.weights.get(site)
+        if weights is None:
+            return []
+        return self.most_similar(weights, limit, exclude=site)
@@ -1,16 +1,39 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import Depends, FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import Optional, List
+from contextlib import asynccontextmanager
+from typing import Any, Dict, Optional, List, Union
 import asyncio
 from backend.scraper import KeywordScraperAgent
 from backend.nlp_engine import NLPKeywordEngine
-from backend.keyword_metrics import KeywordMetricsService
+from backend.keyword_metrics import KeywordMetricsService, resolve_regions
 from backend.competitor_analysis import CompetitorAnalysisService
+from backend.keyword_similarity import SiteSimilarityIndex
+from backend.keyword_analysis import analyze_keywords
+from backend.container import (
+    AppContainer, get_bulk_pipeline, get_competitor_service, get_container, get_job_runner, get_metrics_service,
+    get_nlp_engine, get_scraper
+)
+from backend.bulk_pipeline import BULK_MAX_URLS, BulkAnalysisPipeline, validate_urls
+from backend.jobs import JobRunner
+from backend.job_handlers import normalize_job_params
+from backend.serialization import dumps, json_response
 import logging
 import traceback
 
-app = FastAPI(title="KeywordMiner AI")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Services are built and warmed up once, before the first request
+    container = AppContainer()
+    await container.start()
+    app.state.container = container
+    try:
+        yield
+    finally:
+        await container.shutdown()
+
+app = FastAPI(title="KeywordMiner AI", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -22,81 +45,178 @@ app.add_middleware(
 
 class AnalyzeRequest(BaseModel):
     url: str
-    region: Optional[str] = "auto"
+    region: Optional[Union[str, List[str]]] = "auto"
     email: Optional[str] = None
 
-class KeywordResult(BaseModel):
-    keyword: str
-    volume: Optional[int] = None
-    cpc: Optional[float] = None
-    competition: Optional[str] = None
-    competition_score: Optional[float] = None
-    trend: Optional[str] = None
-    type: str
-    intent: str
-    count: Optional[int] = None
+class BulkAnalyzeRequest(BaseModel):
+    urls: List[str]
+    region: Optional[Union[str, List[str]]] = "auto"
+
+class JobRequest(BaseModel):
+    kind: str
+    params: Dict[str, Any] = {}
 
 @app.get("/")
 async def root():
     return {"message": "KeywordMiner AI API is running"}
 
+@app.get("/health")
+async def health(container: AppContainer = Depends(get_container)):
+    """Startup and warm-up durations (ms) of the service container"""
+    return {
+        "status": "ok",
+        "browser_pool": container.browser_pool is not None and container.browser_pool.started,
+        "timings_ms": container.timings
+    }
+
 @app.post("/analyze")
-async def analyze_website(request: AnalyzeRequest):
+async def analyze_website(request: AnalyzeRequest, http_request: Request,
+                          scraper: KeywordScraperAgent = Depends(get_scraper),
+                          nlp_engine: NLPKeywordEngine = Depends(get_nlp_engine),
+                          metrics_service: KeywordMetricsService = Depends(get_metrics_service)):
     try:
-        scraper = KeywordScraperAgent()
-        content = await scraper.scrape_website(request.url)
-        
-        nlp_engine = NLPKeywordEngine()
-        keywords = nlp_engine.extract_keywords(content)
-        
-        metrics_service = KeywordMetricsService()
-        
-        results = []
-        for keyword in keywords:
-            # Get metrics for each keyword
-            metrics = metrics_service.get_keyword_metrics(keyword['keyword'], request.region)
-            
-            result = KeywordResult(
-                keyword=keyword['keyword'],
-                volume=metrics['volume'],
-                cpc=metrics['cpc'],
-                competition=metrics['competition'],
-                competition_score=metrics['competition_score'],
-                trend=metrics['trend'],
-                type=keyword['type'],
-                intent=keyword['intent'],
-                count=keyword.get('count', 0)
-            )
-            results.append(result)
-        
-        # Sort by volume (highest first)
-        results.sort(key=lambda x: x.volume or 0, reverse=True)
-        
-        return {
-            "url": request.url,
-            "region": request.region,
-            "keywords_found": len(results),
-            "keywords": results,
-            "total_volume": sum(r.volume or 0 for r in results),
-            "avg_cpc": round(sum(r.cpc or 0 for r in results) / len(results), 2) if results else 0
-        }
+        resolve_regions(request.region)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    try:
+        # Reuses a recent scrape of the same URL (e.g. from /analyze-competitors)
+        analysis = await analyze_keywords(request.url, request.region, scraper, nlp_engine, metrics_service)
+        return await json_response(analysis, http_request.headers.get('accept-encoding'))
     except Exception as e:
         logging.error(f"Error analyzing website: {e}")
         logging.error(traceback.format_exc())
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/analyze/bulk")
+async def analyze_bulk(request: BulkAnalyzeRequest, pipeline: BulkAnalysisPipeline = Depends(get_bulk_pipeline)):
+    """
+    Analyze many URLs in one request. Streams NDJSON: one line per URL, in
+    completion order, with the URL's index in the request and either the
+    /analyze response (status "ok") or the failing stage and error.
+    """
+    if not request.urls:
+        raise HTTPException(status_code=400, detail="No URLs given")
+    if len(request.urls) > BULK_MAX_URLS:
+        raise HTTPException(status_code=400, detail=f"At most {BULK_MAX_URLS} URLs per request")
+    try:
+        urls = validate_urls(request.urls)
+        resolve_regions(request.region)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    async def lines():
+        async for result in pipeline.run(urls, request.region):
+            yield dumps(result) + b"\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
 @app.post("/analyze-competitors")
-async def analyze_competitors(request: AnalyzeRequest):
+async def analyze_competitors(request: AnalyzeRequest, http_request: Request,
+                              competitor_service: CompetitorAnalysisService = Depends(get_competitor_service)):
+    _require_single_region(request.region)
     try:
-        competitor_service = CompetitorAnalysisService()
         analysis = await competitor_service.analyze_competitors(request.url, request.region)
         
-        return analysis
+        return await json_response(analysis, http_request.headers.get('accept-encoding'))
     except Exception as e:
         logging.error(f"Error in competitor analysis: {e}")
         logging.error(traceback.format_exc())
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/analyze-competitors/stream")
+async def analyze_competitors_stream(request: AnalyzeRequest,
+                                     competitor_service: CompetitorAnalysisService = Depends(get_competitor_service)):
+    """
+    /analyze-competitors as Server-Sent Events: 'target', then one
+    'competitor' per competitor as it finishes, then 'gaps'. Failures after
+    the stream has started arrive as an 'error' event.
+    """
+    _require_single_region(request.region)
+
+    async def events():
+        try:
+            async for event, data in competitor_service.stream_competitor_analysis(request.url, request.region):
+                yield _sse_event(event, data)
+        except Exception as e:
+            logging.error(f"Error in streamed competitor analysis: {e}")
+            logging.error(traceback.format_exc())
+            yield _sse_event('error', {'detail': str(e)})
+    
+    return StreamingResponse(events(), media_type="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        # Keep reverse proxies from buffering the stream
+        "X-Accel-Buffering": "no"
+    })
+
+def _require_single_region(region):
+    """Competitor analysis runs in one region; lists and "all" are a 400"""
+    try:
+        multi_region = resolve_regions(region) is not None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if multi_region:
+        raise HTTPException(status_code=400, detail="Competitor analysis takes a single region")
+
+def _sse_event(event: str, data) -> str:
+    return f"event: {event}\ndata: {dumps(data).decode('utf-8')}\n\n"
+
+@app.post("/jobs", status_code=202)
+async def submit_job(request: JobRequest, job_runner: JobRunner = Depends(get_job_runner)):
+    """
+    Queue a long-running analysis (kind: analyze, competitors, crawl, longtail)
+    and return its id at once; poll GET /jobs/{id}. An identical submission
+    returns the existing job.
+    """
+    try:
+        params = normalize_job_params(request.kind, request.params)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    job = job_runner.submit(request.kind, params)
+    return {
+        "id": job['id'],
+        "kind": job['kind'],
+        "status": job['status'],
+        "deduplicated": job['deduplicated']
+    }
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str, http_request: Request, job_runner: JobRunner = Depends(get_job_runner)):
+    """Status, progress, partial results while running, and the result or error once finished"""
+    job = job_runner.store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return await json_response(job, http_request.headers.get('accept-encoding'))
+
+@app.get("/sites/similar")
+async def get_similar_sites(url: str, limit: int = 10):
+    """Analyzed sites whose keywords overlap most with url's (url must have been analyzed)"""
+    domain = url.replace('https://', '').replace('http://', '').split('/')[0].lower()
+    similar = SiteSimilarityIndex.default().most_similar_to_site(domain, min(limit, 100))
+    return {
+        "domain": domain,
+        "similar_sites": [
+            {"domain": site, "keyword_overlap": round(score * 100, 1)} for site, score in similar
+        ]
+    }
+
+@app.get("/metrics/search")
+async def search_keyword_metrics(region: str = "us", prefix: Optional[str] = None,
+                                 min_volume: Optional[int] = None, max_volume: Optional[int] = None,
+                                 min_cpc: Optional[float] = None, max_cpc: Optional[float] = None,
+                                 limit: int = 100,
+                                 metrics_service: KeywordMetricsService = Depends(get_metrics_service)):
+    try:
+        rows = metrics_service.search_metrics(
+            region=region, prefix=prefix,
+            min_volume=min_volume, max_volume=max_volume,
+            min_cpc=min_cpc, max_cpc=max_cpc,
+            limit=min(limit, 1000)
+        )
+        return {"region": region, "keywords_found": len(rows), "keywords": rows}
+    except Exception as e:
+        logging.error(f"Error searching keyword metrics: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.get("/regions")
 async def get_supported_regions():
     return {
@@ -0,0 +1,62 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Hashable, Set
+
+
+class BackgroundRefresher:
+    """
+    Runs refresh jobs in the background with bounded concurrency.
+    A key that is already queued or running is not scheduled twice.
+    """
+
+    _default_instance = None
+    _default_lock = threading.Lock()
+
+    def __init__(self, max_concurrency: int = 4, max_pending: int = 1000):
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix='metrics-refresh'
+        )
+        self._in_flight: Set[Hashable] = set()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def default(cls) -> 'BackgroundRefresher':
+        """Process-wide refresher shared by all metrics services"""
+        with cls._default_lock:
+            if cls._default_instance is None:
+                cls._default_instance = cls()
+            return cls._default_instance
+
+    def schedule(self, key: Hashable, fn: Callable, *args) -> bool:
+        """Queue fn(*args) unless key is already in flight or the queue is full"""
+        with self._lock:
+            if key in self._in_flight or len(self._in_flight) >= self.max_pending:
+                return False
+            self._in_flight.add(key)
+
+        try:
+            self._executor.submit(self._run, key, fn, args)
+        except RuntimeError:
+            # Executor already shut down
+            with self._lock:
+                self._in_flight.discard(key)
+            return False
+        return True
+
+    def _run(self, key: Hashable, fn: Callable, args: tuple):
+        try:
+            fn(*args)
+        except Exception as e:
+            logging.warning(f"Background refresh failed for {key}: {e}")
+        finally:
+            with self._lock:
+                self._in_flight.discard(key)
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._in_flight)
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
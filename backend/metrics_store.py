@@ -0,0 +1,209 @@
+import os
+import sqlite3
+import threading
+import time
+from datetime import date
+from typing import Dict, Iterable, List, Optional
+
+DEFAULT_DB_PATH = os.getenv(
+    'KEYWORD_METRICS_DB',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'keyword_metrics.db')
+)
+
+class KeywordMetricsStore:
+    """Local SQLite store for keyword metrics keyed by (keyword, region, date)"""
+
+    _default_instance = None
+    _default_lock = threading.Lock()
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH, wal: bool = True):
+        self.db_path = db_path
+        if db_path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+
+        # One shared connection guarded by a lock; WAL keeps readers unblocked
+        # while a bulk upsert transaction is open.
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+
+        # page_size only takes effect before the first table is created
+        self._conn.execute('PRAGMA page_size=16384')
+        if wal and db_path != ':memory:':
+            self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute('PRAGMA temp_store=MEMORY')
+        self._conn.execute('PRAGMA cache_size=-65536')
+        self._conn.execute('PRAGMA mmap_size=268435456')
+        self._create_schema()
+
+    @classmethod
+    def default(cls) -> 'KeywordMetricsStore':
+        """Process-wide store at DEFAULT_DB_PATH"""
+        with cls._default_lock:
+            if cls._default_instance is None:
+                cls._default_instance = cls()
+            return cls._default_instance
+
+    def _create_schema(self):
+        with self._lock:
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS keyword_metrics (
+                    keyword TEXT NOT NULL,
+                    region TEXT NOT NULL,
+                    date TEXT NOT NULL,
+                    volume INTEGER,
+                    cpc REAL,
+                    competition TEXT,
+                    competition_score REAL,
+                    trend TEXT,
+                    updated_at REAL NOT NULL,
+                    PRIMARY KEY (keyword, region, date)
+                ) WITHOUT ROWID;
+
+                CREATE INDEX IF NOT EXISTS idx_metrics_region_volume
+                    ON keyword_metrics (region, volume);
+                CREATE INDEX IF NOT EXISTS idx_metrics_region_cpc
+                    ON keyword_metrics (region, cpc);
+            """)
+            # Prefix queries use the primary key: keyword is its leading column.
+
+    def upsert_many(self, rows: Iterable[Dict], batch_size: int = 50000) -> int:
+        """
+        Insert or replace metrics rows in large transactions.
+        Each row needs keyword and region; date defaults to today.
+        """
+        today = date.today().isoformat()
+        now = time.time()
+        sql = """
+            INSERT INTO keyword_metrics
+                (keyword, region, date, volume, cpc, competition, competition_score, trend, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (keyword, region, date) DO UPDATE SET
+                volume = excluded.volume,
+                cpc = excluded.cpc,
+                competition = excluded.competition,
+                competition_score = excluded.competition_score,
+                trend = excluded.trend,
+                updated_at = excluded.updated_at
+        """
+
+        total = 0
+        batch = []
+        with self._lock:
+            for row in rows:
+                batch.append((
+                    row['keyword'].lower(),
+                    row['region'],
+                    row.get('date') or today,
+                    row.get('volume'),
+                    row.get('cpc'),
+                    row.get('competition'),
+                    row.get('competition_score'),
+                    row.get('trend'),
+                    row.get('updated_at') or now
+                ))
+                if len(batch) >= batch_size:
+                    total += self._write_batch(sql, batch)
+                    batch = []
+            if batch:
+                total += self._write_batch(sql, batch)
+        return total
+
+    def _write_batch(self, sql: str, batch: List[tuple]) -> int:
+        # Writing in primary-key order keeps b-tree page touches sequential
+        batch.sort()
+        self._conn.execute('BEGIN')
+        try:
+            self._conn.executemany(sql, batch)
+            self._conn.execute('COMMIT')
+        except Exception:
+            self._conn.execute('ROLLBACK')
+            raise
+        return len(batch)
+
+    def upsert(self, keyword: str, region: str, metrics: Dict, day: Optional[str] = None) -> None:
+        self.upsert_many([dict(metrics, keyword=keyword, region=region, date=day)])
+
+    def get_latest(self, keyword: str, region: str) -> Optional[Dict]:
+        """Most recent stored metrics for a keyword in a region"""
+        with self._lock:
+            row = self._conn.execute(
+                """
+                SELECT * FROM keyword_metrics
+                WHERE keyword = ? AND region = ?
+                ORDER BY date DESC LIMIT 1
+                """,
+                (keyword.lower(), region)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def get_history(self, keyword: str, region: str,
+                    start: Optional[str] = None, end: Optional[str] = None) -> List[Dict]:
+        """Stored metrics for a keyword ordered by date (ISO date bounds, inclusive)"""
+        sql = 'SELECT * FROM keyword_metrics WHERE keyword = ? AND region = ?'
+        params = [keyword.lower(), region]
+        if start:
+            sql += ' AND date >= ?'
+            params.append(start)
+        if end:
+            sql += ' AND date <= ?'
+            params.append(end)
+        sql += ' ORDER BY date'
+
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(sql, params)]
+
+    def query_prefix(self, prefix: str, region: str, limit: int = 100) -> List[Dict]:
+        """Latest metrics for keywords starting with prefix"""
+        prefix = prefix.lower()
+        # Range scan on the primary key instead of LIKE, which SQLite
+        # can only index with case_sensitive_like enabled.
+        upper = prefix[:-1] + chr(ord(prefix[-1]) + 1) if prefix else '\U0010ffff'
+        return self._query_latest(
+            'keyword >= ? AND keyword < ?', [prefix, upper], region, 'keyword', limit,
+            use_region_index=False
+        )
+
+    def query_volume_range(self, region: str, min_volume: int = 0,
+                           max_volume: Optional[int] = None, limit: int = 100) -> List[Dict]:
+        """Latest metrics with volume in [min_volume, max_volume], highest first"""
+        clause, params = 'volume >= ?', [min_volume]
+        if max_volume is not None:
+            clause += ' AND volume <= ?'
+            params.append(max_volume)
+        return self._query_latest(clause, params, region, 'volume DESC', limit)
+
+    def query_cpc_range(self, region: str, min_cpc: float = 0.0,
+                        max_cpc: Optional[float] = None, limit: int = 100) -> List[Dict]:
+        """Latest metrics with CPC in [min_cpc, max_cpc], highest first"""
+        clause, params = 'cpc >= ?', [min_cpc]
+        if max_cpc is not None:
+            clause += ' AND cpc <= ?'
+            params.append(max_cpc)
+        return self._query_latest(clause, params, region, 'cpc DESC', limit)
+
+    def _query_latest(self, clause: str, params: List, region: str, order_by: str, limit: int,
+                      use_region_index: bool = True) -> List[Dict]:
+        # Unary plus stops the planner from picking a region index over the key range
+        region_column = 'm.region' if use_region_index else '+m.region'
+        sql = f"""
+            SELECT m.* FROM keyword_metrics m
+            WHERE {region_column} = ? AND {clause}
+              AND m.date = (
+                  SELECT MAX(date) FROM keyword_metrics
+                  WHERE keyword = m.keyword AND region = m.region
+              )
+            ORDER BY {order_by}
+            LIMIT ?
+        """
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(sql, [region] + params + [limit])]
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM keyword_metrics').fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -1,87 +1,175 @@
 from playwright.async_api import async_playwright
 from bs4 import BeautifulSoup
 import asyncio
-from typing import Dict, List
+import logging
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional
 import re
 
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+class BrowserPoolUnavailable(Exception):
+    """The shared browser is closed or could not be relaunched"""
+
+class BrowserPool:
+    """
+    One Chromium process shared by every scrape. Each scrape gets its own
+    browser context (isolated cookies and cache); max_contexts bounds how
+    many pages are open at once.
+    """
+    
+    def __init__(self, max_contexts: int = 8):
+        self.max_contexts = max_contexts
+        self.playwright = None
+        self.browser = None
+        self._semaphore = asyncio.Semaphore(max_contexts)
+        self._lock = asyncio.Lock()
+    
+    @property
+    def started(self) -> bool:
+        return self.browser is not None
+    
+    async def start(self):
+        async with self._lock:
+            if self.browser is not None and self.browser.is_connected():
+                return
+            await self._stop()
+            self.playwright = await async_playwright().start()
+            try:
+                self.browser = await self.playwright.chromium.launch(headless=True)
+            except Exception:
+                await self._stop()
+                raise
+    
+    async def close(self):
+        async with self._lock:
+            await self._stop()
+    
+    async def _stop(self):
+        if self.browser:
+            await self.browser.close()
+        if self.playwright:
+            await self.playwright.stop()
+        self.playwright = self.browser = None
+    
+    @asynccontextmanager
+    async def context(self):
+        """A fresh browser context; raises BrowserPoolUnavailable if the pool cannot provide one"""
+        async with self._semaphore:
+            browser = self.browser
+            if browser is None:
+                raise BrowserPoolUnavailable("Shared browser is not running")
+            if not browser.is_connected():
+                # Relaunch after a browser crash
+                try:
+                    await self.start()
+                except Exception as e:
+                    raise BrowserPoolUnavailable(f"Shared browser relaunch failed: {e}")
+                browser = self.browser
+            try:
+                context = await browser.new_context(user_agent=USER_AGENT)
+            except Exception as e:
+                raise BrowserPoolUnavailable(f"Shared browser cannot open a context: {e}")
+            try:
+                yield context
+            finally:
+                await context.close()
+
 class KeywordScraperAgent:
-    def __init__(self):
+    def __init__(self, pool: Optional[BrowserPool] = None):
+        # With a started pool, scrapes share its browser and the agent is
+        # safe to use concurrently; otherwise each scrape launches its own
+        self.pool = pool
+        self.playwright = None
         self.browser = None
         self.context = None
         
     async def _init_browser(self):
-        playwright = await async_playwright().start()
-        self.browser = await playwright.chromium.launch(headless=True)
-        self.context = await self.browser.new_context(
-            user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        )
+        self.playwright = await async_playwright().start()
+        self.browser = await self.playwright.chromium.launch(headless=True)
+        self.context = await self.browser.new_context(user_agent=USER_AGENT)
     
     async def _close_browser(self):
         if self.context:
             await self.context.close()
         if self.browser:
             await self.browser.close()
+        if self.playwright:
+            await self.playwright.stop()
+        self.playwright = self.browser = self.context = None
     
     async def scrape_website(self, url: str) -> Dict:
+        if self.pool is not None and self.pool.started:
+            try:
+                async with self.pool.context() as context:
+                    return await self._scrape_page(context, url)
+            except BrowserPoolUnavailable as e:
+                logging.warning(f"{e}; launching a browser for this scrape")
+            except Exception as e:
+                raise Exception(f"Error scraping website: {str(e)}")
+        
         try:
             await self._init_browser()
-            page = await self.context.new_page()
-            
-            await page.goto(url, wait_until='networkidle', timeout=30000)
-            await page.wait_for_timeout(2000)
-            
-            html_content = await page.content()
-            
-            soup = BeautifulSoup(html_content, 'html.parser')
-            
-            content = {
-                'url': url,
-                'title': '',
-                'meta_description': '',
-                'meta_keywords': '',
-                'headings': {'h1': [], 'h2': [], 'h3': [], 'h4': [], 'h5': [], 'h6': []},
-                'paragraphs': [],
-                'links': [],
-                'images_alt': []
-            }
-            
-            title_tag = soup.find('title')
-            if title_tag:
-                content['title'] = title_tag.text.strip()
-            
-            meta_desc = soup.find('meta', attrs={'name': 'description'})
-            if meta_desc:
-                content['meta_description'] = meta_desc.get('content', '')
-            
-            meta_keywords = soup.find('meta', attrs={'name': 'keywords'})
-            if meta_keywords:
-                content['meta_keywords'] = meta_keywords.get('content', '')
-            
-            for i in range(1, 7):
-                headings = soup.find_all(f'h{i}')
-                content['headings'][f'h{i}'] = [h.text.strip() for h in headings if h.text.strip()]
-            
-            paragraphs = soup.find_all('p')
-            content['paragraphs'] = [p.text.strip() for p in paragraphs if p.text.strip() and len(p.text.strip()) > 20]
-            
-            links = soup.find_all('a')
-            for link in links:
-                link_text = link.text.strip()
-                if link_text and len(link_text) > 2:
-                    content['links'].append(link_text)
-            
-            images = soup.find_all('img')
-            for img in images:
-                alt_text = img.get('alt', '').strip()
-                if alt_text:
-                    content['images_alt'].append(alt_text)
-            
-            await self._close_browser()
-            return content
-            
+            return await self._scrape_page(self.context, url)
         except Exception as e:
-            await self._close_browser()
             raise Exception(f"Error scraping website: {str(e)}")
+        finally:
+            # Also runs when the caller's deadline cancels the scrape
+            await self._close_browser()
+    
+    async def _scrape_page(self, context, url: str) -> Dict:
+        page = await context.new_page()
+        
+        await page.goto(url, wait_until='networkidle', timeout=30000)
+        await page.wait_for_timeout(2000)
+        
+        html_content = await page.content()
+        
+        soup = BeautifulSoup(html_content, 'html.parser')
+        
+        content = {
+            'url': url,
+            'title': '',
+            'meta_description': '',
+            'meta_keywords': '',
+            'headings': {'h1': [], 'h2': [], 'h3': [], 'h4': [], 'h5': [], 'h6': []},
+            'paragraphs': [],
+            'links': [],
+            'images_alt': []
+        }
+        
+        title_tag = soup.find('title')
+        if title_tag:
+            content['title'] = title_tag.text.strip()
+        
+        meta_desc = soup.find('meta', attrs={'name': 'description'})
+        if meta_desc:
+            content['meta_description'] = meta_desc.get('content', '')
+        
+        meta_keywords = soup.find('meta', attrs={'name': 'keywords'})
+        if meta_keywords:
+            content['meta_keywords'] = meta_keywords.get('content', '')
+        
+        for i in range(1, 7):
+            headings = soup.find_all(f'h{i}')
+            content['headings'][f'h{i}'] = [h.text.strip() for h in headings if h.text.strip()]
+        
+        paragraphs = soup.find_all('p')
+        content['paragraphs'] = [p.text.strip() for p in paragraphs if p.text.strip() and len(p.text.strip()) > 20]
+        
+        links = soup.find_all('a')
+        for link in links:
+            link_text = link.text.strip()
+            if link_text and len(link_text) > 2:
+                content['links'].append(link_text)
+        
+        images = soup.find_all('img')
+        for img in images:
+            alt_text = img.get('alt', '').strip()
+            if alt_text:
+                content['images_alt'].append(alt_text)
+        
+        return content
     
     def clean_text(self, text: str) -> str:
         text = re.sub(r'<[^>]+>', '', text)
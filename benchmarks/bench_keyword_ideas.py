@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'api'))
+
+from google_trends_api import GoogleTrendsAPI, KEYWORD_IDEA_FIELDS
+
+SEEDS = ['seo tools', 'crm software', 'project management', 'ai chatbot', 'running shoes']
+
+
+def time_per_call(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def bench_keyword_ideas(repeat: int = 200):
+    print("📊 Keyword idea generation: full trends vs field projection\n")
+    api = GoogleTrendsAPI()
+
+    full = time_per_call(lambda: api.get_google_trends_data('seo tools for agencies'), repeat * 10)
+    projected = time_per_call(
+        lambda: api.get_google_trends_data('seo tools for agencies', fields=KEYWORD_IDEA_FIELDS), repeat * 10
+    )
+    print(f"get_google_trends_data  full: {full * 1e6:8.1f} µs   projected: {projected * 1e6:8.1f} µs   "
+          f"({full / projected:.1f}x)")
+
+    # get_keyword_ideas with the pre-projection behaviour: every section computed
+    def ideas_full(seed):
+        original = api.get_google_trends_data
+        api.get_google_trends_data = lambda keyword, region="US", fields=None: original(keyword, region)
+        try:
+            return api.get_keyword_ideas(seed)
+        finally:
+            del api.get_google_trends_data
+
+    for seed in SEEDS[:2]:
+        before = time_per_call(lambda: ideas_full(seed), repeat)
+        after = time_per_call(lambda: api.get_keyword_ideas(seed), repeat)
+        print(f"get_keyword_ideas({seed!r:<16}) full: {before * 1e3:6.2f} ms   projected: {after * 1e3:6.2f} ms   "
+              f"({before / after:.1f}x)")
+
+
+if __name__ == "__main__":
+    bench_keyword_ideas()
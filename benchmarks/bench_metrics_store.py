@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from backend.metrics_store import KeywordMetricsStore
+
+REGIONS = ['us', 'uk', 'ca', 'au', 'ae', 'in', 'global']
+WORDS = ['seo', 'keyword', 'tool', 'best', 'cheap', 'ai', 'software', 'guide', 'platform', 'review',
+         'pricing', 'online', 'cloud', 'crm', 'shop', 'marketing', 'analytics', 'free', 'api', 'app']
+
+
+def make_rows(n: int):
+    rng = random.Random(42)
+    for i in range(n):
+        yield {
+            'keyword': f"{rng.choice(WORDS)} {rng.choice(WORDS)} {i}",
+            'region': REGIONS[i % len(REGIONS)],
+            'volume': rng.randint(100, 50000),
+            'cpc': round(rng.uniform(0.25, 8.5), 2),
+            'competition': rng.choice(['Low', 'Medium', 'High']),
+            'competition_score': round(rng.random(), 2),
+            'trend': rng.choice(['Rising', 'Stable', 'Declining', 'Seasonal'])
+        }
+
+
+def bench_store(n: int = 500000):
+    print(f"📊 Keyword metrics store benchmark ({n:,} rows)\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = KeywordMetricsStore(os.path.join(tmp, 'metrics.db'))
+        rows = list(make_rows(n))
+
+        start = time.perf_counter()
+        store.upsert_many(rows)
+        elapsed = time.perf_counter() - start
+        print(f"Insert:  {elapsed:.2f}s  ({n / elapsed:,.0f} upserts/s)")
+
+        # Second pass hits the ON CONFLICT update path
+        start = time.perf_counter()
+        store.upsert_many(rows)
+        elapsed = time.perf_counter() - start
+        print(f"Update:  {elapsed:.2f}s  ({n / elapsed:,.0f} upserts/s)")
+
+        queries = [
+            ('prefix "best ai"', lambda: store.query_prefix('best ai', 'us')),
+            ('volume 10k-20k', lambda: store.query_volume_range('us', 10000, 20000)),
+            ('cpc 5.00-6.00', lambda: store.query_cpc_range('uk', 5.0, 6.0)),
+            ('latest lookup', lambda: store.get_latest(rows[1234]['keyword'], rows[1234]['region'])),
+        ]
+        for name, query in queries:
+            start = time.perf_counter()
+            for _ in range(100):
+                query()
+            elapsed = (time.perf_counter() - start) / 100
+            print(f"Query {name:<18} {elapsed * 1000:.2f} ms")
+
+        store.close()
+
+
+if __name__ == "__main__":
+    bench_store()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+
+import gzip
+import json
+import os
+import random
+import sys
+import time
+from typing import Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+
+from backend.serialization import BROTLI_QUALITY, GZIP_LEVEL, brotli, dumps, orjson
+
+SIZES = [100, 1000, 10000]
+REPEATS = 5
+
+
+class KeywordResult(BaseModel):
+    """The per-row model /analyze built before the fast path"""
+    keyword: str
+    volume: Optional[int] = None
+    cpc: Optional[float] = None
+    competition: Optional[str] = None
+    competition_score: Optional[float] = None
+    trend: Optional[str] = None
+    type: str
+    intent: str
+    count: Optional[int] = None
+
+
+def generate_rows(n: int):
+    random.seed(42)
+    words = ['keyword', 'research', 'tool', 'seo', 'rank', 'tracker', 'content', 'audit', 'backlink', 'ai']
+    rows = []
+    for i in range(n):
+        rows.append(({
+            'keyword': ' '.join(random.sample(words, 3)) + f" {i}",
+            'type': random.choice(['short-tail', 'long-tail', 'branded']),
+            'intent': random.choice(['informational', 'commercial', 'transactional', 'general']),
+            'count': random.randint(1, 12)
+        }, {
+            'volume': random.randint(100, 50000),
+            'cpc': round(random.uniform(0.25, 8.5), 2),
+            'competition': random.choice(['Low', 'Medium', 'High']),
+            'competition_score': round(random.random(), 2),
+            'trend': random.choice(['Rising', 'Stable', 'Declining'])
+        }))
+    return rows
+
+
+def model_path(rows) -> bytes:
+    """Per-row models, then FastAPI's jsonable_encoder and JSONResponse rendering"""
+    results = [KeywordResult(
+        keyword=keyword['keyword'], volume=metrics['volume'], cpc=metrics['cpc'],
+        competition=metrics['competition'], competition_score=metrics['competition_score'],
+        trend=metrics['trend'], type=keyword['type'], intent=keyword['intent'], count=keyword['count']
+    ) for keyword, metrics in rows]
+    content = jsonable_encoder({'keywords_found': len(results), 'keywords': results})
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode('utf-8')
+
+
+def fast_path(rows) -> bytes:
+    """Plain dict rows, encoded once"""
+    results = [{
+        'keyword': keyword['keyword'], 'volume': metrics['volume'], 'cpc': metrics['cpc'],
+        'competition': metrics['competition'], 'competition_score': metrics['competition_score'],
+        'trend': metrics['trend'], 'type': keyword['type'], 'intent': keyword['intent'], 'count': keyword['count']
+    } for keyword, metrics in rows]
+    return dumps({'keywords_found': len(results), 'keywords': results})
+
+
+def timed(fn, *args):
+    best = float('inf')
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def bench_serialization():
+    print("📦 /analyze response serialization: per-row models vs plain rows + "
+          f"{'orjson' if orjson is not None else 'json (orjson not installed)'}\n")
+
+    print("⏱️  Build + encode (ms, best of 5):")
+    print(f"   {'keywords':>8} {'models':>9} {'fast':>8} {'speedup':>8}")
+    bodies = {}
+    for n in SIZES:
+        rows = generate_rows(n)
+        slow, slow_body = timed(model_path, rows)
+        fast, fast_body = timed(fast_path, rows)
+        assert json.loads(slow_body) == json.loads(fast_body)
+        bodies[n] = fast_body
+        print(f"   {n:>8} {slow * 1000:>9.2f} {fast * 1000:>8.2f} {slow / fast:>7.1f}x")
+
+    print("\n🌐 Bytes on the wire (compression time in ms):")
+    print(f"   {'keywords':>8} {'identity':>10} {'gzip':>16} {'br':>16}")
+    for n, body in bodies.items():
+        gzip_time, gzipped = timed(gzip.compress, body, GZIP_LEVEL)
+        gzip_cell = f"{len(gzipped)} ({gzip_time * 1000:.1f})"
+        if brotli is not None:
+            br_time, compressed = timed(lambda b: brotli.compress(b, quality=BROTLI_QUALITY), body)
+            br_cell = f"{len(compressed)} ({br_time * 1000:.1f})"
+        else:
+            br_cell = "n/a"
+        print(f"   {n:>8} {len(body):>10} {gzip_cell:>16} {br_cell:>16}")
+
+
+if __name__ == "__main__":
+    bench_serialization()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+# The benchmark must not start scraping the competitor catalog
+os.environ.setdefault('COMPETITOR_SNAPSHOT_INTERVAL', '0')
+
+from backend.container import AppContainer
+from backend.scraper import BrowserPool, KeywordScraperAgent
+from backend.nlp_engine import NLPKeywordEngine
+from backend.keyword_metrics import KeywordMetricsService
+from backend.competitor_analysis import CompetitorAnalysisService
+
+REQUESTS = 2000
+
+
+def per_request_services():
+    """What each /analyze and /analyze-competitors request built before the container"""
+    KeywordScraperAgent()
+    NLPKeywordEngine()
+    KeywordMetricsService()
+    CompetitorAnalysisService()
+
+
+def injected_services(container: AppContainer):
+    """What the dependency providers hand out now"""
+    container.new_scraper()
+    container.nlp_engine
+    container.metrics_service
+    container.competitor_service
+
+
+async def bench_browser():
+    """Launching a browser per scrape vs a context from the shared browser"""
+    pool = BrowserPool()
+    try:
+        await pool.start()
+    except Exception as e:
+        print(f"   (browser not available, skipped: {str(e).splitlines()[0]})")
+        return
+
+    try:
+        start = time.perf_counter()
+        for _ in range(5):
+            agent = KeywordScraperAgent()
+            await agent._init_browser()
+            await agent._close_browser()
+        launch = (time.perf_counter() - start) / 5
+
+        start = time.perf_counter()
+        for _ in range(5):
+            async with pool.context():
+                pass
+        pooled = (time.perf_counter() - start) / 5
+
+        print(f"   launch per scrape: {launch * 1000:7.1f} ms   pooled context: {pooled * 1000:6.1f} ms "
+              f"({launch / pooled:.0f}x)")
+    finally:
+        await pool.close()
+
+
+async def bench_service_graph():
+    print("🏗️  Service graph: per-request construction vs lifespan container\n")
+
+    container = AppContainer(browser_pool_enabled=False)
+    await container.start()
+    print("⏱️  Startup and warm-up (ms):")
+    for step, ms in container.timings.items():
+        print(f"   {step:<16} {ms:8.2f}")
+
+    start = time.perf_counter()
+    for _ in range(REQUESTS):
+        per_request_services()
+    constructed = (time.perf_counter() - start) / REQUESTS
+
+    start = time.perf_counter()
+    for _ in range(REQUESTS):
+        injected_services(container)
+    injected = (time.perf_counter() - start) / REQUESTS
+
+    print(f"\n📦 Per-request service overhead ({REQUESTS} requests):")
+    print(f"   constructed: {constructed * 1e6:8.1f} us   injected: {injected * 1e6:6.2f} us "
+          f"({constructed / injected:.0f}x)")
+
+    print("\n🌐 Browser start per scrape:")
+    await bench_browser()
+
+    await container.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(bench_service_graph())
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'api'))
+
+from keyword_templates import TemplateEngine
+
+TEMPLATES = [
+    'best {product} for {use_case} in {industry}',
+    '{product} {feature} vs {alternative}',
+    'how to {action} {product} {feature} for {industry}',
+    '{qualifier} {product} for {use_case} {year}'
+]
+
+
+def slot_values(width: int):
+    return {
+        'product': [f'product{i}' for i in range(width)],
+        'use_case': [f'use case {i}' for i in range(width)],
+        'industry': [f'industry{i}' for i in range(width)],
+        'feature': [f'feature{i}' for i in range(width)],
+        'alternative': [f'alt{i}' for i in range(width)],
+        'action': [f'action{i}' for i in range(width)],
+        'qualifier': [f'qualifier{i}' for i in range(width)],
+        'year': ['2025', '2026']
+    }
+
+
+def replace_expand(patterns, values):
+    """Reference: the old filler's approach (scan for a placeholder, str.replace, repeat) on every slot"""
+    def fill(text):
+        for slot, options in values.items():
+            placeholder = '{' + slot + '}'
+            if placeholder in text:
+                return [keyword for option in options for keyword in fill(text.replace(placeholder, option))]
+        return [text]
+
+    seen = set()
+    results = []
+    for pattern in patterns:
+        for keyword in fill(pattern):
+            if keyword not in seen:
+                seen.add(keyword)
+                results.append(keyword)
+    return results
+
+
+def bench_template_expansion():
+    print("🧩 Template expansion: str.replace vs compiled templates\n")
+    for width in (10, 18, 30):
+        values = slot_values(width)
+        engine = TemplateEngine(slot_limits={slot: width for slot in values})
+        limited = engine.slot_values({}, **values)
+
+        start = time.perf_counter()
+        reference = replace_expand(TEMPLATES, limited)
+        naive = time.perf_counter() - start
+
+        timings = {}
+        for intern in (False, True):
+            start = time.perf_counter()
+            compiled = list(engine.expand_unique(TEMPLATES, limited, intern=intern))
+            timings[intern] = time.perf_counter() - start
+            assert len(compiled) == len(reference) and set(compiled) == set(reference)
+
+        print(f"{len(compiled):>9,} keywords   str.replace: {naive:5.2f} s   "
+              f"compiled: {timings[False]:5.2f} s ({naive / timings[False]:.1f}x)   "
+              f"compiled+intern: {timings[True]:5.2f} s ({naive / timings[True]:.1f}x)")
+
+
+if __name__ == "__main__":
+    bench_template_expansion()
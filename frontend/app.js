@@ -2,6 +2,7 @@ const API_URL = window.location.hostname === 'localhost' ? 'http://localhost:800
 let allKeywords = [];
 let filteredKeywords = [];
 let keywordChart = null;
+let competitorsPending = null;
 
 document.getElementById('analyzeForm').addEventListener('submit', async (e) => {
     e.preventDefault();
@@ -158,7 +159,7 @@ async function analyzeCompetitors() {
     document.getElementById('competitorBtn').disabled = true;
     
     try {
-        const response = await fetch(`${API_URL}/analyze-competitors`, {
+        const response = await fetch(`${API_URL}/analyze-competitors/stream`, {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json',
@@ -172,8 +173,28 @@ async function analyzeCompetitors() {
             throw new Error(`HTTP ${response.status}: ${errorText}`);
         }
         
-        const data = await response.json();
-        displayCompetitorResults(data);
+        // Deployments without streaming answer with the plain JSON analysis
+        if (!(response.headers.get('Content-Type') || '').startsWith('text/event-stream')) {
+            displayCompetitorResults(await response.json());
+            return;
+        }
+        
+        // Results render as they arrive: target first, then each competitor, then gaps
+        const competitors = [];
+        await readEventStream(response, (event, data) => {
+            if (event === 'target') {
+                startCompetitorResults(data);
+                document.getElementById('loadingDiv').classList.add('hidden');
+            } else if (event === 'competitor') {
+                competitors.push(data);
+                appendCompetitorCard(data);
+                updateCompetitorSummary(competitors);
+            } else if (event === 'gaps') {
+                displayCompetitorResults(data);
+            } else if (event === 'error') {
+                throw new Error(data.detail);
+            }
+        });
         
     } catch (error) {
         console.error('Error:', error);
@@ -186,6 +207,33 @@ async function analyzeCompetitors() {
     }
 }
 
+async function readEventStream(response, onEvent) {
+    // Minimal Server-Sent Events parser over a fetch body (EventSource cannot POST)
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+        
+        let boundary;
+        while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+            const block = buffer.slice(0, boundary);
+            buffer = buffer.slice(boundary + 2);
+            
+            let event = 'message';
+            const dataLines = [];
+            block.split('\n').forEach(line => {
+                if (line.startsWith('event: ')) event = line.slice(7);
+                else if (line.startsWith('data: ')) dataLines.push(line.slice(6));
+            });
+            if (dataLines.length) onEvent(event, JSON.parse(dataLines.join('\n')));
+        }
+    }
+}
+
 function displayResults(data) {
     allKeywords = data.keywords;
     filteredKeywords = allKeywords;
@@ -328,46 +376,64 @@ function renderChart() {
     });
 }
 
-function displayCompetitorResults(data) {
-    document.getElementById('competitorsFound').textContent = data.competitors_found;
-    document.getElementById('keywordOpportunities').textContent = data.keyword_gaps.length;
+function startCompetitorResults(data) {
+    document.getElementById('competitorsFound').textContent = `0/${data.competitors_pending.length}`;
+    document.getElementById('keywordOpportunities').textContent = '-';
+    document.getElementById('avgCompetitorTraffic').textContent = '-';
+    document.getElementById('competitorList').innerHTML = '';
+    document.getElementById('keywordGapsTableBody').innerHTML = '';
+    document.getElementById('competitorResultsDiv').classList.remove('hidden');
+    competitorsPending = data.competitors_pending.length;
+}
+
+function updateCompetitorSummary(competitors) {
+    const found = competitorsPending === null ? competitors.length : `${competitors.length}/${competitorsPending}`;
+    document.getElementById('competitorsFound').textContent = found;
     
-    const avgTraffic = data.competitors.reduce((sum, comp) => sum + comp.estimated_traffic, 0) / data.competitors.length;
+    const avgTraffic = competitors.length
+        ? competitors.reduce((sum, comp) => sum + comp.estimated_traffic, 0) / competitors.length
+        : 0;
     document.getElementById('avgCompetitorTraffic').textContent = (avgTraffic / 1000000).toFixed(1) + 'M';
+}
+
+function appendCompetitorCard(competitor) {
+    const card = document.createElement('div');
+    card.className = 'bg-white border border-gray-200 rounded-lg p-4';
     
-    // Render competitor cards
-    const competitorList = document.getElementById('competitorList');
-    competitorList.innerHTML = '';
-    
-    data.competitors.forEach(competitor => {
-        const card = document.createElement('div');
-        card.className = 'bg-white border border-gray-200 rounded-lg p-4';
-        
-        card.innerHTML = `
-            <div class="flex justify-between items-start mb-3">
-                <div>
-                    <h5 class="text-lg font-semibold text-gray-800">${competitor.domain}</h5>
-                    <p class="text-sm text-gray-600">Traffic: ${(competitor.estimated_traffic / 1000000).toFixed(1)}M/month</p>
-                    <p class="text-sm text-gray-600">Domain Authority: ${competitor.domain_authority}</p>
-                </div>
-                <div class="text-right">
-                    <p class="text-sm font-medium">Keywords: ${competitor.total_keywords}</p>
-                    <p class="text-sm text-gray-600">Volume: ${competitor.total_volume.toLocaleString()}</p>
-                    <p class="text-sm text-gray-600">Avg CPC: $${competitor.avg_cpc}</p>
-                </div>
-            </div>
+    card.innerHTML = `
+        <div class="flex justify-between items-start mb-3">
             <div>
-                <p class="text-xs text-gray-500 mb-2">Top Keywords:</p>
-                <div class="flex flex-wrap gap-1">
-                    ${competitor.top_keywords.slice(0, 5).map(kw => 
-                        `<span class="text-xs bg-gray-100 text-gray-700 px-2 py-1 rounded">${kw.keyword}</span>`
-                    ).join('')}
-                </div>
+                <h5 class="text-lg font-semibold text-gray-800">${competitor.domain}</h5>
+                <p class="text-sm text-gray-600">Traffic: ${(competitor.estimated_traffic / 1000000).toFixed(1)}M/month</p>
+                <p class="text-sm text-gray-600">Domain Authority: ${competitor.domain_authority}</p>
             </div>
-        `;
-        
-        competitorList.appendChild(card);
-    });
+            <div class="text-right">
+                <p class="text-sm font-medium">Keywords: ${competitor.total_keywords}</p>
+                <p class="text-sm text-gray-600">Volume: ${competitor.total_volume.toLocaleString()}</p>
+                <p class="text-sm text-gray-600">Avg CPC: $${competitor.avg_cpc}</p>
+            </div>
+        </div>
+        <div>
+            <p class="text-xs text-gray-500 mb-2">Top Keywords:</p>
+            <div class="flex flex-wrap gap-1">
+                ${competitor.top_keywords.slice(0, 5).map(kw => 
+                    `<span class="text-xs bg-gray-100 text-gray-700 px-2 py-1 rounded">${kw.keyword}</span>`
+                ).join('')}
+            </div>
+        </div>
+    `;
+    
+    document.getElementById('competitorList').appendChild(card);
+}
+
+function displayCompetitorResults(data) {
+    competitorsPending = null;
+    updateCompetitorSummary(data.competitors);
+    document.getElementById('keywordOpportunities').textContent = data.keyword_gaps.length;
+    
+    // Re-render competitor cards in final (traffic) order
+    document.getElementById('competitorList').innerHTML = '';
+    data.competitors.forEach(appendCompetitorCard);
     
     // Render keyword gaps table
     const tbody = document.getElementById('keywordGapsTableBody');
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'api'))
+
+from autocomplete_client import AutocompleteClient, AutocompleteService, SuggestionTrie
+from google_trends_api import GoogleTrendsAPI
+
+
+class StandInSuggestHandler(BaseHTTPRequestHandler):
+    """Local stand-in for the suggestion endpoint: [query, [suggestions]]"""
+    protocol_version = 'HTTP/1.1'
+    requests_seen = []
+    connections = set()
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)['q'][0]
+        self.requests_seen.append(query)
+        self.connections.add(self.client_address)
+        time.sleep(0.02)
+
+        # Overlapping suggestions across variants exercise the dedupe
+        body = json.dumps([query, [f"{query} tool", f"{query} free", "seo tools"]]).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class StandInServer(ThreadingHTTPServer):
+    # Default backlog of 5 drops connects from an 8-connection pool (1 s SYN retry)
+    request_queue_size = 64
+
+
+def start_server():
+    server = StandInServer(('127.0.0.1', 0), StandInSuggestHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def test_autocomplete_client():
+    print("🧪 Testing autocomplete client against a local stand-in server\n")
+    server = start_server()
+    base_url = f"http://127.0.0.1:{server.server_port}/complete/search"
+
+    async def run():
+        async with AutocompleteClient(base_url, max_connections=8, rate_per_host=1000, burst=50) as client:
+            start = time.perf_counter()
+            result = await client.mine('seo')
+            elapsed = time.perf_counter() - start
+
+            sent = len(StandInSuggestHandler.requests_seen)
+            again = await client.mine('seo')
+            return result, again, elapsed, sent
+
+    result, again, elapsed, sent = asyncio.run(run())
+    suggestions = [s['query'] for s in result['suggestions']]
+
+    print(f"Queries sent: {result['queries_sent']} in {elapsed:.2f}s")
+    print(f"Unique suggestions: {len(suggestions)}")
+
+    assert result['queries_sent'] == 38
+    assert sent == 38
+    assert len(suggestions) == len(set(suggestions))
+    assert suggestions.count('seo tools') == 1
+    assert 'how seo tool' in suggestions
+    # 38 requests at 20 ms each must overlap on the pool
+    assert elapsed < 38 * 0.02
+    # Second run is served from the TTL cache
+    assert again is result and len(StandInSuggestHandler.requests_seen) == 38
+
+    trie = SuggestionTrie()
+    for suggestion in suggestions:
+        trie.insert(suggestion)
+    assert list(trie.iter_prefix('seo a')) == ['seo a free', 'seo a tool']
+
+    # One service per process: every call, blocking or async, shares its pool
+    StandInSuggestHandler.connections.clear()
+    service = AutocompleteService(base_url, max_connections=4, rate_per_host=1000, burst=50)
+    trends = GoogleTrendsAPI(autocomplete=service)
+    etag_before = trends.etag('trends', 'crm', 'US')
+    related = [q['query'] for q in trends.generate_related_queries('crm', 'US')]
+    rising = [q['query'] for q in trends.generate_rising_queries('crm', 'US')]
+    assert set(related) <= {s['query'] for s in service.cached('crm')['suggestions']}
+    assert 'new crm tool' in rising
+    assert asyncio.run(trends.get_autocomplete_suggestions_async('ppc'))
+    assert len(StandInSuggestHandler.connections) <= 4
+    print(f"Related and rising queries from 3 mines over {len(StandInSuggestHandler.connections)} connections")
+
+    # Cached suggestions are part of the data version, so the ETag follows them
+    etag_after = trends.etag('trends', 'crm', 'US')
+    assert etag_after != etag_before and trends.etag('trends', 'crm', 'US') == etag_after
+    assert trends.generate_related_queries('crm', 'US') == trends.generate_related_queries('crm', 'US')
+    service.close()
+    server.shutdown()
+
+    # Endpoint down: templates, and nothing cached
+    offline = AutocompleteService(base_url, rate_per_host=1000, burst=50, timeout=5)
+    fallback = GoogleTrendsAPI(autocomplete=offline).generate_related_queries('crm', 'US')
+    assert {q['query'] for q in fallback} == {'crm tutorial', 'crm guide', 'how to crm', 'crm tips',
+                                              'crm vs', 'best crm', 'crm review', 'crm pricing'}
+    assert offline.cached('crm') is None
+    offline.close()
+
+    print("\n✅ Autocomplete client checks passed")
+
+
+if __name__ == "__main__":
+    test_autocomplete_client()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+
+import os
+import random
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from backend.competitor_keyword_index import CompetitorKeywordIndex
+
+
+def score(record):
+    return record['volume'] / 1000
+
+
+def test_competitor_keyword_index():
+    print("🧪 Testing competitor keyword inverted index against brute-force sets\n")
+    rng = random.Random(41)
+    vocabulary = [f"keyword {i}" for i in range(300)]
+
+    competitors = []
+    for c in range(12):
+        chosen = rng.sample(vocabulary, rng.randint(0, 80))
+        # Case and spacing variants normalize to the same keyword
+        competitors.append({'domain': f"competitor{c}.com", 'top_keywords': [
+            {'keyword': rng.choice([kw, kw.upper(), kw.replace(' ', '  ')]), 'volume': rng.randint(10, 50000),
+             'cpc': round(rng.uniform(0.1, 9), 2), 'competition': rng.choice(['Low', 'Medium', 'High'])}
+            for kw in chosen
+        ]})
+    target = set(rng.sample(vocabulary, 120))
+    index = CompetitorKeywordIndex.from_competitors(competitors)
+
+    sets = {c['domain']: {CompetitorKeywordIndex.normalize(r['keyword']) for r in c['top_keywords']}
+            for c in competitors}
+    union = set().union(*sets.values())
+
+    assert index.gap_keywords(target) == union - target
+    assert index.shared_keywords(target) == union & target
+    for domain, keywords in sets.items():
+        others = set().union(*(s for d, s in sets.items() if d != domain))
+        assert index.unique_keywords(domain) == keywords - others
+        assert index.unique_keyword_counts()[domain] == len(keywords - others)
+    for keyword in rng.sample(vocabulary, 30):
+        assert index.competitors_for(keyword.upper()) == [d for d, s in sets.items() if keyword in s]
+    print(f"✅ Gap, shared and unique sets match over {len(union)} keywords and {len(sets)} competitors")
+
+    # top_k scores each gap by its first competitor's record
+    first_record = {}
+    for competitor in competitors:
+        for record in competitor['top_keywords']:
+            first_record.setdefault(CompetitorKeywordIndex.normalize(record['keyword']), record)
+    expected = sorted(union - target, key=lambda kw: score(first_record[kw]), reverse=True)[:15]
+    top = index.top_k(index.gap_keywords(target), 15, score)
+    assert [CompetitorKeywordIndex.normalize(t['keyword']) for t in top] == expected
+    assert all(set(t['competitor_domains']) == {d for d, s in sets.items() if
+                                                CompetitorKeywordIndex.normalize(t['keyword']) in s} for t in top)
+    print("✅ Top gaps match a full sort")
+
+    print("\n🎉 Competitor keyword index checks passed")
+
+
+if __name__ == "__main__":
+    test_competitor_keyword_index()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from backend.jobs import JobStore
+
+
+def test_job_store():
+    print("🧪 Testing persistent job queue\n")
+
+    store = JobStore(':memory:')
+
+    # Identical submissions share one active job; other params get their own
+    first = store.submit('analyze', {'url': 'https://a.com', 'region': 'us'})
+    again = store.submit('analyze', {'region': 'us', 'url': 'https://a.com'})
+    other = store.submit('analyze', {'url': 'https://b.com', 'region': 'us'})
+    assert not first['deduplicated'] and again['deduplicated'] and again['id'] == first['id']
+    assert other['id'] != first['id'] and store.count('queued') == 2
+
+    # Claims go oldest first and never hand out a job twice
+    claimed = store.claim()
+    assert claimed['id'] == first['id'] and claimed['status'] == 'running' and claimed['attempts'] == 1
+    assert store.claim()['id'] == other['id']
+    assert store.claim() is None
+
+    # A running job still dedupes; a success is reused, a failure is not
+    assert store.submit('analyze', {'url': 'https://a.com', 'region': 'us'})['id'] == first['id']
+    store.finish(first['id'], result={'keywords_found': 3})
+    assert store.submit('analyze', {'url': 'https://a.com', 'region': 'us'})['id'] == first['id']
+    store.finish(other['id'], error='boom')
+    retried = store.submit('analyze', {'url': 'https://b.com', 'region': 'us'})
+    assert retried['id'] != other['id'] and not retried['deduplicated']
+
+    # Stale running jobs are requeued without their progress, until the attempt limit
+    store.claim()
+    store.report(retried['id'], progress={'stage': 'scraping'}, partial={'pages': [1]})
+    for attempt in (1, 2):
+        store._conn.execute('UPDATE jobs SET heartbeat_at = 0 WHERE id = ?', (retried['id'],))
+        assert store.requeue_stale() == 1
+        job = store.get(retried['id'])
+        assert job['status'] == 'queued' and job['progress'] is None and job['partial'] is None
+        assert store.claim()['attempts'] == attempt + 1
+    store._conn.execute('UPDATE jobs SET heartbeat_at = 0 WHERE id = ?', (retried['id'],))
+    assert store.requeue_stale() == 0
+    job = store.get(retried['id'])
+    assert job['status'] == 'failed' and 'Abandoned after 3' in job['error']
+
+    # The competing job ends between our failed insert and the re-check
+    blocker = store.submit('crawl', {'url': 'https://c.com'})
+    find_duplicate = store._find_duplicate
+    calls = []
+
+    def racing_find_duplicate(key, finished_after):
+        calls.append(key)
+        if len(calls) == 1:
+            return None
+        store.claim()
+        store.finish(blocker['id'], error='boom')
+        return find_duplicate(key, finished_after)
+
+    store._find_duplicate = racing_find_duplicate
+    raced = store.submit('crawl', {'url': 'https://c.com'})
+    store._find_duplicate = find_duplicate
+    assert len(calls) == 2 and raced['id'] != blocker['id'] and raced['status'] == 'queued'
+
+    print(f"{store.count()} jobs, {store.count('failed')} failed")
+    print("✅ Job store test passed")
+
+
+if __name__ == "__main__":
+    test_job_store()
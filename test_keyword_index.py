@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+
+import os
+import random
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'api'))
+
+from keyword_index import KeywordIndex
+
+
+def brute_force(scores, matches, limit):
+    return sorted(((s, k) for k, s in scores.items() if matches(k)), reverse=True)[:limit]
+
+
+def test_keyword_index():
+    print("🧪 Testing long-tail keyword index\n")
+
+    # A repeated word gives several token keys with a shared prefix; the
+    # keyword must still appear once in every result (cached top-k and
+    # subtree walk alike), through rescoring
+    index = KeywordIndex(top_k=5)
+    scores = {'seo seo': 10, 'seo tools seo': 5, 'best seo': 7, 'crm crm crm': 3, 'crm for crm': 4}
+    for keyword, score in scores.items():
+        index.add(keyword, score)
+    for keyword, score in [('seo seo', 1), ('crm crm crm', 9), ('seo seo', 20), ('seo tools seo', 2)]:
+        scores[keyword] = score
+        index.add(keyword, score)
+    assert [(r['keyword'], r['score']) for r in index.infix('seo', 5)] == \
+        [('seo seo', 20), ('best seo', 7), ('seo tools seo', 2)]
+    assert [r['keyword'] for r in index.infix('crm', 5)] == ['crm crm crm', 'crm for crm']
+    assert [r['keyword'] for r in index.infix('s', 40)] == ['seo seo', 'best seo', 'seo tools seo']
+
+    # Fixed seed: many rescores (up and down) over keywords with repeated words
+    rng = random.Random(1234)
+    index = KeywordIndex(top_k=5)
+    words = ['seo', 'tools', 'best', 'cheap', 'crm', 'for', 'agencies']
+    scores = {}
+    for _ in range(2000):
+        keyword = ' '.join(rng.choice(words) for _ in range(rng.randint(1, 4)))
+        scores[keyword] = rng.randint(0, 100)
+        index.add(keyword, scores[keyword])
+    assert any(len(set(k.split())) < len(k.split()) for k in scores)
+
+    for prefix in ['', 'seo', 'best t', 'crm for a']:
+        for limit in (5, 40):
+            expected = brute_force(scores, lambda k: k.startswith(prefix), limit)
+            assert [(r['score'], r['keyword']) for r in index.prefix(prefix, limit)] == expected
+
+    def has_token_prefix(token):
+        return lambda k: any(' '.join(k.split()[i:]).startswith(token) for i in range(len(k.split())))
+
+    for token in ['seo', 'tool', 'for ag', 'crm']:
+        for limit in (5, 40):
+            expected = brute_force(scores, has_token_prefix(token), limit)
+            assert [(r['score'], r['keyword']) for r in index.infix(token, limit)] == expected
+
+    print(f"Indexed {len(index)} keywords; top: {index.top(1)[0]['keyword']}")
+    print("✅ Keyword index test passed")
+
+
+if __name__ == "__main__":
+    test_keyword_index()
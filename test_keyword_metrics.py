@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from backend.keyword_metrics import KeywordMetricsService
+from backend.metrics_store import KeywordMetricsStore
+
+
+class RecordingRefresher:
+    """Stands in for BackgroundRefresher; records what would be refreshed"""
+
+    def __init__(self):
+        self.scheduled = []
+
+    def schedule(self, key, fn, *args):
+        self.scheduled.append(key)
+        return True
+
+
+def age_entry(store: KeywordMetricsStore, keyword: str, region: str, seconds: float):
+    with store._lock:
+        store._conn.execute(
+            'UPDATE keyword_metrics SET updated_at = ? WHERE keyword = ? AND region = ?',
+            (time.time() - seconds, keyword.lower(), region)
+        )
+
+
+def test_keyword_metrics():
+    print("🧪 Testing stored keyword metrics (stale-while-revalidate)\n")
+
+    store = KeywordMetricsStore(':memory:')
+    refresher = RecordingRefresher()
+    service = KeywordMetricsService(store=store, refresher=refresher, ttl=100, max_age=1000)
+
+    # First request computes and stores
+    first = service.get_keyword_metrics('SEO Tools', 'us')
+    assert store.count() == 1 and not refresher.scheduled
+
+    # Fresh: served from the store, nothing scheduled
+    age_entry(store, 'seo tools', 'us', 50)
+    assert service._get_cached('SEO Tools', 'us')['volume'] == first['volume']
+    assert not refresher.scheduled
+
+    # Stale: still served, one background refresh scheduled
+    age_entry(store, 'seo tools', 'us', 500)
+    assert service._get_cached('SEO Tools', 'us')['volume'] == first['volume']
+    assert refresher.scheduled == [('seo tools', 'us')]
+
+    # Expired: not served; the next request recomputes and rewrites the entry
+    age_entry(store, 'seo tools', 'us', 5000)
+    assert service._get_cached('SEO Tools', 'us') is None
+    service.get_keyword_metrics('SEO Tools', 'us')
+    assert time.time() - store.get_latest('seo tools', 'us')['updated_at'] < 10
+    assert refresher.scheduled == [('seo tools', 'us')]
+    print("✅ Fresh, stale and expired entries handled")
+
+    # Batch writes every computed keyword in one go; cached ones are not rewritten
+    keywords = ['buy running shoes', 'how to rank', 'crm', 'seo tools']
+    batch = service.get_batch_metrics(keywords, 'uk')
+    assert set(batch) == set(keywords) and store.count() == 5
+    assert service.get_batch_metrics(keywords, 'uk') == batch
+
+    # Filters agree with a scan of the stored rows
+    rows = [store.get_latest(keyword, 'uk') for keyword in keywords]
+    low, high = sorted(row['volume'] for row in rows)[1:3]
+    found = service.search_metrics('uk', min_volume=low, max_volume=high)
+    assert sorted(row['keyword'] for row in found) == \
+        sorted(row['keyword'] for row in rows if low <= row['volume'] <= high)
+    found = service.search_metrics('uk', min_cpc=2.0)
+    assert sorted(row['keyword'] for row in found) == \
+        sorted(row['keyword'] for row in rows if row['cpc'] >= 2.0)
+    assert [row['keyword'] for row in service.search_metrics('uk', prefix='seo')] == ['seo tools']
+    assert service.search_metrics('us', prefix='crm') == []
+    print("✅ Batch upserts and search filters")
+
+    try:
+        KeywordMetricsService(store=store, refresher=refresher, mock_data=False)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("mock_data=False accepted without a real provider")
+
+    store.close()
+    print("\n🎉 Keyword metrics store checks passed")
+
+
+if __name__ == "__main__":
+    test_keyword_metrics()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import tempfile
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'api'))
+
+from seen_filter import ScalableBloomFilter, SeenFilterStore
+
+
+def test_seen_filter():
+    print("🧪 Testing scalable Bloom filters of seen keywords\n")
+
+    # Grows well past the first layer with no false negatives
+    bloom = ScalableBloomFilter(initial_capacity=100, error_rate=0.01)
+    seen = [f"seen keyword {i}" for i in range(5000)]
+    assert bloom.update(seen) <= len(seen)
+    assert all(keyword in bloom for keyword in seen)
+    assert len(bloom.layers) >= 5
+    assert [layer.capacity for layer in bloom.layers[:3]] == [100, 200, 400]
+    assert all(layer.count <= layer.capacity for layer in bloom.layers)
+
+    # False positives stay under the compound bound
+    unseen = [f"unseen keyword {i}" for i in range(20000)]
+    rate = sum(keyword in bloom for keyword in unseen) / len(unseen)
+    print(f"{len(bloom.layers)} layers, false-positive rate {rate:.3%} (bound 1%)")
+    assert rate < 0.01
+
+    # Round trip keeps every layer bit for bit
+    restored = ScalableBloomFilter.from_bytes(bloom.to_bytes())
+    assert restored.to_bytes() == bloom.to_bytes()
+    assert all(keyword in restored for keyword in seen)
+    assert len(restored) == len(bloom) and restored.initial_capacity == 100
+    try:
+        ScalableBloomFilter.from_bytes(b'XXXX' + bloom.to_bytes()[4:])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("foreign file accepted")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SeenFilterStore(tmp, error_rate=0.001, initial_capacity=50)
+        # 'a/b' and 'a_b' have the same readable file name prefix
+        assert store.mark_seen('a/b', ['SEO Tools ', 'crm software']) == 2
+        assert store.mark_seen('a_b', ['keyword research']) == 1
+        assert store.mark_seen('a/b', ['seo tools']) == 0
+
+        reopened = SeenFilterStore(tmp, initial_capacity=50)
+        assert 'seo tools' in reopened.get('a/b') and 'crm software' in reopened.get('a/b')
+        assert 'seo tools' not in reopened.get('a_b') and 'keyword research' in reopened.get('a_b')
+        assert len(reopened.get('someone else')) == 0
+        assert len([name for name in os.listdir(tmp) if name.endswith('.bloom')]) == 2
+    print("✅ Per-account filters persist and stay separate")
+
+    print("\n🎉 Seen-keyword filter checks passed")
+
+
+if __name__ == "__main__":
+    test_seen_filter()
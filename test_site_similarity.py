@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from backend.competitor_snapshots import CompetitorSnapshotStore
+from backend.keyword_similarity import SiteSimilarityIndex
+
+
+def test_site_similarity():
+    print("🧪 Testing persistent site similarity index\n")
+
+    crm = {'crm software': 5, 'sales pipeline': 3, 'contact management': 2, 'lead scoring': 1}
+    crm_like = {'crm software': 4, 'sales pipeline': 3, 'contact management': 2, 'email tracking': 1}
+    seo = {'seo tools': 5, 'keyword research': 4, 'backlinks': 2}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'snapshots.db')
+        # Two workers sharing one database
+        first = SiteSimilarityIndex(store=CompetitorSnapshotStore(db_path))
+        second = SiteSimilarityIndex(store=CompetitorSnapshotStore(db_path))
+
+        first.add('hubspot.com', crm)
+        first.add('ahrefs.com', seo)
+        second.add('pipedrive.com', crm_like)
+
+        # Each sees the other's sites at query time
+        assert first.most_similar_to_site('pipedrive.com')[0][0] == 'hubspot.com'
+        assert second.most_similar_to_site('hubspot.com')[0][0] == 'pipedrive.com'
+
+        # A restart reloads every site, replacements included
+        first.add('ahrefs.com', crm)
+        first.remove('pipedrive.com')
+        reopened = SiteSimilarityIndex(store=CompetitorSnapshotStore(db_path))
+        assert len(reopened) == 2
+        assert reopened.weights['ahrefs.com'] == crm
+        assert [site for site, _ in reopened.most_similar_to_site('hubspot.com')] == ['ahrefs.com']
+
+    print(f"Reloaded {len(reopened)} sites")
+    print("✅ Site similarity test passed")
+
+
+if __name__ == "__main__":
+    test_site_similarity()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+
+import os
+import random
+import sys
+import tempfile
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'api'))
+# Related queries from templates only: no suggestion requests from this test
+os.environ['TRENDS_AUTOCOMPLETE'] = '0'
+
+from google_trends_api import GoogleTrendsAPI
+from trends_engine import month_axis
+from trends_store import TrendsTimeSeriesStore, decode_block, encode_block, month_index, month_label
+
+
+def test_trends_store():
+    print("🧪 Testing trend time-series store\n")
+
+    values = [0, 100, 37, 37, -5, 2 ** 40]
+    assert decode_block(encode_block(values), 0, len(values)) == values
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = TrendsTimeSeriesStore(tmp)
+        start = month_index('2022-01')
+        history = [random.randint(0, 100) for _ in range(36)]
+        store.append_many({'SEO Tools': [(month_label(start + i), v) for i, v in enumerate(history)]})
+
+        assert [p['interest'] for p in store.read_range('seo tools')] == history
+        assert [p['date'] for p in store.read_range('seo tools', '2024-11', '2025-02')] == \
+            ['2024-11', '2024-12']
+        print(f"Stored {len(history)} months in {os.path.getsize(store.data_path)} bytes")
+
+        # Newer appends override a month; gaps split into separate blocks
+        store.append_many({'seo tools': [('2022-02', 99)], 'crm': [('2024-01', 5), ('2024-03', 7)]})
+        assert store.read_range('seo tools', '2022-02', '2022-02')[0]['interest'] == 99
+        assert [p['date'] for p in store.read_range('crm')] == ['2024-01', '2024-03']
+
+        # Reopen after a torn index write
+        version = store.version
+        with open(store.index_path, 'a') as f:
+            f.write('["crm", 1')
+        reopened = TrendsTimeSeriesStore(tmp)
+        assert reopened.version == version
+        assert reopened.read_range('seo tools') == store.read_range('seo tools')
+        reopened.append_many({'crm': [('2024-02', 6)]})
+        assert [p['interest'] for p in TrendsTimeSeriesStore(tmp).read_range('crm')] == [5, 6, 7]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Serving a series fills only the months the store lacks
+        api = GoogleTrendsAPI(TrendsTimeSeriesStore(tmp))
+        labels, _ = month_axis(12)
+        api.trends_store.append_many({'seo tools': [(labels[0], 101), (labels[5], 102)]})
+        series = api.get_trend_series('seo tools')
+        assert [p['date'] for p in series] == labels
+        assert series[0]['interest'] == 101 and series[5]['interest'] == 102
+        assert api.trends_store.read_range('seo tools') == series
+        blocks = api.trends_store.block_count('seo tools')
+        assert api.get_trend_series('seo tools') == series
+        assert api.trends_store.block_count('seo tools') == blocks
+
+        # Regions are separate series: US first does not decide the UK answer
+        uk = api.get_trend_series('crm', 'UK')
+        api.get_trend_series('crm', 'US')
+        assert api.get_trend_series('crm', 'UK') == uk == api.generate_trend_series('crm', 'UK')
+        assert api.get_trend_series('crm', 'US') == api.generate_trend_series('crm', 'US') != uk
+        assert api.trends_store.read_range('crm', region='uk') == uk
+        assert api.trends_store.block_count('crm', 'UK') == api.trends_store.block_count('crm', 'US') == 1
+        assert api.trends_store.keywords('UK') == ['crm']
+
+    print("\n✅ Trend store checks passed")
+
+
+def test_trends_determinism():
+    print("🧪 Testing per-(keyword, region) determinism with the store enabled\n")
+    regions = ['US', 'UK', 'IN']
+    no_store = GoogleTrendsAPI()
+    no_store.trends_store = None
+
+    with tempfile.TemporaryDirectory() as first, tempfile.TemporaryDirectory() as second:
+        forward = GoogleTrendsAPI(TrendsTimeSeriesStore(first))
+        backward = GoogleTrendsAPI(TrendsTimeSeriesStore(second))
+        responses = {region: forward.get_google_trends_data('seo tools', region) for region in regions}
+        for region in reversed(regions):
+            assert backward.get_google_trends_data('seo tools', region) == responses[region]
+
+        for region in regions:
+            # Same body as without the store, and again once the series is stored
+            assert responses[region] == no_store.get_google_trends_data('seo tools', region)
+            assert forward.get_google_trends_data('seo tools', region) == responses[region]
+            assert forward.etag('trends', 'seo tools', region) == backward.etag('trends', 'seo tools', region)
+        assert responses['US']['trend_data'] != responses['UK']['trend_data']
+
+    print("✅ Responses depend only on (keyword, region), not on request order")
+
+
+if __name__ == "__main__":
+    test_trends_store()
+    test_trends_determinism()